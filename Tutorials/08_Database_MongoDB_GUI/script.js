@@ -8,11 +8,29 @@ const state = {
   currentRole: null,
   books: [],
   issuedBooks: [],
+  nextCursor: null,
+  search: { query: "", mode: "text", nextPage: null },
+  // Set from /api/search/capabilities; MongoDB modes until it answers
+  searchModes: ["text", "prefix"],
+  inMemorySearch: false,
 };
 
 // API base URL - adjust this to your Flask API when it's running
 const API_BASE_URL = "http://localhost:5000/api";
 
+// Catalog paging: books per request and the fields shown on a book card
+const PAGE_SIZE = 50;
+// Pause after the last keystroke before searching as the user types
+const SEARCH_DELAY_MS = 200;
+const CATALOG_FIELDS = [
+  "book_name",
+  "author",
+  "price",
+  "quantity",
+  "publication",
+  "publication_date",
+];
+
 // DOM Elements
 document.addEventListener("DOMContentLoaded", () => {
   // Navigation and UI controls
@@ -24,6 +42,8 @@ document.addEventListener("DOMContentLoaded", () => {
   // Form submissions
   initializeAuthForms();
   initializeDashboardForms();
+
+  fetchSearchCapabilities();
 });
 
 // Navigation and UI Controls
@@ -254,11 +274,18 @@ function loadCatalog(container) {
   const template = $("#catalog-template").content.cloneNode(true);
   container.appendChild(template);
 
-  // Fetch books
-  fetchBooks().then((books) => {
-    const booksContainer = container.querySelector(".books-container");
-    displayBooks(books, booksContainer);
-  });
+  const booksContainer = container.querySelector(".books-container");
+  const loadMoreBtn = container.querySelector(".load-more-btn");
+
+  // Fetch the first page, then one more page per click
+  const loadPage = (after) =>
+    fetchBooks(after).then((books) => {
+      displayBooks(books, booksContainer, after !== null);
+      loadMoreBtn.classList.toggle("hidden", !state.nextCursor);
+    });
+
+  loadMoreBtn.addEventListener("click", () => loadPage(state.nextCursor));
+  loadPage(null);
 }
 
 function loadSearchInterface(container) {
@@ -266,25 +293,53 @@ function loadSearchInterface(container) {
   const template = $("#search-book-template").content.cloneNode(true);
   container.appendChild(template);
 
+  const resultsContainer = container.querySelector(".search-results");
+  const loadMoreBtn = container.querySelector(".load-more-btn");
+
+  const queryInput = container.querySelector("#search-query");
+
+  const runSearch = async (query) => {
+    const books = await searchWithFallback(query);
+    // A newer search has started while this one was waiting
+    if (query !== queryInput.value.trim()) return;
+    resultsContainer.innerHTML = "";
+    loadMoreBtn.classList.toggle("hidden", !state.search.nextPage);
+
+    if (books.length === 0) {
+      resultsContainer.innerHTML =
+        "<p>No books found matching your search.</p>";
+      return;
+    }
+
+    displayBooks(books, resultsContainer);
+  };
+
   // Initialize search button
   container.querySelector("#search-button").addEventListener("click", () => {
-    const query = container.querySelector("#search-query").value;
+    const query = queryInput.value.trim();
     if (!query) {
       showNotification("Please enter a search term", "error");
       return;
     }
+    runSearch(query);
+  });
 
-    searchBooks(query).then((books) => {
-      const resultsContainer = container.querySelector(".search-results");
-      resultsContainer.innerHTML = "";
-
-      if (books.length === 0) {
-        resultsContainer.innerHTML =
-          "<p>No books found matching your search.</p>";
-        return;
-      }
+  // Search as the user types when the server answers from memory, so
+  // keystrokes do not reach the database
+  let searchTimer = null;
+  queryInput.addEventListener("input", () => {
+    clearTimeout(searchTimer);
+    const query = queryInput.value.trim();
+    if (!state.inMemorySearch || !query) return;
+    searchTimer = setTimeout(() => runSearch(query), SEARCH_DELAY_MS);
+  });
 
-      displayBooks(books, resultsContainer);
+  // Next page of the current search
+  loadMoreBtn.addEventListener("click", () => {
+    const { query, mode, nextPage } = state.search;
+    searchBooks(query, mode, nextPage).then((books) => {
+      displayBooks(books, resultsContainer, true);
+      loadMoreBtn.classList.toggle("hidden", !state.search.nextPage);
     });
   });
 }
@@ -572,8 +627,8 @@ function loadResetPasswordInterface(container, role) {
 }
 
 // Utility for displaying books
-function displayBooks(books, container) {
-  container.innerHTML = "";
+function displayBooks(books, container, append = false) {
+  if (!append) container.innerHTML = "";
 
   books.forEach((book) => {
     const template = $("#book-card-template").content.cloneNode(true);
@@ -641,13 +696,20 @@ function displayBooks(books, container) {
 }
 
 // API Calls
-async function fetchBooks() {
+async function fetchBooks(after = null) {
   try {
-    const response = await fetch(`${API_BASE_URL}/books`);
+    const params = new URLSearchParams({
+      limit: PAGE_SIZE,
+      fields: CATALOG_FIELDS.join(","),
+    });
+    if (after) params.set("after", after);
+
+    const response = await fetch(`${API_BASE_URL}/books?${params}`);
     if (!response.ok) throw new Error("Failed to fetch books");
 
     const data = await response.json();
-    state.books = data.books;
+    state.books = after ? state.books.concat(data.books) : data.books;
+    state.nextCursor = data.next_cursor;
     return data.books;
   } catch (error) {
     console.error("Error fetching books:", error);
@@ -656,14 +718,46 @@ async function fetchBooks() {
   }
 }
 
-async function searchBooks(query) {
+async function fetchSearchCapabilities() {
   try {
-    const response = await fetch(
-      `${API_BASE_URL}/books/search?query=${encodeURIComponent(query)}`
-    );
+    const response = await fetch(`${API_BASE_URL}/search/capabilities`);
+    if (!response.ok) return;
+
+    const data = await response.json();
+    state.inMemorySearch = data.in_memory;
+    // From memory: autocomplete prefixes, then typo-tolerant matches.
+    // From MongoDB: whole-word text search, then prefixes such as "Harr"
+    state.searchModes = data.in_memory
+      ? ["prefix", "fuzzy"]
+      : ["text", "prefix"];
+  } catch (error) {
+    console.error("Error fetching search capabilities:", error);
+  }
+}
+
+// Modes of state.searchModes in turn until one finds books
+async function searchWithFallback(query) {
+  let books = [];
+  for (const mode of state.searchModes) {
+    books = await searchBooks(query, mode);
+    if (books.length > 0) break;
+  }
+  return books;
+}
+
+async function searchBooks(query, mode = "text", page = 1) {
+  try {
+    const params = new URLSearchParams({
+      query,
+      mode,
+      page,
+      limit: PAGE_SIZE,
+    });
+    const response = await fetch(`${API_BASE_URL}/books/search?${params}`);
     if (!response.ok) throw new Error("Search failed");
 
     const data = await response.json();
+    state.search = { query, mode, nextPage: data.next_page };
     return data.books;
   } catch (error) {
     console.error("Error searching books:", error);
@@ -1,12 +1,20 @@
 import os
 import re
 import uuid
+import base64
+import unicodedata
+import bisect
+import heapq
+import threading
+import time
 import bcrypt
+from collections import Counter, defaultdict
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional, List
-from flask import Flask, request, jsonify
+from typing import Dict, Any, Optional, List, Set
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
 from pymongo.server_api import ServerApi
 from dotenv import load_dotenv
 
@@ -37,6 +45,152 @@ except Exception as e:
     raise
 
 
+# Books with at least one issue record; matches the partial issued-books index
+ISSUED_BOOKS_FILTER = {"issued_to.0": {"$exists": True}}
+
+# Normalized copies of book_name and author for indexed prefix search; not
+# returned by the routes
+SEARCH_FIELDS = {"book_name": "search_name", "author": "search_author"}
+HIDE_SEARCH_FIELDS = {field: 0 for field in SEARCH_FIELDS.values()}
+
+
+def normalize_search_text(text: Any) -> str:
+    """Case-folded text without accents and repeated whitespace"""
+    if not isinstance(text, str):
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def search_fields(book: Dict[str, Any]) -> Dict[str, str]:
+    """Normalized search fields for the book_name and author present in book"""
+    return {
+        search_field: normalize_search_text(book[field])
+        for field, search_field in SEARCH_FIELDS.items()
+        if field in book
+    }
+
+
+def find_duplicates(collection, field: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Values of field shared by several documents, with their _ids"""
+    return list(
+        collection.aggregate(
+            [
+                {"$group": {"_id": f"${field}", "ids": {"$push": "$_id"}}},
+                {"$match": {"ids.1": {"$exists": True}}},
+                {"$limit": limit},
+            ]
+        )
+    )
+
+
+def create_unique_index(collection, field: str, name: str):
+    """Create a unique index, naming the documents that would violate it"""
+    if name not in collection.index_information():
+        duplicates = find_duplicates(collection, field)
+        if duplicates:
+            blocking = "; ".join(
+                f"{field}={group['_id']!r}: _id "
+                + ", ".join(str(_id) for _id in group["ids"])
+                for group in duplicates
+            )
+            raise RuntimeError(
+                f"Duplicate {field} values in {collection.name} block the "
+                f"unique index {name}: {blocking}"
+            )
+    collection.create_index(field, unique=True, name=name)
+
+
+def ensure_indexes():
+    """Create the indexes used by the routes (no-op if they already exist)"""
+    create_unique_index(student_collection, "email", "email_unique")
+    create_unique_index(student_collection, "student_id", "student_id_unique")
+    create_unique_index(librarian_collection, "email", "email_unique")
+    create_unique_index(librarian_collection, "librarian_id", "librarian_id_unique")
+    create_unique_index(book_collection, "book_id", "book_id_unique")
+    # Relevance-ranked full-text search, titles weighing more than authors
+    book_collection.create_index(
+        [("book_name", "text"), ("author", "text")],
+        name="book_text",
+        weights={"book_name": 10, "author": 5},
+    )
+    book_collection.create_index("search_name", name="search_name")
+    book_collection.create_index("search_author", name="search_author")
+    # Multikey index over the issue records of every book
+    book_collection.create_index("issued_to.student_id", name="issued_student_id")
+    # Only books that are currently issued are indexed
+    book_collection.create_index(
+        [("book_id", 1), ("issued_to.student_id", 1)],
+        name="issued_books",
+        partialFilterExpression=ISSUED_BOOKS_FILTER,
+    )
+
+
+def backfill_search_fields():
+    """Add the normalized search fields to books stored without them"""
+    # Missing titles or authors get empty search fields, so that every
+    # book is updated and only backfilled once
+    empty = dict.fromkeys(SEARCH_FIELDS.values(), "")
+    updates = [
+        UpdateOne({"_id": book["_id"]}, {"$set": {**empty, **search_fields(book)}})
+        for book in book_collection.find(
+            {"search_name": {"$exists": False}}, {"book_name": 1, "author": 1}
+        )
+    ]
+    if updates:
+        book_collection.bulk_write(updates, ordered=False)
+        print(f"Added search fields to {len(updates)} books")
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """All stage names of an explain plan tree"""
+    stages = [plan["stage"]] if "stage" in plan else []
+    for value in plan.values():
+        children = value if isinstance(value, list) else [value]
+        for child in children:
+            if isinstance(child, dict):
+                stages.extend(_plan_stages(child))
+    return stages
+
+
+def check_query_plans():
+    """Raise if a query of the hot routes would scan a whole collection"""
+    hot_queries = [
+        (student_collection, {"email": ""}, None),
+        (student_collection, {"student_id": "", "username": ""}, None),
+        (librarian_collection, {"email": ""}, None),
+        (librarian_collection, {"librarian_id": ""}, None),
+        (book_collection, {"book_id": ""}, None),
+        (book_collection, {"book_id": {"$gt": ""}}, "book_id"),
+        (book_collection, {"issued_to.student_id": ""}, None),
+        (book_collection, ISSUED_BOOKS_FILTER, "book_id"),
+        (book_collection, {"search_name": {"$regex": "^a"}}, "search_name"),
+        (book_collection, {"search_author": {"$regex": "^a"}}, "search_author"),
+    ]
+    for collection, query, sort in hot_queries:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort, 1)
+        winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            raise RuntimeError(
+                f"Query {query} on {collection.name} uses a collection scan"
+            )
+
+
+def prepare_database():
+    """Create the indexes, backfill search fields and check query plans"""
+    try:
+        ensure_indexes()
+        backfill_search_fields()
+        check_query_plans()
+        print("MongoDB indexes verified successfully!")
+    except Exception as e:
+        print(f"MongoDB index error: {e}")
+        raise
+
+
 # Input Validation Functions
 def validate_email(email: str) -> bool:
     """Validate email format"""
@@ -104,6 +258,448 @@ def validate_publication_date(date_str: str) -> bool:
         return False
 
 
+# Pagination Helpers
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Search results are paged by offset; deep pages and long queries are refused
+MAX_SEARCH_PAGE = 50
+MAX_SEARCH_LENGTH = 100
+SEARCH_MODES = ("text", "prefix", "fuzzy")
+
+# Fields that can be requested with ?fields=
+BOOK_FIELDS = {
+    "book_id",
+    "book_name",
+    "author",
+    "price",
+    "quantity",
+    "publication",
+    "publication_date",
+    "created_at",
+    "updated_at",
+    "issued_to",
+}
+
+
+def encode_cursor(book_id: str) -> str:
+    """Opaque next-page token for the last book of a page"""
+    return base64.urlsafe_b64encode(book_id.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """book_id after which the next page starts; raises ValueError if invalid"""
+    try:
+        book_id = base64.b64decode(cursor, altchars=b"-_", validate=True).decode(
+            "utf-8"
+        )
+    except ValueError as e:  # binascii.Error, UnicodeError, non-ASCII input
+        raise ValueError("Invalid cursor") from e
+    if not book_id:
+        raise ValueError("Invalid cursor")
+    return book_id
+
+
+def parse_page_size(value: Optional[str]) -> int:
+    """Page size from ?limit=, clamped to MAX_PAGE_SIZE"""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError("Invalid limit")
+    limit = int(value)
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_page(value: Optional[str]) -> int:
+    """1-based page number from ?page=, up to MAX_SEARCH_PAGE"""
+    if value is None:
+        return 1
+    if not value.isdigit() or not 1 <= int(value) <= MAX_SEARCH_PAGE:
+        raise ValueError("Invalid page")
+    return int(value)
+
+
+def parse_projection(value: Optional[str]) -> Dict[str, int]:
+    """Projection from ?fields=a,b,c; book_id is always included"""
+    if not value:
+        return HIDE_SEARCH_FIELDS
+    fields = {field.strip() for field in value.split(",") if field.strip()}
+    if not fields <= BOOK_FIELDS:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(fields - BOOK_FIELDS))}")
+    projection = {field: 1 for field in fields | {"book_id"}}
+    projection["_id"] = 0
+    return projection
+
+
+# Streaming Helpers
+NDJSON_MIMETYPE = "application/x-ndjson"
+DEFAULT_BATCH_SIZE = 1000
+MAX_BATCH_SIZE = 10000
+
+
+def wants_ndjson() -> bool:
+    """Whether the client asked for a newline-delimited JSON stream"""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def parse_batch_size(value: Optional[str]) -> int:
+    """Cursor batch size from ?batch_size=, clamped to MAX_BATCH_SIZE"""
+    if value is None:
+        return DEFAULT_BATCH_SIZE
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError("Invalid batch size")
+    return min(int(value), MAX_BATCH_SIZE)
+
+
+def stream_books(cursor) -> Response:
+    """NDJSON response with one book per line, read batch by batch from cursor"""
+
+    def generate():
+        try:
+            for book in cursor:
+                if "_id" in book:
+                    book["_id"] = str(book["_id"])
+                yield app.json.dumps(book) + "\n"
+        except Exception as e:
+            print(f"Error streaming books: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    return Response(generate(), mimetype=NDJSON_MIMETYPE)
+
+
+# In-Memory Search Index
+# Set IN_MEMORY_SEARCH=1 to answer prefix and fuzzy searches from memory
+SEARCH_INDEX_ENABLED = os.getenv("IN_MEMORY_SEARCH", "").lower() in ("1", "true")
+
+# Consecutive change stream failures before searches go back to MongoDB
+CHANGE_STREAM_RETRIES = 5
+
+# Issue records change often and are not shown in search results
+SEARCH_INDEX_HIDDEN_FIELDS = (*SEARCH_FIELDS.values(), "issued_to")
+SEARCH_INDEX_PROJECTION = dict.fromkeys(SEARCH_INDEX_HIDDEN_FIELDS, 0)
+
+
+def word_trigrams(word: str) -> Set[str]:
+    """Trigrams of a word padded with spaces, so that word starts weigh more"""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class BookSearchIndex:
+    """
+    In-memory index over book titles and authors: sorted normalized titles
+    and authors for prefix autocomplete (matching like the MongoDB prefix
+    mode) and trigram postings of their distinct words for fuzzy matching
+    """
+
+    def __init__(self, min_similarity: float = 0.3, max_expansion: int = 1000):
+        self.min_similarity = min_similarity
+        self.max_expansion = max_expansion
+        self.books: Dict[str, Dict[str, Any]] = {}
+        self._book_ids: Dict[str, str] = {}  # str(_id) -> book_id
+        # Normalized search field values (search_name, search_author) of
+        # every book, and per field the sorted values and their books
+        self._book_texts: Dict[str, Dict[str, str]] = {}
+        self._texts: Dict[str, List[str]] = {f: [] for f in SEARCH_FIELDS.values()}
+        self._text_books: Dict[str, Dict[str, Set[str]]] = {
+            field: {} for field in SEARCH_FIELDS.values()
+        }
+        # Words of the titles and authors
+        self._word_books: Dict[str, Set[str]] = {}
+        self._word_trigrams: Dict[str, Set[str]] = defaultdict(set)
+        # Query word -> _similar_words result, valid until the words change
+        self._similar_cache: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, books):
+        """Fill an empty index with many books, sorting the texts once at the end"""
+        with self._lock:
+            for book in books:
+                self._insert(book, keep_sorted=False)
+            for field, text_books in self._text_books.items():
+                self._texts[field] = sorted(text_books)
+
+    def add(self, book: Dict[str, Any]):
+        """Index a book, replacing the previous version with its book_id"""
+        with self._lock:
+            self._remove(book["book_id"])
+            self._insert(book, keep_sorted=True)
+
+    def remove(self, book_id: str):
+        """Drop a book from the index"""
+        with self._lock:
+            self._remove(book_id)
+
+    def apply_change(self, change: Dict[str, Any]):
+        """Apply one event of a book collection change stream"""
+        if change["operationType"] == "delete":
+            with self._lock:
+                book_id = self._book_ids.get(str(change["documentKey"]["_id"]))
+                if book_id:
+                    self._remove(book_id)
+        elif change.get("fullDocument"):
+            self.add(change["fullDocument"])
+
+    def _insert(self, book: Dict[str, Any], keep_sorted: bool):
+        book = {
+            key: value
+            for key, value in book.items()
+            if key not in SEARCH_INDEX_HIDDEN_FIELDS
+        }
+        book_id = book["book_id"]
+        if "_id" in book:
+            book["_id"] = str(book["_id"])
+            self._book_ids[book["_id"]] = book_id
+        self.books[book_id] = book
+
+        texts = {
+            search_field: normalize_search_text(book.get(field))
+            for field, search_field in SEARCH_FIELDS.items()
+        }
+        self._book_texts[book_id] = texts
+        for field, text in texts.items():
+            if not text:
+                continue
+            text_books = self._text_books[field]
+            if text not in text_books:
+                text_books[text] = set()
+                if keep_sorted:
+                    bisect.insort(self._texts[field], text)
+            text_books[text].add(book_id)
+        for word in {word for text in texts.values() for word in text.split()}:
+            if word not in self._word_books:
+                self._word_books[word] = set()
+                self._similar_cache.clear()
+                for trigram in word_trigrams(word):
+                    self._word_trigrams[trigram].add(word)
+            self._word_books[word].add(book_id)
+
+    def _remove(self, book_id: str):
+        book = self.books.pop(book_id, None)
+        if book is None:
+            return
+        self._book_ids.pop(book.get("_id"), None)
+        texts = self._book_texts.pop(book_id)
+        for field, text in texts.items():
+            if not text:
+                continue
+            text_books = self._text_books[field]
+            text_books[text].discard(book_id)
+            if not text_books[text]:
+                del text_books[text]
+                del self._texts[field][bisect.bisect_left(self._texts[field], text)]
+        for word in {word for text in texts.values() for word in text.split()}:
+            self._word_books[word].discard(book_id)
+            if self._word_books[word]:
+                continue
+            del self._word_books[word]
+            self._similar_cache.clear()
+            for trigram in word_trigrams(word):
+                words = self._word_trigrams[trigram]
+                words.discard(word)
+                if not words:
+                    del self._word_trigrams[trigram]
+
+    def prefix_search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Books whose title or author starts with prefix, ordered by title and
+        book_id like the MongoDB prefix mode
+        """
+        prefix = normalize_search_text(prefix)
+        if not prefix:
+            return []
+        matches = set()
+        with self._lock:
+            for field, texts in self._texts.items():
+                i = bisect.bisect_left(texts, prefix)
+                while i < len(texts) and texts[i].startswith(prefix):
+                    matches.update(self._text_books[field][texts[i]])
+                    i += 1
+            ranked = heapq.nsmallest(
+                limit,
+                matches,
+                key=lambda book_id: (
+                    self._book_texts[book_id]["search_name"],
+                    book_id,
+                ),
+            )
+            return [self.books[book_id] for book_id in ranked]
+
+    def _similar_words(self, word: str) -> Dict[str, float]:
+        """
+        Indexed words whose trigram similarity (shared over distinct
+        trigrams of both) to word is at least min_similarity
+        """
+        if word in self._similar_cache:
+            return self._similar_cache[word]
+        trigrams = word_trigrams(word)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self._word_trigrams.get(trigram, ()))
+        # The union has at least len(trigrams) trigrams, so fewer shared ones
+        # cannot reach min_similarity
+        min_shared = self.min_similarity * len(trigrams)
+        similar = {}
+        for candidate, count in shared.most_common():
+            if count < min_shared:
+                break
+            similarity = count / (len(trigrams) + len(candidate) + 1 - count)
+            if similarity >= self.min_similarity:
+                similar[candidate] = similarity
+        if len(self._similar_cache) >= 10000:
+            self._similar_cache.clear()
+        self._similar_cache[word] = similar
+        return similar
+
+    def _postings(self, similar: Dict[str, float]) -> int:
+        return sum(len(self._word_books[word]) for word in similar)
+
+    def _expand(
+        self, similar: Dict[str, float], cap: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Books having one of the similar words with their best similarity,
+        most similar words first, stopping at cap books
+        """
+        best = {}
+        for word, similarity in sorted(similar.items(), key=lambda item: -item[1]):
+            for book_id in self._word_books[word]:
+                if book_id not in best:
+                    best[book_id] = similarity
+                    if cap and len(best) >= cap:
+                        return best
+        return best
+
+    def _rescore(
+        self, similar: Dict[str, float], candidates: Dict[str, float]
+    ) -> Dict[str, float]:
+        """Best similarity of the candidate books having one of the similar words"""
+        best = {}
+        for word, similarity in similar.items():
+            for book_id in self._word_books[word].intersection(candidates):
+                if similarity > best.get(book_id, 0.0):
+                    best[book_id] = similarity
+        return best
+
+    def fuzzy_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Books matching the query words with typos, best first; the score of
+        a book is the mean over the query words of its most similar word
+        """
+        words = set(normalize_search_text(query).split())
+        if not words:
+            return []
+        with self._lock:
+            matches = sorted(map(self._similar_words, words), key=self._postings)
+            # The rarest word, and other words as rare as max_expansion
+            # books, find the candidates; common words such as "the" only
+            # add to their scores
+            scores = self._expand(matches[0], self.max_expansion)
+            for similar in matches[1:]:
+                if self._postings(similar) <= self.max_expansion:
+                    best = self._expand(similar)
+                else:
+                    best = self._rescore(similar, scores)
+                for book_id, similarity in best.items():
+                    scores[book_id] = scores.get(book_id, 0.0) + similarity
+            ranked = heapq.nsmallest(
+                limit, ((-score, book_id) for book_id, score in scores.items())
+            )
+            return [
+                {**self.books[book_id], "score": -score / len(words)}
+                for score, book_id in ranked
+            ]
+
+
+def watch_books(resume_token=None):
+    return book_collection.watch(
+        full_document="updateLookup", resume_after=resume_token
+    )
+
+
+def build_search_index() -> BookSearchIndex:
+    """Load every book into a new index and follow changes when possible"""
+    index = BookSearchIndex()
+    # Open the change stream first so that no write between the load and
+    # the stream is missed
+    try:
+        stream = watch_books()
+    except OperationFailure:
+        stream = None
+        print("Change streams unavailable; search index follows the book routes")
+    index.load(book_collection.find({}, SEARCH_INDEX_PROJECTION))
+    if stream is not None:
+        threading.Thread(
+            target=follow_book_changes, args=(index, stream), daemon=True
+        ).start()
+    print(f"Search index built with {len(index.books)} books")
+    return index
+
+
+def follow_book_changes(index: BookSearchIndex, stream):
+    """
+    Apply book changes to the index, reopening the stream from its last
+    resume token after an error; when it cannot be reopened the index is
+    dropped so that searches go back to MongoDB
+    """
+    global search_index
+    resume_token = stream.resume_token
+    failures = 0
+    while True:
+        try:
+            if stream is None:
+                stream = watch_books(resume_token)
+            for change in stream:
+                index.apply_change(change)
+                resume_token = stream.resume_token
+                failures = 0
+            # The stream was invalidated, e.g. by dropping the collection
+            error = "change stream closed"
+        except PyMongoError as e:
+            error = e
+        if stream is not None:
+            stream.close()
+            stream = None
+        failures += 1
+        if failures > CHANGE_STREAM_RETRIES:
+            print(f"Search index disabled, change stream lost: {error}")
+            if search_index is index:
+                search_index = None
+            return
+        print(f"Change stream error, reopening: {error}")
+        time.sleep(2**failures)
+
+
+def refresh_search_index(book_id: str):
+    """Re-read a book after a write so that the index shows it at once"""
+    index = search_index
+    if index is None:
+        return
+    book = book_collection.find_one({"book_id": book_id}, SEARCH_INDEX_PROJECTION)
+    if book:
+        index.add(book)
+    else:
+        index.remove(book_id)
+
+
+search_index: Optional[BookSearchIndex] = None
+
+
+def start_search_index():
+    """Build the in-memory search index when IN_MEMORY_SEARCH is set"""
+    global search_index
+    if not SEARCH_INDEX_ENABLED or search_index is not None:
+        return
+    try:
+        search_index = build_search_index()
+    except Exception as e:
+        print(f"Search index error: {e}")
+        raise
+
+
 # Authentication Routes
 @app.route("/api/student/register", methods=["POST"])
 def register_student():
@@ -477,23 +1073,60 @@ def reset_librarian_password():
 @app.route("/api/books", methods=["GET"])
 def get_all_books():
     try:
-        books = list(book_collection.find())
+        try:
+            limit = parse_page_size(request.args.get("limit"))
+            projection = parse_projection(request.args.get("fields"))
+            after = request.args.get("after")
+            query = {"book_id": {"$gt": decode_cursor(after)}} if after else {}
+            batch_size = parse_batch_size(request.args.get("batch_size"))
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+        # Stream the whole catalog (from the cursor on) unless a limit is given
+        if wants_ndjson():
+            cursor = book_collection.find(query, projection).sort("book_id", 1)
+            if "limit" in request.args:
+                cursor = cursor.limit(limit)
+            return stream_books(cursor.batch_size(batch_size))
+
+        # Keyset pagination on the unique book_id index; one extra book
+        # tells whether there is a next page
+        books = list(
+            book_collection.find(query, projection).sort("book_id", 1).limit(limit + 1)
+        )
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            next_cursor = encode_cursor(books[-1]["book_id"])
 
         # Convert ObjectId to string for JSON serialization
         for book in books:
-            book["_id"] = str(book["_id"])
+            if "_id" in book:
+                book["_id"] = str(book["_id"])
 
-        return jsonify({"success": True, "books": books}), 200
+        return (
+            jsonify({"success": True, "books": books, "next_cursor": next_cursor}),
+            200,
+        )
 
     except Exception as e:
         print(f"Error fetching books: {e}")
         return jsonify({"success": False, "message": "Failed to fetch books"}), 500
 
 
+@app.route("/api/search/capabilities", methods=["GET"])
+def search_capabilities():
+    # Lets the UI search keystrokes from memory instead of MongoDB
+    in_memory = search_index is not None
+    modes = [mode for mode in SEARCH_MODES if in_memory or mode != "fuzzy"]
+    return jsonify({"success": True, "in_memory": in_memory, "modes": modes}), 200
+
+
 @app.route("/api/books/search", methods=["GET"])
 def search_books():
     try:
-        query = request.args.get("query", "")
+        query = request.args.get("query", "").strip()
+        mode = request.args.get("mode", "text")
 
         if not query:
             return (
@@ -501,22 +1134,61 @@ def search_books():
                 400,
             )
 
-        books = list(
-            book_collection.find(
-                {
-                    "$or": [
-                        {"book_name": {"$regex": query, "$options": "i"}},
-                        {"author": {"$regex": query, "$options": "i"}},
-                    ]
-                }
+        if len(query) > MAX_SEARCH_LENGTH or mode not in SEARCH_MODES:
+            return jsonify({"success": False, "message": "Invalid search"}), 400
+
+        # Fuzzy matching is only available from the in-memory index
+        index = search_index
+        if mode == "fuzzy" and index is None:
+            return (
+                jsonify({"success": False, "message": "Fuzzy search is disabled"}),
+                400,
             )
-        )
+
+        try:
+            limit = parse_page_size(request.args.get("limit"))
+            page = parse_page(request.args.get("page"))
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+        if index is not None and mode != "text":
+            # Served from memory; one extra book tells whether there is a
+            # next page
+            search = index.prefix_search if mode == "prefix" else index.fuzzy_search
+            books = search(query, page * limit + 1)[(page - 1) * limit :]
+            next_page = page + 1 if len(books) > limit else None
+            return (
+                jsonify(
+                    {"success": True, "books": books[:limit], "next_page": next_page}
+                ),
+                200,
+            )
+
+        if mode == "text":
+            # Text index search, best matches first
+            score = {"$meta": "textScore"}
+            cursor = book_collection.find(
+                {"$text": {"$search": query}}, {**HIDE_SEARCH_FIELDS, "score": score}
+            ).sort([("score", score), ("book_id", 1)])
+        else:
+            # Autocomplete: anchored prefix of the normalized title or
+            # author, escaped so that user input is never a pattern
+            prefix = {"$regex": "^" + re.escape(normalize_search_text(query))}
+            cursor = book_collection.find(
+                {"$or": [{"search_name": prefix}, {"search_author": prefix}]},
+                HIDE_SEARCH_FIELDS,
+            ).sort([("search_name", 1), ("book_id", 1)])
+
+        # One extra book tells whether there is a next page
+        books = list(cursor.skip((page - 1) * limit).limit(limit + 1))
+        next_page = page + 1 if len(books) > limit else None
+        books = books[:limit]
 
         # Convert ObjectId to string for JSON serialization
         for book in books:
             book["_id"] = str(book["_id"])
 
-        return jsonify({"success": True, "books": books}), 200
+        return jsonify({"success": True, "books": books, "next_page": next_page}), 200
 
     except Exception as e:
         print(f"Error searching books: {e}")
@@ -526,7 +1198,7 @@ def search_books():
 @app.route("/api/books/<book_id>", methods=["GET"])
 def get_book(book_id):
     try:
-        book = book_collection.find_one({"book_id": book_id})
+        book = book_collection.find_one({"book_id": book_id}, HIDE_SEARCH_FIELDS)
 
         if not book:
             return jsonify({"success": False, "message": "Book not found"}), 404
@@ -600,9 +1272,13 @@ def add_book():
             "created_at": datetime.now(timezone.utc),
             "issued_to": [],  # Initialize empty issued list
         }
+        book_data.update(search_fields(book_data))
 
         # Insert book
         result = book_collection.insert_one(book_data)
+        index = search_index
+        if index is not None:
+            index.add(book_data)
 
         return (
             jsonify(
@@ -659,11 +1335,15 @@ def update_book(book_id):
                 400,
             )
 
+        # Keep the search fields in step with book_name and author
+        update_data.update(search_fields(update_data))
+
         # Add update timestamp
         update_data["updated_at"] = datetime.now(timezone.utc)
 
         # Update book
         book_collection.update_one({"book_id": book_id}, {"$set": update_data})
+        refresh_search_index(book_id)
 
         return jsonify({"success": True, "message": "Book updated successfully"}), 200
 
@@ -694,6 +1374,9 @@ def remove_book(book_id):
 
         # Remove book
         book_collection.delete_one({"book_id": book_id})
+        index = search_index
+        if index is not None:
+            index.remove(book_id)
 
         return jsonify({"success": True, "message": "Book removed successfully"}), 200
 
@@ -767,6 +1450,7 @@ def issue_book(book_id):
                 },
             },
         )
+        refresh_search_index(book_id)
 
         return (
             jsonify(
@@ -829,6 +1513,7 @@ def return_book(book_id):
                 },
             },
         )
+        refresh_search_index(book_id)
 
         return jsonify({"success": True, "message": "Book returned successfully"}), 200
 
@@ -841,10 +1526,19 @@ def return_book(book_id):
 def get_all_issued_books():
     try:
         # Find all books with at least one entry in issued_to array
-        issued_books = list(
-            book_collection.find({"issued_to": {"$exists": True, "$ne": []}})
+        cursor = book_collection.find(ISSUED_BOOKS_FILTER, HIDE_SEARCH_FIELDS).sort(
+            "book_id", 1
         )
 
+        if wants_ndjson():
+            try:
+                batch_size = parse_batch_size(request.args.get("batch_size"))
+            except ValueError as e:
+                return jsonify({"success": False, "message": str(e)}), 400
+            return stream_books(cursor.batch_size(batch_size))
+
+        issued_books = list(cursor)
+
         # Convert ObjectId to string for JSON serialization
         for book in issued_books:
             book["_id"] = str(book["_id"])
@@ -900,6 +1594,21 @@ def get_student_issued_books(student_id):
         )
 
 
+def start_up():
+    """
+    Prepare the database and the search index; called once by the process
+    that serves requests (see __main__), or by a WSGI entry point before
+    serving app
+    """
+    prepare_database()
+    start_search_index()
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    debug = True
+    # The debug reloader runs the server in a child process with
+    # WERKZEUG_RUN_MAIN set; the watching parent only restarts it
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_up()
+    app.run(debug=debug)
 # Generated by Copilot
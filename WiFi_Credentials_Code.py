@@ -1,146 +1,169 @@
+import math
+
 import CoolProp
-import CoolProp.CoolProp as CP
-print('CoolProp version:', CoolProp.__version__)
-from CoolProp.CoolProp import PropsSI
-#Power Need to generate
-#Given 250 MVA electrical generator supplying electricity to the regional grid
-# Considering Power factor 0.9
-# Combined Cycle
-# GAS CYCLE PART( Brayton Cycle)
-## State 5
-p5=100*10**3
-t5=300
-h5=(PropsSI('H','P', p5,'T',t5,'Air'))
-print('h5=',h5/1000,'KJ/kg')
+import numpy as np
+from thermo.combined import combined_cycle_batch, combined_cycle_sweep
 
-s5 = PropsSI('S','P', p5,'T',t5,'Air')
-print('s5=',s5/1000,'KJ/kg')
-#State 6
-#Considering compressor efficiency of the steam 84%
-#Calculated the compressor output temperature t6=610k
-t6=678 #k
-p6=1200*10**3
-h6=(PropsSI('H','P', p6,'T',t6,'Air'))
-s6 = PropsSI('S','P', p6,'T',t6,'Air')
-print('h6=',h6/1000,'KJ/kg')
-print('s6=',s6/1000,'KJ/kg')
-##state 7
-p7=1200*10**3
-t7=1400 #k
-h7=(PropsSI('H','P', p7,'T',t7,'Air'))
-print('h7=',h7/1000,'KJ/kg')
-s7 = PropsSI('S','P', p7,'T',t7,'Air')
-print('s7=',s7/1000,'KJ/kg')
-#State 8
-#Gas turbine efficiency 88%
-#Calculated the turbine output temperature t6=778 k
-t8=778.68341 #k
-p8=p5
-h8=(PropsSI('H','P', p5,'T',t8,'Air'))
-print('h8=',h8/1000,'KJ/kg')
-s8 = PropsSI('S','P', p8,'T',t8,'Air')
-print('s8=',s8/1000,'KJ/kg')
-#State 9
-t9=400 #k
-p9=p5
-h9=(PropsSI('H','P', p5,'T',t9,'Air'))
-print('h9=',h9/1000,'KJ/kg')
-s9 = PropsSI('S','P', p5,'T',t9,'Air')
-print('s9=',s9/1000,'KJ/kg')
-## FOR STEAM PORTION
-##Turbine and pump Efficicency 90% and 80%
-#State 1
-p1=8000 #pa
-q1=0
-h1=(PropsSI('H','P', p1,'Q',q1,'water'))
-print('h1=',h1/1000,'KJ/kg')
 
-x=h1/1000
-s1 = PropsSI('S','P', p1,'Q',q1,'water')
-print('s1=',s1/1000,'KJ/kg')
-#State 2
-p2=8*10**6
-Wpump=10.05993 #kJ/kg (work done by pump when efficiency is 80%)
-h2= x+Wpump
-print('h2=', x + Wpump,'KJ/kg')
-s2 = PropsSI('S','H', h2*1000,'P',p2,'water')
-print('s2=',s2/1000,'KJ/kg')
-#State 3
-p3=8*10**6
-t3=673 #k
-h3=(PropsSI('H','P', p3,'T',t3,'water'))
-print('h3=',h3/1000,'KJ/kg')
-s3 = PropsSI('S','T',t3,'P',p3,'water')
-print('s3=',s3/1000,'KJ/kg')
-#State 4
-p4=p1
-q4=0.8077 #Considering Turbine efficiency 90%
-h4=(PropsSI('H','P', p4,'Q',q4,'water'))
-print('h4=',h4/1000,'KJ/kg')
-s4 = PropsSI('S','P',p4,'Q',q4,'water')
-print('s4=',s4/1000,'KJ/kg')
-## THERMAL EFFICIENCY
-#ENERGY BALANCE IN THE HRSG
-#Mg*Cp(t8-t9)=Ms(h3-h2)
-#Ms/Mg=0.128
-#WE GET Mg=100 kg/s & Ms=12.8369 Kg/s
-Mg=100 #kg/s
-Ms=12.8369 #kg/s
-Qin=(Mg*(h7-h6))/10**6 # KJ/Kg
-print('Qin=',(Mg*(h7-h6))/10**6,'MW')
-#1st Law efficiency
-Wnet=Mg*(h7-h8)+Ms*(h3-h4)-Mg*(h6-h5)-Ms*(h2*10**3-h1)
-print('Wnet=',Wnet/10**6,'MW')
-print('Eta=',((Wnet/10**6)/Qin)*100,'%')
-# ||EXERGY ANALYSIS||
-## T0= 300k and p0=100kpa
+def main():
+    print('CoolProp version:', CoolProp.__version__)
+    #Power Need to generate
+    #Given 250 MVA electrical generator supplying electricity to the regional grid
+    # Considering Power factor 0.9
+    # Combined Cycle
+    # Compressor efficiency 84%, gas turbine efficiency 88%,
+    # steam turbine and pump efficiency 90% and 80%
+    p5=100*10**3
+    t5=300
+    p6=1200*10**3
+    t7=1400 #k
+    t9=400 #k
+    p1=8000 #pa
+    p2=8*10**6
+    t3=673 #k
+    Mg=100 #kg/s
+    cycle=combined_cycle_batch(P_condenser=p1,T_turbine_inlet=t7,Pr=p6/p5,T_ambient=t5,
+                               P_ambient=p5,eff_compressor=0.84,eff_gas_turbine=0.88,
+                               P_boiler=p2,T_steam=t3,eff_steam_turbine=0.90,eff_pump=0.80,
+                               T_stack=t9,m_gas=Mg)
+    gas=cycle['gas_states']
+    steam=cycle['steam_states']
+    # GAS CYCLE PART( Brayton Cycle)
+    ## State 5
+    h5=gas['5']['h']
+    print('h5=',h5/1000,'KJ/kg')
+    s5 = gas['5']['s']
+    print('s5=',s5/1000,'KJ/kg')
+    #State 6
+    #Compressor output temperature from the compressor efficiency
+    t6=gas['6']['T']
+    print('t6=',t6,'K')
+    h6=gas['6']['h']
+    s6 = gas['6']['s']
+    print('h6=',h6/1000,'KJ/kg')
+    print('s6=',s6/1000,'KJ/kg')
+    ##state 7
+    p7=p6
+    h7=gas['7']['h']
+    print('h7=',h7/1000,'KJ/kg')
+    s7 = gas['7']['s']
+    print('s7=',s7/1000,'KJ/kg')
+    #State 8
+    #Turbine output temperature from the gas turbine efficiency
+    t8=gas['8']['T']
+    print('t8=',t8,'K')
+    p8=p5
+    h8=gas['8']['h']
+    print('h8=',h8/1000,'KJ/kg')
+    s8 = gas['8']['s']
+    print('s8=',s8/1000,'KJ/kg')
+    #State 9
+    p9=p5
+    h9=gas['9']['h']
+    print('h9=',h9/1000,'KJ/kg')
+    s9 = gas['9']['s']
+    print('s9=',s9/1000,'KJ/kg')
+    ## FOR STEAM PORTION
+    #State 1
+    h1=steam['1']['h']
+    print('h1=',h1/1000,'KJ/kg')
+
+    x=h1/1000
+    s1 = steam['1']['s']
+    print('s1=',s1/1000,'KJ/kg')
+    #State 2
+    Wpump=(steam['2']['h']-h1)/1000 #kJ/kg (work done by pump when efficiency is 80%)
+    print('Wpump=',Wpump,'KJ/kg')
+    h2= x+Wpump
+    print('h2=', x + Wpump,'KJ/kg')
+    s2 = steam['2']['s']
+    print('s2=',s2/1000,'KJ/kg')
+    #State 3
+    h3=steam['3']['h']
+    print('h3=',h3/1000,'KJ/kg')
+    s3 = steam['3']['s']
+    print('s3=',s3/1000,'KJ/kg')
+    #State 4
+    p4=p1
+    q4=cycle['metrics']['x_turbine_exit'] #Turbine efficiency 90%
+    print('q4=',q4)
+    h4=steam['4']['h']
+    print('h4=',h4/1000,'KJ/kg')
+    s4 = steam['4']['s']
+    print('s4=',s4/1000,'KJ/kg')
+    ## THERMAL EFFICIENCY
+    #ENERGY BALANCE IN THE HRSG
+    #Mg*(h8-h9)=Ms(h3-h2)
+    Ms=cycle['metrics']['m_steam'] #kg/s
+    print('Ms=',Ms,'kg/s')
+    Qin=(Mg*(h7-h6))/10**6 # KJ/Kg
+    print('Qin=',(Mg*(h7-h6))/10**6,'MW')
+    #1st Law efficiency
+    Wnet=Mg*(h7-h8)+Ms*(h3-h4)-Mg*(h6-h5)-Ms*(h2*10**3-h1)
+    print('Wnet=',Wnet/10**6,'MW')
+    print('Eta=',((Wnet/10**6)/Qin)*100,'%')
+    # ||EXERGY ANALYSIS||
+    ## T0= 300k and p0=100kpa
+
+    T0=300
+    p0=100*10**3
+    #1. GAS Turbine
+    Xdest78 = Mg*T0*(s8/10**3-s7/10**3-0.287*(math.log((p8/p7),2.718)))
+    print('Xdest78=',Xdest78/10**3,'MW')
+    #2. Compressor
+    Xdest56 = Mg*T0*(s6/10**3-s5/10**3-0.287*(math.log((p6/p7),2.718)))
+    print('Xdest56=',Xdest56/10**3,'MW')
+    # 3. Steam Turbine
+    Xdest34 = Ms*T0*(s4/10**3-s3/10**3)
+    print('Xdest34=',Xdest34/10**3,'MW')
+    #4.Pump
+    Xdest12 = Ms*T0*(s2/10**3-s1/10**3)
+    print('Xdest12=',Xdest12/10**3,'MW')
+    #5.HRSH
+    Xdest=Ms*T0*(s3/10**3-s2/10**3)+Mg*T0*(s9/10**3-s8/10**3)
+    print('Xdest=',Xdest/10**3,'MW')
+    # State 6-7
+    qin67=(h7-h6)/10**3
+    print('qin67',qin67,'KJ/Kg')
+    Tin=1600 #k
+    Xdest67 = Mg*T0*(s7/10**3-s6/10**3-qin67/Tin)
+    print('Xdest67=',Xdest67/10**3,'MW')
+    #Condenser State 4-1
+    qout41=(h4-h1)/10**3
+    print('qout41',qout41,'KJ/Kg')
+    Tout=300 #k
+    Xdest41 = Ms*T0*(s1/10**3-s4/10**3+qout41/Tout)
+    print('Xdest41=',Xdest41/10**3,'MW')
+    # Total Exergy Destruction
+    XdestTotal=(Xdest78+Xdest56+Xdest34+Xdest12+Xdest+Xdest67+Xdest41)/10**3
+    print('XdestTotal=',XdestTotal,'MW')
+    #NOW Exergy expanded
+    Xdestin=(1-T0/Tin)*Qin
+    print('Xdestin=',Xdestin,'MW')
+    Xwpump=Ms*(h2-h1/10**3)/10**3
+    print('Xwpump=',Xwpump,'MW')
+
+    Xwcomp=Mg*(h6-h5)/10**6
+    print('Xwcomp=',Xwcomp,'MW')
+    Xexpanded=(Xdestin+Xwpump+Xwcomp)
+    print('Xexpanded=',Xexpanded,'MW')
+    ## Second Law Efficiency
+    Eta2=(1-XdestTotal/Xexpanded)
+    print('Eta2=',Eta2*100,'%')
+    #Gas Turbine Outpu
+    WTurbineOut=(Mg*(h7/10**3-h8/10**3)+Ms*(h3/10**3-h4/10**3))/10**3
+    print('WTurbineOut=',WTurbineOut,'MW')
+    # ||CONDENSER PRESSURE AND TURBINE INLET TEMPERATURE STUDY||
+    p_condenser=np.linspace(5*10**3,20*10**3,31) #pa
+    t_inlet=np.linspace(1200,1600,41) #k
+    sweep=combined_cycle_sweep(p_condenser,t_inlet,Pr=p6/p5,T_ambient=t5,P_ambient=p5,
+                               eff_compressor=0.84,eff_gas_turbine=0.88,P_boiler=p2,
+                               T_steam=t3,eff_steam_turbine=0.90,eff_pump=0.80,
+                               T_stack=t9,m_gas=Mg)
+    eta=sweep['metrics']['thermal_eff']
+    i,j=np.unravel_index(np.nanargmax(eta),eta.shape)
+    print('Best Eta=',eta[i,j],'% at p_condenser=',p_condenser[i]/10**3,'kPa and t7=',t_inlet[j],'K')
 
-import math
-T0=300
-p0=100*10**3
-#1. GAS Turbine
-Xdest78 = Mg*T0*(s8/10**3-s7/10**3-0.287*(math.log((p8/p7),2.718)))
-print('Xdest78=',Xdest78/10**3,'MW')
-#2. Compressor
-Xdest56 = Mg*T0*(s6/10**3-s5/10**3-0.287*(math.log((p6/p7),2.718)))
-print('Xdest56=',Xdest56/10**3,'MW')
-# 3. Steam Turbine
-Xdest34 = Ms*T0*(s4/10**3-s3/10**3)
-print('Xdest34=',Xdest34/10**3,'MW')
-#4.Pump
-Xdest12 = Ms*T0*(s2/10**3-s1/10**3)
-print('Xdest12=',Xdest12/10**3,'MW')
-#5.HRSH
-Xdest=Ms*T0*(s3/10**3-s2/10**3)+Mg*T0*(s9/10**3-s8/10**3)
-print('Xdest=',Xdest/10**3,'MW')
-# State 6-7
-qin67=(h7-h6)/10**3
-print('qin67',qin67,'KJ/Kg')
-Tin=1600 #k
-Xdest67 = Mg*T0*(s7/10**3-s6/10**3-qin67/Tin)
-print('Xdest67=',Xdest67/10**3,'MW')
-#Condenser State 4-1
-qout41=(h4-h1)/10**3
-print('qout41',qout41,'KJ/Kg')
-Tout=300 #k
-Xdest41 = Ms*T0*(s1/10**3-s4/10**3+qout41/Tout)
-print('Xdest41=',Xdest41/10**3,'MW')
-# Total Exergy Destruction
-XdestTotal=(Xdest78+Xdest56+Xdest34+Xdest12+Xdest+Xdest67+Xdest41)/10**3
-print('XdestTotal=',XdestTotal,'MW')
-#NOW Exergy expanded
-Xdestin=(1-T0/Tin)*Qin
-print('Xdestin=',Xdestin,'MW')
-Xwpump=Ms*(h2-h1/10**3)/10**3
-print('Xwpump=',Xwpump,'MW')
 
-Xwcomp=Mg*(h6-h5)/10**6
-print('Xwcomp=',Xwcomp,'MW')
-Xexpanded=(Xdestin+Xwpump+Xwcomp)
-print('Xexpanded=',Xexpanded,'MW')
-## Second Law Efficiency
-Eta2=(1-XdestTotal/Xexpanded)
-print('Eta2=',Eta2*100,'%')
-#Gas Turbine Outpu
-WTurbineOut=(Mg*(h7/10**3-h8/10**3)+Ms*(h3/10**3-h4/10**3))/10**3
-print('WTurbineOut=',WTurbineOut,'MW')
\ No newline at end of file
+if __name__ == "__main__":
+    main()
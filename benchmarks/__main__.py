@@ -0,0 +1,130 @@
+"""
+Benchmark suite of the cycle solver.
+
+    python -m benchmarks run [-k NAME ...] [--backend exact ...] [-o FILE]
+    python -m benchmarks compare [BASELINE CURRENT] [--threshold 0.25]
+
+`run` writes its timings to FILE (default .benchmarks/<time>.json);
+`compare` compares two result files, by default the two most recent in
+.benchmarks, and exits with status 1 when a benchmark got slower: its
+median repeat is more than the threshold (default 0.25, i.e. 25%) above
+the baseline's and the interquartile ranges of the two runs do not
+overlap. Results without quartiles are judged on the median alone.
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import sys
+
+from benchmarks.compare import compare_results, format_comparison, load_results
+
+RESULTS_DIR = ".benchmarks"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the cycle solver and compare benchmark runs.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument(
+        "-k",
+        dest="names",
+        action="append",
+        help="only run benchmarks whose name contains NAME (repeatable)",
+    )
+    run.add_argument(
+        "--backend",
+        dest="backends",
+        action="append",
+        choices=("exact", "cached", "tabular", "ideal"),
+        help="only time these backends (default: all)",
+    )
+    run.add_argument("--repeats", type=int, default=10, help="timed repeats")
+    run.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="minimum seconds per repeat (calls are batched to reach it)",
+    )
+    run.add_argument("-o", "--output", help="result file (.json)")
+    run.add_argument("--list", action="store_true", help="list the benchmarks")
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("files", nargs="*", help="baseline and current results")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slowdown reported as a regression when the interquartile "
+        "ranges of the runs do not overlap (default: 0.25)",
+    )
+    compare.add_argument(
+        "--statistic",
+        choices=("min", "median", "mean"),
+        default="median",
+        help="timing compared (default: median)",
+    )
+    return parser
+
+
+def _run(args):
+    from benchmarks.suite import BACKENDS, benchmark_names, run_suite
+
+    if args.list:
+        print("\n".join(benchmark_names()))
+        return 0
+    results = run_suite(
+        names=args.names,
+        backends=args.backends or BACKENDS,
+        repeats=args.repeats,
+        min_time=args.min_time,
+    )
+    output = args.output
+    if output is None:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(results['benchmarks'])} timings to {output}", file=sys.stderr)
+    return 0
+
+
+def _compare(args):
+    files = args.files
+    if not files:
+        files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))[-2:]
+    if len(files) != 2:
+        print("error: need a baseline and a current result file", file=sys.stderr)
+        return 2
+    try:
+        baseline, current = (load_results(path) for path in files)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    rows = compare_results(baseline, current, args.threshold, args.statistic)
+    print(format_comparison(rows))
+    slower = [row[0] for row in rows if row[4] == "slower"]
+    if slower:
+        print(
+            f"{len(slower)} benchmark(s) slower than {1 + args.threshold:.2f}x "
+            f"the baseline: {', '.join(slower)}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return _run(args) if args.command == "run" else _compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Per-cycle cost of the property evaluations in brayton_cycle_analysis:
+two PropsSI calls per state (the previous implementation) against one
+AbstractState update per state.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_abstract_state
+
+The same comparison is part of the benchmark suite as
+property_calls[PropsSI] and property_calls[AbstractState] (see
+benchmarks.suite).
+"""
+
+import time
+
+import CoolProp.CoolProp as CP
+import numpy as np
+
+from thermo.brayton import brayton_cycle_analysis
+from thermo.properties import (
+    INPUT_PAIRS,
+    get_abstract_state,
+    update_state,
+    use_property_backend,
+)
+
+# How each state of the cycle is evaluated
+STATE_PAIRS = {
+    "1": "TP",
+    "2s": "Ps",
+    "2a": "hP",
+    "3": "TP",
+    "4s": "Ps",
+    "4a": "hP",
+    "5": "TP",
+    "6s": "Ps",
+    "6a": "hP",
+    "7": "TP",
+    "8s": "Ps",
+    "8a": "hP",
+    "9": "hP",
+    "10": "hP",
+}
+STATE_INPUTS = {"TP": ("T", "P"), "Ps": ("P", "s"), "hP": ("h", "P")}
+
+
+def cycle_inputs(Pr, T5, fluid="Air"):
+    """(pair, a, b) for every state of one cycle."""
+    with use_property_backend("exact"):
+        states = brayton_cycle_analysis(300, 101325, Pr, T5, fluid, 0.88, 0.92, 0.9)[
+            "states"
+        ]
+    inputs = []
+    for label, pair in STATE_PAIRS.items():
+        name_a, name_b = STATE_INPUTS[pair]
+        inputs.append((pair, states[label][name_a], states[label][name_b]))
+    return inputs
+
+
+def paired_propssi(cycles, fluid):
+    for inputs in cycles:
+        for pair, a, b in inputs:
+            outputs, name_a, name_b = INPUT_PAIRS[pair]
+            for out in outputs:
+                CP.PropsSI(out, name_a, a, name_b, b, fluid)
+
+
+def abstract_state_updates(cycles, fluid):
+    state = get_abstract_state(fluid)
+    for inputs in cycles:
+        for pair, a, b in inputs:
+            update_state(state, pair, a, b)
+
+
+def main(fluid="Air", repeats=5):
+    cycles = [
+        cycle_inputs(Pr, T5, fluid)
+        for Pr in np.arange(8, 26, 2)
+        for T5 in np.arange(1200, 1701, 50)
+    ]
+    timings = {}
+    for name, func in [
+        ("PropsSI pairs", paired_propssi),
+        ("AbstractState", abstract_state_updates),
+    ]:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func(cycles, fluid)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best / len(cycles)
+        print(f"{name:>14}: {timings[name] * 1e3:8.3f} ms per cycle")
+    speedup = timings["PropsSI pairs"] / timings["AbstractState"]
+    print(f"{'speedup':>14}: {speedup:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Comparison of two benchmark result files written by `python -m
+benchmarks run`.
+
+Benchmarks are matched by name and compared on their median repeat. A
+ratio above 1 + threshold is reported as a slowdown only when the
+interquartile ranges of the two runs do not overlap, so that a noisy
+benchmark needs a shift larger than its own spread; results without
+quartiles are judged on the ratio alone.
+"""
+
+import json
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _separated(low, high):
+    """True when the repeats of `high` are all slower than those of `low`."""
+    if "q3" not in low or "q1" not in high:
+        return True
+    return high["q1"] > low["q3"]
+
+
+def compare_results(baseline, current, threshold=0.25, statistic="median"):
+    """
+    Rows (name, baseline seconds, current seconds, ratio, status) for the
+    benchmarks in both result dicts; status is "slower", "faster" or "".
+    Benchmarks found in only one of them are "missing" or "new", with a
+    None time and ratio.
+    """
+    old = baseline["benchmarks"]
+    new = current["benchmarks"]
+    rows = []
+    for name in list(old) + [name for name in new if name not in old]:
+        if name not in old or name not in new:
+            time_old = old[name][statistic] if name in old else None
+            time_new = new[name][statistic] if name in new else None
+            status = "missing" if name not in new else "new"
+            rows.append((name, time_old, time_new, None, status))
+            continue
+        ratio = new[name][statistic] / old[name][statistic]
+        status = ""
+        if ratio > 1 + threshold and _separated(old[name], new[name]):
+            status = "slower"
+        elif ratio < 1 / (1 + threshold) and _separated(new[name], old[name]):
+            status = "faster"
+        rows.append((name, old[name][statistic], new[name][statistic], ratio, status))
+    return rows
+
+
+def format_comparison(rows):
+    def _ms(seconds):
+        return f"{seconds * 1e3:12.3f}" if seconds is not None else f"{'-':>12}"
+
+    lines = [f"{'benchmark':<48} {'before ms':>12} {'after ms':>12} {'ratio':>7}"]
+    for name, time_old, time_new, ratio, status in rows:
+        ratio_text = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        lines.append(
+            f"{name:<48} {_ms(time_old)} {_ms(time_new)} {ratio_text} {status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,263 @@
+"""
+Benchmarks of the cycle solver, each timed against several property
+backends:
+
+- "exact": CoolProp's equation of state with an empty property cache.
+- "cached": the same solve answered from a warm cache (the property
+  cache for single states, the on-disk result store for sweeps).
+- "tabular": the bicubic property tables, built before timing starts.
+- "ideal": the NASA-polynomial ideal-gas model, fitted before timing
+  starts.
+
+Every benchmark is a setup function registered with `@benchmark`; it is
+called with the backend name and a scratch directory and returns the
+zero-argument callable to time. Results are plain dicts so that they can
+be written as JSON and compared between runs (see benchmarks.compare).
+"""
+
+import datetime
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+import CoolProp
+import numpy as np
+
+from benchmarks.bench_abstract_state import (
+    abstract_state_updates,
+    cycle_inputs,
+    paired_propssi,
+)
+from thermo.brayton import brayton_cycle_analysis, sweep_efficiency
+from thermo.combined import combined_cycle_batch, combined_cycle_sweep
+from thermo.exergy import clear_dead_states, exergy_analysis, get_dead_state
+from thermo.properties import (
+    get_ideal_gas_model,
+    get_property_table,
+    property_cache,
+    set_property_backend,
+    use_property_backend,
+)
+from thermo.store import ResultStore
+from thermo.sweep import cached_sweep_cycle, clear_sweep_cache
+
+BACKENDS = ("exact", "cached", "tabular", "ideal")
+
+# Design point of the notebook: T1, P1, Pr, T5, fluid and efficiencies
+DESIGN_POINT = (300.0, 101325.0, 10.0, 1400.0, "Air", 0.88, 0.92, 0.90)
+
+# Grid sizes of the sweep benchmarks; exact sweeps above 30 x 30 take
+# seconds per run and are only timed with the tables
+SWEEP_SIZES = {10: BACKENDS, 30: BACKENDS, 100: ("cached", "tabular", "ideal")}
+
+# Design point of WiFi_Credentials_Code.py (condenser pressure 8 kPa, gas
+# turbine inlet temperature 1400 K)
+COMBINED_DESIGN = dict(
+    Pr=12.0,
+    eff_compressor=0.84,
+    eff_gas_turbine=0.88,
+    eff_steam_turbine=0.90,
+    eff_pump=0.80,
+    m_gas=100.0,
+)
+
+_registry = {}
+
+
+def benchmark(name, backends=BACKENDS):
+    """Register a setup function under `name` for the given backends."""
+
+    def register(setup):
+        _registry[name] = (setup, tuple(backends))
+        return setup
+
+    return register
+
+
+def _property_backend(backend):
+    # "cached" reuses exact results, so it evaluates with the exact EOS
+    if backend == "tabular":
+        get_property_table("Air")
+    elif backend == "ideal":
+        get_ideal_gas_model("Air")
+    else:
+        return "exact"
+    return backend
+
+
+@benchmark("brayton_cycle_analysis")
+def _single_cycle(backend, scratch):
+    set_property_backend(_property_backend(backend))
+    if backend == "cached":
+        brayton_cycle_analysis(*DESIGN_POINT)
+        return lambda: brayton_cycle_analysis(*DESIGN_POINT)
+
+    def solve():
+        property_cache.clear()
+        return brayton_cycle_analysis(*DESIGN_POINT)
+
+    return solve
+
+
+@benchmark("exergy_analysis")
+def _exergy(backend, scratch):
+    set_property_backend(_property_backend(backend))
+    results = brayton_cycle_analysis(*DESIGN_POINT)
+    if backend == "cached":
+        get_dead_state("Air")
+        return lambda: exergy_analysis(results, 100.0, get_dead_state("Air"))
+
+    def solve():
+        property_cache.clear()
+        clear_dead_states()
+        return exergy_analysis(results, 100.0, get_dead_state("Air"))
+
+    return solve
+
+
+def _sweep_benchmark(n, backends):
+    @benchmark(f"sweep_efficiency[{n}x{n}]", backends)
+    def _sweep(backend, scratch):
+        pr = np.linspace(4, 20, n)
+        t_inlet = np.linspace(1000, 1600, n)
+        _, _, _, _, fluid, eff_c, eff_t, eff_r = DESIGN_POINT
+        if backend != "cached":
+            set_property_backend(_property_backend(backend))
+            return lambda: sweep_efficiency(pr, t_inlet, fluid, eff_c, eff_t, eff_r)
+        set_property_backend("auto")
+        store = ResultStore(os.path.join(scratch, "results"))
+        args = (pr, t_inlet, fluid, eff_c, eff_t, eff_r)
+        cached_sweep_cycle(*args, store=store, max_workers=1)
+
+        def load():
+            # Time the load from disk, as after a restart
+            clear_sweep_cache()
+            return cached_sweep_cycle(*args, store=store, max_workers=1)
+
+        return load
+
+
+for _n, _backends in SWEEP_SIZES.items():
+    _sweep_benchmark(_n, _backends)
+
+
+@benchmark("combined_cycle_batch", ("exact", "tabular", "ideal"))
+def _combined(backend, scratch):
+    # Steam states are always exact; the backend applies to the gas side
+    set_property_backend(_property_backend(backend))
+    return lambda: combined_cycle_batch(8000.0, 1400.0, **COMBINED_DESIGN)
+
+
+@benchmark("combined_cycle_sweep[31x41]", ("exact", "tabular", "ideal"))
+def _combined_sweep(backend, scratch):
+    set_property_backend(_property_backend(backend))
+    p_condenser = np.linspace(5e3, 20e3, 31)
+    t_inlet = np.linspace(1200, 1600, 41)
+    return lambda: combined_cycle_sweep(
+        p_condenser, t_inlet, max_workers=1, **COMBINED_DESIGN
+    )
+
+
+@benchmark("property_calls[PropsSI]", ("exact",))
+def _propssi(backend, scratch):
+    cycles = [cycle_inputs(Pr, 1400) for Pr in (8, 12, 16, 20)]
+    return lambda: paired_propssi(cycles, "Air")
+
+
+@benchmark("property_calls[AbstractState]", ("exact",))
+def _abstract_state(backend, scratch):
+    cycles = [cycle_inputs(Pr, 1400) for Pr in (8, 12, 16, 20)]
+    return lambda: abstract_state_updates(cycles, "Air")
+
+
+def benchmark_names():
+    return list(_registry)
+
+
+def time_callable(func, repeats=10, min_time=0.05):
+    """
+    Seconds per call of `func`: the number of calls per repeat is doubled
+    until a repeat takes at least `min_time`, as in timeit. The quartiles
+    "q1" and "q3" of the repeats bound the noise of the median.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    times = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    q1, _, q3 = statistics.quantiles(times, n=4) if len(times) > 1 else times * 3
+    return {
+        "min": min(times),
+        "q1": q1,
+        "median": statistics.median(times),
+        "q3": q3,
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeats": repeats,
+        "number": number,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_info():
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "coolprop": CoolProp.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_suite(names=None, backends=BACKENDS, repeats=10, min_time=0.05, report=print):
+    """
+    Time the named benchmarks (all by default) on each of `backends` they
+    support. Returns {"machine": ..., "benchmarks": {"name/backend":
+    timings}} with timings in seconds per call.
+    """
+    results = {}
+    for name, (setup, supported) in _registry.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        for backend in supported:
+            if backend not in backends:
+                continue
+            with (
+                use_property_backend("auto"),
+                tempfile.TemporaryDirectory(prefix="thermo-bench-") as scratch,
+            ):
+                func = setup(backend, scratch)
+                timings = time_callable(func, repeats, min_time)
+            key = f"{name}/{backend}"
+            results[key] = timings
+            if report is not None:
+                report(f"{key:<48} {timings['median'] * 1e3:12.3f} ms")
+    return {"machine": machine_info(), "benchmarks": results}
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import thermo.adaptive
+from thermo.adaptive import adaptive_sweep_efficiency
+from thermo.brayton import sweep_efficiency
+
+PR_BOUNDS = (4.0, 30.0)
+T_INLET_BOUNDS = (1000.0, 1800.0)
+ARGS = (PR_BOUNDS, T_INLET_BOUNDS, "Air", 0.85, 0.9, 0.8)
+
+
+def _smooth_efficiency(Pr, T5):
+    # Ridge of optimal pressure ratios that rises with the inlet temperature
+    optimum = 8.0 + 0.01 * (T5 - 1000.0)
+    return 30.0 + 0.02 * (T5 - 1000.0) - 0.05 * (Pr - optimum) ** 2
+
+
+@pytest.fixture
+def solves(monkeypatch):
+    """Smooth stand-in for brayton_cycle_batch that counts its points."""
+    counts = []
+
+    def brayton_cycle_batch(T1, P1, Pr, T5, *args):
+        counts.append(np.size(Pr))
+        return {"metrics": {"thermal_eff": _smooth_efficiency(Pr, T5)}}
+
+    monkeypatch.setattr(thermo.adaptive, "brayton_cycle_batch", brayton_cycle_batch)
+    return counts
+
+
+def test_budget_below_the_initial_grid_is_rejected(solves):
+    # A 4x4 cell grid needs 25 corners and 16 centres
+    with pytest.raises(ValueError, match="budget=40 is below the 41"):
+        adaptive_sweep_efficiency(*ARGS, budget=40)
+    assert solves == []
+    assert adaptive_sweep_efficiency(*ARGS, budget=41)["evaluations"] == 41
+
+
+@pytest.mark.parametrize("budget", [41, 60, 150, 300, 1000])
+def test_solves_stay_within_the_budget(solves, budget):
+    result = adaptive_sweep_efficiency(*ARGS, budget=budget)
+    assert result["evaluations"] == sum(solves) == len(result["pr"])
+    assert result["evaluations"] <= budget
+    # Every point is solved once
+    assert len(set(zip(result["pr"], result["t_inlet"]))) == result["evaluations"]
+
+
+def test_map_matches_a_dense_grid_of_a_smooth_function(solves):
+    result = adaptive_sweep_efficiency(*ARGS, budget=300)
+    exact = _smooth_efficiency(
+        result["pr_grid"][:, None], result["t_inlet_grid"][None, :]
+    )
+    error = np.abs(result["efficiency_map"] - exact)
+    assert np.isfinite(result["efficiency_map"]).all()
+    # The map spans 40 efficiency points
+    assert error.max() < 0.1
+
+
+def test_map_matches_a_dense_sweep_of_the_cycle():
+    result = adaptive_sweep_efficiency(*ARGS, budget=300, grid_shape=(60, 60))
+    dense = sweep_efficiency(result["pr_grid"], result["t_inlet_grid"], *ARGS[2:])
+    assert result["evaluations"] <= 300
+    assert np.isfinite(dense).all()
+    assert np.max(np.abs(result["efficiency_map"] - dense)) < 0.2
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from thermo.combined import combined_cycle_batch, combined_cycle_sweep
+
+P_CONDENSER = np.linspace(5e3, 20e3, 5)
+T_INLET = np.linspace(1200.0, 1600.0, 4)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep_splits_array_arguments_with_the_grid(max_workers):
+    pinch = np.linspace(10.0, 30.0, P_CONDENSER.size * T_INLET.size).reshape(5, 4)
+    Pr = np.array([10.0, 12.0, 14.0, 16.0])
+    sweep = combined_cycle_sweep(
+        P_CONDENSER,
+        T_INLET,
+        max_workers=max_workers,
+        chunk_points=8,
+        pinch=pinch,
+        Pr=Pr,
+        m_gas=50.0,
+    )
+    batch = combined_cycle_batch(
+        P_condenser=P_CONDENSER[:, None],
+        T_turbine_inlet=T_INLET[None, :],
+        pinch=pinch,
+        Pr=Pr,
+        m_gas=50.0,
+    )
+    for name in ("thermal_eff", "T_stack", "m_steam"):
+        np.testing.assert_array_equal(sweep["metrics"][name], batch["metrics"][name])
+    np.testing.assert_array_equal(
+        sweep["gas_states"].T.values, batch["gas_states"].T.values
+    )
+
+
+def test_sweep_rejects_arrays_that_do_not_fit_the_grid():
+    with pytest.raises(ValueError, match="pinch of shape \\(3,\\)"):
+        combined_cycle_sweep(P_CONDENSER, T_INLET, max_workers=1, pinch=[10.0] * 3)
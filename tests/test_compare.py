@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_results
+
+
+def _results(**benchmarks):
+    return {"benchmarks": benchmarks}
+
+
+def _timing(median, q1=None, q3=None):
+    timing = {"min": median * 0.9, "median": median, "mean": median}
+    if q1 is not None:
+        timing.update(q1=q1, q3=q3)
+    return timing
+
+
+def _statuses(baseline, current, **kwargs):
+    return {row[0]: row[4] for row in compare_results(baseline, current, **kwargs)}
+
+
+def test_slowdown_within_the_spread_of_the_repeats_is_not_reported():
+    baseline = _results(a=_timing(1.0, 0.8, 1.6), b=_timing(1.0, 0.95, 1.05))
+    current = _results(a=_timing(1.5, 1.2, 1.9), b=_timing(1.5, 1.4, 1.6))
+    assert _statuses(baseline, current) == {"a": "", "b": "slower"}
+
+
+def test_speedups_need_separated_quartiles_too():
+    baseline = _results(a=_timing(1.0, 0.6, 1.4), b=_timing(1.0, 0.95, 1.05))
+    current = _results(a=_timing(0.5, 0.3, 0.7), b=_timing(0.5, 0.45, 0.55))
+    assert _statuses(baseline, current) == {"a": "", "b": "faster"}
+
+
+def test_ratio_within_the_threshold_is_not_reported():
+    baseline = _results(a=_timing(1.0, 0.99, 1.01))
+    current = _results(a=_timing(1.2, 1.19, 1.21))
+    assert _statuses(baseline, current) == {"a": ""}
+    assert _statuses(baseline, current, threshold=0.1) == {"a": "slower"}
+
+
+def test_results_without_quartiles_are_judged_on_the_ratio():
+    baseline = _results(a=_timing(1.0), b=_timing(1.0), c=_timing(1.0, 0.5, 2.0))
+    current = _results(a=_timing(1.3), b=_timing(1.1), c=_timing(1.3))
+    assert _statuses(baseline, current) == {"a": "slower", "b": "", "c": "slower"}
+
+
+def test_missing_and_new_benchmarks():
+    rows = compare_results(_results(a=_timing(1.0)), _results(b=_timing(1.0)))
+    assert rows == [("a", 1.0, None, None, "missing"), ("b", None, 1.0, None, "new")]
+
+
+@pytest.mark.parametrize("median, status", [(1.5, 1), (1.1, 0)])
+def test_compare_command_exit_status(tmp_path, capsys, median, status):
+    paths = []
+    for name, timing in (("base", _timing(1.0, 0.95, 1.05)), ("new", _timing(median))):
+        paths.append(str(tmp_path / f"{name}.json"))
+        with open(paths[-1], "w") as f:
+            json.dump(_results(a=timing), f)
+    assert main(["compare", *paths]) == status
+    assert "a" in capsys.readouterr().out
@@ -0,0 +1,80 @@
+import CoolProp
+import numpy as np
+import pytest
+
+from thermo.brayton import brayton_cycle_batch
+from thermo.idealgas import IdealGasModel
+from thermo.properties import evaluate_array, use_property_backend
+
+
+@pytest.fixture(scope="module", params=[6000.0, 3000.0], ids=["default", "h_tol=3000"])
+def model(request):
+    return IdealGasModel("Air", h_tol=request.param)
+
+
+def _exact_states(model, n, seed=0):
+    rng = np.random.default_rng(seed)
+    T = rng.uniform(*model.T_range, n)
+    P = np.exp(rng.uniform(*np.log(model.P_range), n))
+    state = CoolProp.AbstractState("HEOS", model.fluid)
+    h, s, cp = np.empty(n), np.empty(n), np.empty(n)
+    for i in range(n):
+        state.update(CoolProp.PT_INPUTS, P[i], T[i])
+        h[i], s[i], cp[i] = state.hmass(), state.smass(), state.cpmass()
+    return T, P, h, s, cp
+
+
+@pytest.mark.parametrize("pair", ["TP", "Ps", "hP"])
+def test_answered_states_are_within_tolerance(model, pair):
+    T, P, h, s, cp = _exact_states(model, 4000)
+    inputs = {"TP": (T, P), "Ps": (P, s), "hP": (h, P)}[pair]
+    first, second, ok = model.evaluate(pair, *inputs)
+    # Most of the range is ideal enough to be answered
+    assert ok.mean() > 0.8
+    assert np.isnan(first[~ok]).all() and np.isnan(second[~ok]).all()
+    outputs = {"TP": (h, s), "Ps": (T, h), "hP": (T, s)}[pair]
+    tolerances = {
+        "TP": (model.h_tol, model.s_tol),
+        "Ps": (model.h_tol / cp, model.h_tol),
+        "hP": (model.h_tol / cp, model.s_tol),
+    }[pair]
+    for approx, exact, tol in zip((first, second), outputs, tolerances):
+        error = np.abs(approx - exact)[ok]
+        tol = np.broadcast_to(tol, exact.shape)[ok]
+        assert np.all(error <= tol), f"max error {error.max()}"
+
+
+def test_low_pressure_states_are_answered(model):
+    T = np.linspace(300.0, 1990.0, 50)
+    for pair, inputs in {
+        "TP": (T, 1e5),
+        "Ps": (1e5, model.s(T, 1e5)),
+        "hP": (model.h(T), 1e5),
+    }.items():
+        assert model.evaluate(pair, *inputs)[2].all(), pair
+
+
+def test_out_of_tolerance_states_fall_back_to_exact():
+    # Cold and dense, far from ideal
+    T = np.array([250.0, 300.0])
+    P = np.array([9e6, 1e5])
+    with use_property_backend("ideal"):
+        h, s = evaluate_array("TP", T, P, "Air")
+    h_exact, s_exact = evaluate_array("TP", T, P, "Air", backend="exact")
+    assert h[0] == h_exact[0] and s[0] == s_exact[0]
+    assert h[1] != h_exact[1]
+    assert abs(h[1] - h_exact[1]) <= 6000.0
+
+
+def test_cycle_efficiency_matches_exact_eos():
+    # The default tolerances are chosen for this (see IdealGasModel)
+    Pr = np.arange(4.0, 31.0, 2.0)[:, None]
+    T5 = np.linspace(1000.0, 1700.0, 6)
+    args = (300.0, 101325.0, Pr, T5, "Air", 0.85, 0.9)
+    for effectiveness in (0.0, 0.8):
+        with use_property_backend("exact"):
+            exact = brayton_cycle_batch(*args, effectiveness)["metrics"]
+        with use_property_backend("ideal"):
+            ideal = brayton_cycle_batch(*args, effectiveness)["metrics"]
+        error = np.abs(ideal["thermal_eff"] - exact["thermal_eff"])
+        assert np.nanmax(error) <= 0.05
@@ -0,0 +1,219 @@
+"""
+Routes and search index of Tutorials/08_Database_MongoDB_GUI/server.py,
+run against an in-process mongomock database.
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+pytest.importorskip("bcrypt")
+pytest.importorskip("dotenv")
+
+import pymongo  # noqa: E402
+from pymongo.errors import OperationFailure, PyMongoError  # noqa: E402
+
+SERVER_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, "Tutorials", "08_Database_MongoDB_GUI"
+)
+
+BOOK = {
+    "book_name": "The Great Gatsby",
+    "author": "F. Scott Fitzgerald",
+    "price": 10,
+    "quantity": 2,
+    "publication": "Scribner",
+    "publication_date": "1925-04-10",
+}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    client = mongomock.MongoClient()
+    monkeypatch.setenv("MONGODB_URI", "mongodb://localhost")
+    monkeypatch.setattr(pymongo, "MongoClient", lambda *args, **kwargs: client)
+    # mongomock has no change streams, like a standalone server
+    monkeypatch.setattr(
+        mongomock.collection.Collection,
+        "watch",
+        lambda self, **kwargs: (_ for _ in ()).throw(OperationFailure("no streams")),
+        raising=False,
+    )
+    monkeypatch.syspath_prepend(SERVER_DIR)
+    sys.modules.pop("server", None)
+    module = importlib.import_module("server")
+    yield module
+    sys.modules.pop("server", None)
+
+
+@pytest.fixture
+def api(server):
+    return server.app.test_client()
+
+
+def _add(api, **fields):
+    response = api.post("/api/books", json={**BOOK, **fields})
+    assert response.status_code == 201
+    return response.get_json()["book_id"]
+
+
+def _search(api, query, mode):
+    response = api.get("/api/books/search", query_string={"query": query, "mode": mode})
+    assert response.status_code == 200, response.get_json()
+    return [book["book_id"] for book in response.get_json()["books"]]
+
+
+def test_import_does_not_touch_indexes_or_search_index(server):
+    assert server.search_index is None
+    assert "book_id_unique" not in server.book_collection.index_information()
+
+
+def test_start_search_index_loads_books_once(server, monkeypatch):
+    server.book_collection.insert_one({"book_id": "B1", "book_name": "Dune"})
+    monkeypatch.setattr(server, "SEARCH_INDEX_ENABLED", True)
+    server.start_search_index()
+    index = server.search_index
+    assert set(index.books) == {"B1"}
+    server.start_search_index()
+    assert server.search_index is index
+
+
+def test_unique_index_reports_duplicate_documents(server):
+    server.book_collection.insert_many(
+        [{"book_id": "B1"}, {"book_id": "B1"}, {"book_id": "B2"}]
+    )
+    with pytest.raises(RuntimeError, match="book_id='B1': _id [0-9a-f]+, [0-9a-f]+"):
+        server.ensure_indexes()
+
+
+def test_index_follows_add_update_and_delete(server, api):
+    server.search_index = server.BookSearchIndex()
+    book_id = _add(api)
+    other_id = _add(api, book_name="Great Expectations", author="Charles Dickens")
+
+    assert _search(api, "gre", "prefix") == [other_id]
+    assert _search(api, "f. scott", "prefix") == [book_id]
+    assert _search(api, "gatsbi", "fuzzy") == [book_id]
+
+    api.put(f"/api/books/{book_id}", json={"book_name": "Tender Is the Night"})
+    assert _search(api, "tender", "prefix") == [book_id]
+    assert _search(api, "the great", "prefix") == []
+
+    api.delete(f"/api/books/{other_id}")
+    assert _search(api, "gre", "prefix") == []
+    assert set(server.search_index.books) == {book_id}
+
+
+def test_index_applies_change_stream_events(server):
+    index = server.BookSearchIndex()
+    server.book_collection.insert_one(
+        {"book_id": "B1", "book_name": "Dune", "author": "Frank Herbert"}
+    )
+    index.load(server.book_collection.find({}, server.SEARCH_INDEX_PROJECTION))
+    _id = server.book_collection.find_one({"book_id": "B1"})["_id"]
+
+    index.apply_change(
+        {
+            "operationType": "update",
+            "fullDocument": {"_id": _id, "book_id": "B1", "book_name": "Emma"},
+        }
+    )
+    assert [book["book_id"] for book in index.prefix_search("emma", 10)] == ["B1"]
+    assert index.prefix_search("dune", 10) == []
+
+    index.apply_change({"operationType": "delete", "documentKey": {"_id": _id}})
+    assert index.books == {}
+
+
+def test_prefix_search_matches_mongodb(server, api):
+    for name, author in [
+        ("The Great Gatsby", "F. Scott Fitzgerald"),
+        ("Great Expectations", "Charles Dickens"),
+        ("Dickens Letters", "Greatham Smith"),
+        ("Émile", "Jean-Jacques Rousseau"),
+    ]:
+        _add(api, book_name=name, author=author)
+    queries = ["great", "gre", "dickens", "gatsby", "the g", "emile", "jean"]
+    from_mongo = {query: _search(api, query, "prefix") for query in queries}
+    server.search_index = server.BookSearchIndex()
+    server.search_index.load(
+        server.book_collection.find({}, server.SEARCH_INDEX_PROJECTION)
+    )
+    assert {query: _search(api, query, "prefix") for query in queries} == from_mongo
+
+
+def test_search_dispatch(server, api, monkeypatch):
+    book_id = _add(api)
+    finds = []
+    find = server.book_collection.find
+    monkeypatch.setattr(
+        server.book_collection,
+        "find",
+        lambda *args, **kwargs: finds.append(args) or find(*args, **kwargs),
+    )
+
+    # Without the index prefix searches go to MongoDB, fuzzy is refused
+    assert _search(api, "the", "prefix") == [book_id]
+    assert len(finds) == 1
+    response = api.get(
+        "/api/books/search", query_string={"query": "x", "mode": "fuzzy"}
+    )
+    assert response.status_code == 400
+    assert api.get("/api/search/capabilities").get_json()["in_memory"] is False
+
+    server.search_index = server.BookSearchIndex()
+    server.search_index.add(
+        find({"book_id": book_id}, server.SEARCH_INDEX_PROJECTION)[0]
+    )
+    finds.clear()
+    assert _search(api, "the", "prefix") == [book_id]
+    assert _search(api, "gatsbi", "fuzzy") == [book_id]
+    assert finds == []
+    capabilities = api.get("/api/search/capabilities").get_json()
+    assert capabilities["in_memory"] is True
+    assert capabilities["modes"] == ["text", "prefix", "fuzzy"]
+
+
+class _Stream:
+    def __init__(self, changes=(), error=None):
+        self.changes = list(changes)
+        self.error = error
+        self.resume_token = {"_data": "start"}
+
+    def __iter__(self):
+        for i, change in enumerate(self.changes):
+            self.resume_token = {"_data": str(i)}
+            yield change
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        pass
+
+
+def test_change_stream_reopens_from_resume_token(server, monkeypatch):
+    index = server.search_index = server.BookSearchIndex()
+    index.add({"book_id": "B1", "book_name": "Dune"})
+    reopened = []
+
+    def watch_books(resume_token=None):
+        reopened.append(resume_token)
+        return _Stream(error=PyMongoError("down"))
+
+    monkeypatch.setattr(server, "watch_books", watch_books)
+    monkeypatch.setattr(server.time, "sleep", lambda seconds: None)
+    change = {
+        "operationType": "insert",
+        "fullDocument": {"book_id": "B2", "book_name": "Emma"},
+    }
+    server.follow_book_changes(index, _Stream([change], PyMongoError("lost")))
+
+    assert set(index.books) == {"B1", "B2"}
+    assert reopened == [{"_data": "0"}] * server.CHANGE_STREAM_RETRIES
+    # Searches go back to MongoDB once the stream cannot be reopened
+    assert server.search_index is None
@@ -0,0 +1,37 @@
+import pickle
+
+import numpy as np
+
+from thermo.properties import PropertyCache
+
+
+def _filled_cache():
+    cache = PropertyCache()
+    for T in np.linspace(300.0, 900.0, 20):
+        cache.lookup("TP", T, 1e5, "Air")
+        cache.lookup("Ps", 1e6, 3000.0 + T, "Air")
+    return cache
+
+
+def test_saved_entries_are_loaded_back(tmp_path):
+    cache = _filled_cache()
+    path = tmp_path / "cache" / "property_cache.npz"
+    cache.save(path)
+    loaded = PropertyCache()
+    assert loaded.load(path) == len(cache) == 40
+    assert dict(loaded._data) == dict(cache._data)
+
+
+def test_files_of_other_versions_and_pickles_are_ignored(tmp_path):
+    path = tmp_path / "property_cache.npz"
+    _filled_cache().save(path)
+    assert PropertyCache(digits=6).load(path) == 0
+
+    class Payload:
+        def __reduce__(self):
+            return exec, ("raise AssertionError('the cache file was unpickled')",)
+
+    with open(path, "wb") as f:
+        pickle.dump({"format": 2, "entries": [Payload()]}, f)
+    assert PropertyCache().load(path) == 0
+    assert PropertyCache().load(tmp_path / "missing.npz") == 0
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from thermo.brayton import brayton_cycle_batch
+from thermo.states import CycleStates
+
+
+def _solve(Pr, T5):
+    return brayton_cycle_batch(300.0, 101325.0, Pr, T5, "Air", 0.88, 0.92, 0.9)[
+        "states"
+    ]
+
+
+@pytest.fixture(scope="module")
+def states():
+    return _solve(np.linspace(4, 20, 6)[:, None], np.array([1200.0, 1400.0, 1600.0]))
+
+
+@pytest.mark.parametrize("key", [np.s_[::2], np.s_[1::3], np.s_[::-1], np.s_[[4, 0]]])
+def test_property_views_of_1d_selections(key):
+    states = _solve(np.linspace(4, 20, 6), 1400.0)
+    selected = states[key]
+    for prop in ("T", "P", "h", "s"):
+        np.testing.assert_array_equal(
+            getattr(selected, prop).values, getattr(states, prop).values[key]
+        )
+    np.testing.assert_array_equal(selected.s[:, "4a"], states.records[key]["4a"]["s"])
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        np.s_[::2],
+        np.s_[:, ::2],
+        np.s_[1::3, 1:],
+        np.s_[[0, 3, 5]],
+        np.s_[[4, 1], [2, 0]],
+        np.s_[np.array([True, False, True, False, False, True])],
+    ],
+)
+def test_property_views_of_strided_and_fancy_selections(states, key):
+    selected = states[key]
+    assert isinstance(selected, CycleStates)
+    for prop in ("T", "P", "h", "s"):
+        expected = getattr(states, prop).values[key]
+        np.testing.assert_array_equal(getattr(selected, prop).values, expected)
+    for label in states.labels:
+        np.testing.assert_array_equal(
+            selected.T[..., label], states.records[key][label]["T"]
+        )
+
+
+def test_single_cycle_selection(states):
+    cycle = states[2, 1]
+    assert cycle.shape == ()
+    assert cycle.T["1"] == states.records[2, 1]["1"]["T"]
+    np.testing.assert_array_equal(cycle.h.values, states.h.values[2, 1])
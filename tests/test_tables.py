@@ -0,0 +1,89 @@
+import os
+
+import CoolProp
+import numpy as np
+import pytest
+
+from thermo.properties import evaluate_array, use_property_backend
+from thermo.tables import PropertyTable
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    return PropertyTable("Air", table_dir=tmp_path_factory.mktemp("tables"))
+
+
+def _exact_states(table, n, seed=0):
+    rng = np.random.default_rng(seed)
+    T = rng.uniform(*table.T_range, n)
+    P = np.exp(rng.uniform(table.lnP[0], table.lnP[-1], n))
+    state = CoolProp.AbstractState("HEOS", table.fluid)
+    h, s, cp = np.empty(n), np.empty(n), np.empty(n)
+    for i in range(n):
+        state.update(CoolProp.PT_INPUTS, P[i], T[i])
+        h[i], s[i], cp[i] = state.hmass(), state.smass(), state.cpmass()
+    return T, P, h, s, cp
+
+
+def test_default_table_is_within_tolerance(table):
+    assert table.within_tolerance
+    assert table.grid_error["h"] <= table.h_tol
+    assert table.grid_error["s"] <= table.s_tol
+
+
+@pytest.mark.parametrize("pair", ["TP", "Ps", "hP"])
+def test_outputs_match_exact_eos(table, pair):
+    T, P, h, s, cp = _exact_states(table, 2000)
+    inputs = {"TP": (T, P), "Ps": (P, s), "hP": (h, P)}[pair]
+    first, second, ok = table.evaluate(pair, *inputs)
+    assert ok.all()
+    outputs = {"TP": (h, s), "Ps": (T, h), "hP": (T, s)}[pair]
+    # A solved temperature is held to the enthalpy error it amounts to
+    tolerances = {
+        "TP": (table.h_tol, table.s_tol),
+        "Ps": (table.h_tol / cp, table.h_tol),
+        "hP": (table.h_tol / cp, table.s_tol),
+    }[pair]
+    for approx, exact, tol in zip((first, second), outputs, tolerances):
+        assert np.all(np.abs(approx - exact) <= tol)
+
+
+@pytest.mark.parametrize("pair", ["Ps", "hP"])
+def test_newton_inversion_converges(table, pair):
+    # Round trip through the splines themselves: the inversion must recover
+    # T to its convergence tolerance from any starting point in the table
+    T, P, *_ = _exact_states(table, 500, seed=1)
+    h, s, _ = table.evaluate("TP", T, P)
+    inputs = (P, s) if pair == "Ps" else (h, P)
+    T_solved, _, ok = table.evaluate(pair, *inputs)
+    assert ok.all()
+    np.testing.assert_allclose(T_solved, T, rtol=1e-8)
+
+
+def test_states_outside_the_table_are_not_ok(table):
+    T = np.array([table.T_range[0] - 50.0, 1000.0, 1000.0])
+    P = np.array([1e5, np.exp(table.lnP[-1]) * 2, 1e5])
+    first, second, ok = table.evaluate("TP", T, P)
+    np.testing.assert_array_equal(ok, [False, False, True])
+    assert np.isnan(first[:2]).all() and np.isnan(second[:2]).all()
+
+
+def test_table_is_reloaded_from_disk(table):
+    loaded = PropertyTable("Air", table_dir=os.path.dirname(table.path))
+    assert loaded.grid_error == table.grid_error
+    np.testing.assert_array_equal(loaded.T, table.T)
+
+
+def test_out_of_tolerance_table_falls_back_to_exact(tmp_path):
+    options = dict(n_T=5, n_P=5, max_nodes=50, table_dir=str(tmp_path))
+    assert not PropertyTable("Air", **options).within_tolerance
+
+    T = np.linspace(300.0, 1500.0, 7)
+    P = np.full_like(T, 5e5)
+    with use_property_backend("tabular", **options):
+        with pytest.warns(RuntimeWarning, match="misses its error bounds"):
+            h, s = evaluate_array("TP", T, P, "Air")
+    with use_property_backend("exact"):
+        h_exact, s_exact = evaluate_array("TP", T, P, "Air")
+    np.testing.assert_array_equal(h, h_exact)
+    np.testing.assert_array_equal(s, s_exact)
@@ -0,0 +1,73 @@
+"""
+Thermodynamic property and cycle helpers shared by the notebooks and scripts
+in this repository.
+
+Names are imported from their submodules on first use, so `import thermo`
+(and `python -m thermo`) does not pay for SciPy or CoolProp until they are
+needed.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "adaptive_sweep_efficiency": "thermo.adaptive",
+    "brayton_cycle_analysis": "thermo.brayton",
+    "brayton_cycle_batch": "thermo.brayton",
+    "sweep_efficiency": "thermo.brayton",
+    "validate_parameters": "thermo.brayton",
+    "read_cases": "thermo.batch",
+    "combined_cycle_batch": "thermo.combined",
+    "combined_cycle_sweep": "thermo.combined",
+    "run_batch": "thermo.batch",
+    "solve_cases": "thermo.batch",
+    "solve_cycle_arrays": "thermo.batch",
+    "write_results": "thermo.batch",
+    "DeadState": "thermo.exergy",
+    "IdealGasModel": "thermo.idealgas",
+    "batch_physical_exergy": "thermo.exergy",
+    "exergy_analysis": "thermo.exergy",
+    "exergy_sweep": "thermo.exergy",
+    "get_dead_state": "thermo.exergy",
+    "multistage_cycle_batch": "thermo.multistage",
+    "multistage_state_labels": "thermo.multistage",
+    "optimize_cycle": "thermo.optimize",
+    "Profiler": "thermo.profiling",
+    "profile": "thermo.profiling",
+    "profiled": "thermo.profiling",
+    "PropertyCache": "thermo.properties",
+    "get_abstract_state": "thermo.properties",
+    "get_ideal_gas_model": "thermo.properties",
+    "get_property_backend": "thermo.properties",
+    "get_property_table": "thermo.properties",
+    "get_state_properties": "thermo.properties",
+    "get_state_properties_from_hP": "thermo.properties",
+    "get_state_properties_from_Ps": "thermo.properties",
+    "get_state_properties_from_TP": "thermo.properties",
+    "property_cache": "thermo.properties",
+    "set_property_backend": "thermo.properties",
+    "use_property_backend": "thermo.properties",
+    "CycleStates": "thermo.states",
+    "as_cycle_states": "thermo.states",
+    "local_sensitivity": "thermo.sensitivity",
+    "sobol_indices": "thermo.sensitivity",
+    "ResultStore": "thermo.store",
+    "result_store": "thermo.store",
+    "complete_inputs": "thermo.uncertainty",
+    "propagate_uncertainty": "thermo.uncertainty",
+    "sample_inputs": "thermo.uncertainty",
+    "summarize_samples": "thermo.uncertainty",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
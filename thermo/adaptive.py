@@ -0,0 +1,186 @@
+"""
+Adaptive-refinement sampling of the efficiency map.
+
+A uniform (Pr, T_inlet) grid spends as many cycle solves on flat regions
+as on the curved region around the optimum. `adaptive_sweep_efficiency`
+starts from a coarse grid of cells, each sampled at its corners and its
+centre, and repeatedly splits the cells whose centre value deviates most
+from the bilinear estimate of their corners (curvature) or whose corners
+differ most (gradient), until the evaluation budget is spent. The
+scattered samples are then interpolated onto a regular grid for contourf.
+"""
+
+import heapq
+
+import numpy as np
+from scipy.interpolate import griddata
+
+from thermo.brayton import brayton_cycle_batch
+
+
+class _Cell:
+    __slots__ = ("x0", "y0", "x1", "y1", "depth")
+
+    def __init__(self, x0, y0, x1, y1, depth):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.depth = depth
+
+    def corners(self):
+        return [
+            (self.x0, self.y0),
+            (self.x1, self.y0),
+            (self.x0, self.y1),
+            (self.x1, self.y1),
+        ]
+
+    def center(self):
+        return (0.5 * (self.x0 + self.x1), 0.5 * (self.y0 + self.y1))
+
+    def children(self):
+        xm, ym = self.center()
+        depth = self.depth + 1
+        return [
+            _Cell(self.x0, self.y0, xm, ym, depth),
+            _Cell(xm, self.y0, self.x1, ym, depth),
+            _Cell(self.x0, ym, xm, self.y1, depth),
+            _Cell(xm, ym, self.x1, self.y1, depth),
+        ]
+
+
+def _key(point):
+    # Cell coordinates are dyadic fractions of the unit square, so rounding
+    # identifies points shared between neighbouring cells exactly
+    return (round(point[0], 12), round(point[1], 12))
+
+
+def adaptive_sweep_efficiency(
+    pr_bounds,
+    t_inlet_bounds,
+    fluid,
+    eff_c,
+    eff_t,
+    eff_r,
+    T1=300,
+    P1=101325,
+    budget=300,
+    initial_shape=(4, 4),
+    batch_cells=8,
+    gradient_weight=0.25,
+    max_depth=8,
+    grid_shape=(100, 100),
+):
+    """
+    Sample thermal efficiency (%) adaptively over
+    pr_bounds x t_inlet_bounds using at most `budget` cycle solves, which
+    must cover the corners and centres of the initial cells.
+
+    `initial_shape` is the number of coarse cells along (Pr, T_inlet);
+    each round splits the `batch_cells` highest-scoring cells into four
+    and solves all new points in one brayton_cycle_batch call. A cell's
+    score is |centre - mean(corners)| + gradient_weight * (corner range).
+
+    Returns {"pr", "t_inlet", "thermal_eff"} with the scattered samples,
+    "pr_grid", "t_inlet_grid" and "efficiency_map" with the samples
+    interpolated onto a grid_shape grid (same orientation as
+    sweep_efficiency), and "evaluations", the number of cycle solves.
+    """
+    pr_bounds = np.asarray(pr_bounds, dtype=float)
+    t_inlet_bounds = np.asarray(t_inlet_bounds, dtype=float)
+    values = {}
+
+    def _solve(points):
+        points = [p for p in dict.fromkeys(_key(p) for p in points) if p not in values]
+        if not points:
+            return
+        xy = np.array(points)
+        results = brayton_cycle_batch(
+            T1,
+            P1,
+            pr_bounds[0] + xy[:, 0] * np.ptp(pr_bounds),
+            t_inlet_bounds[0] + xy[:, 1] * np.ptp(t_inlet_bounds),
+            fluid,
+            eff_c,
+            eff_t,
+            eff_r,
+        )
+        values.update(zip(points, results["metrics"]["thermal_eff"]))
+
+    def _score(cell):
+        corners = np.array([values[_key(p)] for p in cell.corners()])
+        center = values[_key(cell.center())]
+        score = abs(center - corners.mean()) + gradient_weight * np.ptp(corners)
+        # Infeasible regions are not refined further
+        return score if np.isfinite(score) else 0.0
+
+    n_x, n_y = initial_shape
+    n_initial = (n_x + 1) * (n_y + 1) + n_x * n_y
+    if budget < n_initial:
+        raise ValueError(
+            f"budget={budget} is below the {n_initial} cycle solves of the "
+            f"initial {n_x}x{n_y} cell grid"
+        )
+    xs, ys = np.linspace(0, 1, n_x + 1), np.linspace(0, 1, n_y + 1)
+    cells = [
+        _Cell(xs[i], ys[j], xs[i + 1], ys[j + 1], 0)
+        for i in range(n_x)
+        for j in range(n_y)
+    ]
+    _solve([p for cell in cells for p in cell.corners() + [cell.center()]])
+
+    # Max-heap of cells by score; the counter keeps ordering deterministic
+    heap = [(-_score(cell), i, cell) for i, cell in enumerate(cells)]
+    heapq.heapify(heap)
+    counter = len(heap)
+    while heap:
+        children, new_points = [], set()
+        while heap and len(children) < 4 * batch_cells:
+            cell = heap[0][2]
+            if cell.depth >= max_depth:
+                heapq.heappop(heap)
+                continue
+            cell_children = cell.children()
+            cell_points = {
+                _key(p)
+                for child in cell_children
+                for p in child.corners() + [child.center()]
+            } - values.keys()
+            if len(values) + len(new_points | cell_points) > budget:
+                break
+            heapq.heappop(heap)
+            children += cell_children
+            new_points |= cell_points
+        if not children:
+            # Budget spent, or nothing left to refine
+            break
+        _solve(new_points)
+        for child in children:
+            heapq.heappush(heap, (-_score(child), counter, child))
+            counter += 1
+
+    xy = np.array(list(values))
+    eff = np.array(list(values.values()))
+    pr = pr_bounds[0] + xy[:, 0] * np.ptp(pr_bounds)
+    t_inlet = t_inlet_bounds[0] + xy[:, 1] * np.ptp(t_inlet_bounds)
+
+    pr_grid = np.linspace(*pr_bounds, grid_shape[0])
+    t_inlet_grid = np.linspace(*t_inlet_bounds, grid_shape[1])
+    feasible = np.isfinite(eff)
+    grid_x, grid_y = np.meshgrid(
+        (pr_grid - pr_bounds[0]) / np.ptp(pr_bounds),
+        (t_inlet_grid - t_inlet_bounds[0]) / np.ptp(t_inlet_bounds),
+        indexing="ij",
+    )
+    # Interpolate in the unit square so both axes carry equal weight
+    efficiency_map = griddata(
+        xy[feasible], eff[feasible], (grid_x, grid_y), method="cubic"
+    )
+
+    return {
+        "pr": pr,
+        "t_inlet": t_inlet,
+        "thermal_eff": eff,
+        "pr_grid": pr_grid,
+        "t_inlet_grid": t_inlet_grid,
+        "efficiency_map": efficiency_map,
+        "evaluations": len(values),
+    }
@@ -0,0 +1,290 @@
+"""
+Headless batch runner for Brayton cycle design cases.
+
+Design cases are read from CSV, JSON (a list of objects) or JSON Lines,
+solved in blocks with `brayton_cycle_batch` on a ProcessPoolExecutor and
+streamed to CSV or Parquet in input order, so thousands of cases run with
+bounded memory and without marimo, pandas or matplotlib. Parquet output
+needs pyarrow, which is only imported when it is used.
+
+`solve_cycle_arrays` is the in-memory counterpart for sampling studies:
+it solves flat input arrays on the same pool and returns the metrics as
+one structured array.
+"""
+
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from thermo.brayton import METRIC_NAMES, METRICS_DTYPE, brayton_cycle_batch
+from thermo.properties import get_property_backend, set_property_backend
+from thermo.store import result_key
+
+CASE_FIELDS = (
+    "T1",
+    "P1",
+    "Pr",
+    "T5",
+    "fluid",
+    "eff_compressor",
+    "eff_turbine",
+    "effectiveness",
+)
+
+# Values used for columns a case file leaves out (the notebook's inputs)
+CASE_DEFAULTS = {
+    "T1": 300.0,
+    "P1": 101325.0,
+    "fluid": "Air",
+    "eff_compressor": 0.88,
+    "eff_turbine": 0.92,
+    "effectiveness": 0.9,
+}
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+def _parse_case(index, raw):
+    case = {"case": index}
+    for field in CASE_FIELDS:
+        value = raw.get(field)
+        if value is None or value == "":
+            if field not in CASE_DEFAULTS:
+                raise ValueError(f"Case {index}: missing required field {field!r}")
+            value = CASE_DEFAULTS[field]
+        if field != "fluid":
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"Case {index}: {field}={value!r} is not a number"
+                ) from None
+        case[field] = value
+    return case
+
+
+def read_cases(path):
+    """
+    Yield the design cases in `path` one at a time as dicts with a "case"
+    index and every CASE_FIELDS entry (missing optional fields take
+    CASE_DEFAULTS). The format follows the extension: .csv, .json (a list
+    of objects) or .jsonl / .ndjson (one object per line).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="") as f:
+        if extension == ".csv":
+            rows = csv.DictReader(f)
+        elif extension == ".json":
+            rows = json.load(f)
+        elif extension in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported case file {path!r}, expected csv or json")
+        for index, raw in enumerate(rows):
+            yield _parse_case(index, raw)
+
+
+def _init_worker(backend):
+    # Workers may not inherit module state from the parent process
+    set_property_backend(backend[0], **backend[1])
+
+
+def _solve_block(cases, exergy, T0, P0):
+    rows = [dict(case) for case in cases]
+    fluids = np.array([case["fluid"] for case in cases])
+    for fluid in dict.fromkeys(fluids):
+        index = np.flatnonzero(fluids == fluid)
+        inputs = {
+            field: np.array([cases[i][field] for i in index])
+            for field in CASE_FIELDS
+            if field != "fluid"
+        }
+        results = brayton_cycle_batch(fluid=fluid, **inputs)
+        columns = {name: results["metrics"][name] for name in METRIC_NAMES}
+        if exergy:
+            from thermo.exergy import exergy_sweep, get_dead_state
+
+            sweep = exergy_sweep(results, get_dead_state(fluid, T0, P0))
+            columns["eta_II"] = sweep["eta_II"]
+            for component, values in sweep["destruction"].items():
+                column = "ex_dest_" + component.lower().replace(" ", "_")
+                columns[column] = values
+        for name, values in columns.items():
+            for i, value in zip(index, values.tolist()):
+                rows[i][name] = value
+    return rows
+
+
+def _blocks(cases, chunk_size):
+    block = []
+    for case in cases:
+        block.append(case)
+        if len(block) == chunk_size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def solve_cases(
+    cases, exergy=False, T0=298.0, P0=101325.0, max_workers=None, chunk_size=1000
+):
+    """
+    Solve an iterable of design cases (see read_cases) and yield one
+    result row per case, in input order: the case fields followed by the
+    cycle metrics and, with `exergy`, the second-law efficiency "eta_II"
+    and the component destruction "ex_dest_<component>" (kJ/kg) for the
+    dead state (T0, P0).
+
+    Cases are solved in blocks of `chunk_size` on up to `max_workers`
+    processes (default: number of CPUs); at most two blocks per worker are
+    in flight, so memory stays bounded for any number of cases.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    blocks = _blocks(cases, chunk_size)
+    if workers == 1:
+        for block in blocks:
+            yield from _solve_block(block, exergy, T0, P0)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(get_property_backend(),),
+    )
+    try:
+        pending = deque()
+        for block in blocks:
+            pending.append(executor.submit(_solve_block, block, exergy, T0, P0))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+
+def _solve_arrays(inputs, fluid):
+    return brayton_cycle_batch(fluid=fluid, **inputs)["metrics"]
+
+
+def solve_cycle_arrays(
+    inputs, fluid="Air", max_workers=None, chunk_size=20_000, store=None
+):
+    """
+    Cycle metrics (METRICS_DTYPE) for every point of the input arrays.
+
+    `inputs` maps the numeric CASE_FIELDS to scalars or arrays that
+    broadcast to one flat length; fields it leaves out take CASE_DEFAULTS.
+    Points are solved with brayton_cycle_batch in chunks of `chunk_size`
+    on up to `max_workers` processes. With a thermo.store.ResultStore as
+    `store`, results are looked up by the input values and the property
+    backend before anything is solved, and saved afterwards.
+    """
+    fields = [field for field in CASE_FIELDS if field != "fluid"]
+    unknown = set(inputs) - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown cycle inputs {sorted(unknown)}")
+    values = np.broadcast_arrays(
+        *(np.asarray(inputs.get(f, CASE_DEFAULTS.get(f)), dtype=float) for f in fields)
+    )
+    if values[0].ndim != 1:
+        raise ValueError("Cycle inputs must broadcast to one flat array")
+    arrays = dict(zip(fields, (np.ascontiguousarray(v) for v in values)))
+
+    backend = get_property_backend()
+    if store is not None:
+        key = result_key(
+            *arrays.values(),
+            kind="cycle_arrays",
+            fluid=fluid,
+            backend=backend[0],
+            options=backend[1],
+        )
+        stored = store.load(key)
+        if stored is not None:
+            return stored["metrics"]
+
+    n = len(values[0])
+    chunks = [
+        {field: array[start : start + chunk_size] for field, array in arrays.items()}
+        for start in range(0, n, chunk_size)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        results = [_solve_arrays(chunk, fluid) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(backend,)
+        ) as executor:
+            results = list(executor.map(_solve_arrays, chunks, [fluid] * len(chunks)))
+    metrics = np.concatenate(results) if results else np.empty(0, METRICS_DTYPE)
+    if store is not None:
+        store.save(key, {"metrics": metrics})
+    return metrics
+
+
+def _write_csv(rows, path):
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_parquet(rows, path, row_group_size):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow") from None
+
+    count = 0
+    writer = None
+    try:
+        for block in _blocks(rows, row_group_size):
+            table = pa.Table.from_pylist(block)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            count += len(block)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def write_results(rows, path, format=None, row_group_size=10_000):
+    """
+    Stream result rows to `path` as CSV or Parquet (`format` defaults to
+    the file extension) and return the number of rows written.
+    """
+    if format is None:
+        format = "parquet" if path.lower().endswith(".parquet") else "csv"
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {OUTPUT_FORMATS}")
+    if format == "parquet":
+        return _write_parquet(rows, path, row_group_size)
+    return _write_csv(rows, path)
+
+
+def run_batch(input_path, output_path, format=None, **kwargs):
+    """
+    Read the cases in `input_path`, solve them and write the results to
+    `output_path`. Keyword arguments are passed on to solve_cases.
+    Returns the number of cases solved.
+    """
+    return write_results(
+        solve_cases(read_cases(input_path), **kwargs), output_path, format
+    )
@@ -0,0 +1,371 @@
+"""
+Regenerative Brayton cycle with two-stage intercooled compression and
+two-stage reheat expansion.
+
+`brayton_cycle_analysis` solves a single operating point state by state;
+`brayton_cycle_batch` solves every combination of broadcastable input
+arrays at once and returns NumPy structured arrays.
+"""
+
+import math
+
+import numpy as np
+
+from thermo.profiling import profiled, span
+from thermo.properties import (
+    evaluate_array,
+    get_state_properties_from_hP,
+    get_state_properties_from_Ps,
+    get_state_properties_from_TP,
+)
+from thermo.states import CycleStates
+
+STATE_LABELS = (
+    "1",
+    "2s",
+    "2a",
+    "3",
+    "4s",
+    "4a",
+    "5",
+    "6s",
+    "6a",
+    "7",
+    "8s",
+    "8a",
+    "9",
+    "10",
+)
+
+METRIC_NAMES = (
+    "w_net",
+    "q_in",
+    "thermal_eff",
+    "back_work_ratio",
+    "exhaust_gas_temperature",
+)
+
+STATE_DTYPE = np.dtype([("T", "f8"), ("P", "f8"), ("h", "f8"), ("s", "f8")])
+CYCLE_STATES_DTYPE = np.dtype([(label, STATE_DTYPE) for label in STATE_LABELS])
+METRICS_DTYPE = np.dtype([(name, "f8") for name in METRIC_NAMES])
+
+# Operating limits checked by validate_parameters
+MAX_MATERIAL_TEMPERATURE = 1800  # K - current material limit for turbines
+PRESSURE_RATIO_RANGE = (5, 30)
+MAX_COMPRESSOR_DISCHARGE_TEMPERATURE = 900  # K
+
+
+def ideal_compressor_discharge_temperature(T1, Pr):
+    """Ideal gas approximation of the compressor discharge temperature"""
+    return T1 * (Pr ** ((1.4 - 1) / 1.4))
+
+
+def validate_parameters(Pr, T_inlet, fluid, eff_c, eff_t, eff_r, T1, P1):
+    """Validate that parameters are within physically possible ranges"""
+    warnings = []
+
+    # Check if turbine inlet temperature is feasible
+    max_material_temp = MAX_MATERIAL_TEMPERATURE
+    if T_inlet > max_material_temp:
+        warnings.append(
+            f"Turbine inlet temperature ({T_inlet} K) exceeds typical material limits ({max_material_temp} K)"
+        )
+
+    # Check pressure ratio limits
+    pr_min, pr_max = PRESSURE_RATIO_RANGE
+    if Pr < pr_min or Pr > pr_max:
+        warnings.append(
+            f"Pressure ratio ({Pr}) is outside typical operational range ({pr_min}-{pr_max})"
+        )
+
+    # Check if compressor discharge temperature is reasonable
+    T_comp_out_ideal = ideal_compressor_discharge_temperature(T1, Pr)
+    if T_comp_out_ideal > MAX_COMPRESSOR_DISCHARGE_TEMPERATURE:  # K
+        warnings.append(
+            f"Compressor discharge temperature may be too high ({T_comp_out_ideal:.1f} K)"
+        )
+
+    # Check component efficiencies
+    if eff_c < 0.8 or eff_c > 0.92:
+        warnings.append(
+            f"Compressor efficiency ({eff_c}) outside typical range (0.8-0.92)"
+        )
+    if eff_t < 0.85 or eff_t > 0.95:
+        warnings.append(
+            f"Turbine efficiency ({eff_t}) outside typical range (0.85-0.95)"
+        )
+    if eff_r < 0.7 or eff_r > 0.95:
+        warnings.append(
+            f"Regenerator effectiveness ({eff_r}) outside typical range (0.7-0.95)"
+        )
+
+    return warnings
+
+
+@profiled
+def brayton_cycle_analysis(
+    T1, P1, Pr, T5, fluid, eff_compressor, eff_turbine, effectiveness
+):
+    # State 1: Initial conditions (inlet to first compressor)
+    with span("state 1"):
+        state1 = get_state_properties_from_TP(T1, P1, fluid)
+
+    # State 2s: Isentropic compression (first stage)
+    P2 = math.sqrt(Pr) * P1
+    with span("state 2s"):
+        state2s = get_state_properties_from_Ps(P2, state1["s"], fluid)
+    # State 2a: Actual compression with isentropic efficiency
+    h2a = state1["h"] + (state2s["h"] - state1["h"]) / eff_compressor
+    with span("state 2a"):
+        state2a = get_state_properties_from_hP(h2a, P2, fluid)
+
+    # State 3: After intercooling (T3 equals inlet temperature T1, P3 equals P2)
+    T3 = T1
+    P3 = P2
+    with span("state 3"):
+        state3 = get_state_properties_from_TP(T3, P3, fluid)
+
+    # State 4s: Isentropic compression (second stage)
+    P4 = math.sqrt(Pr) * P3
+    with span("state 4s"):
+        state4s = get_state_properties_from_Ps(P4, state3["s"], fluid)
+    # State 4a: Actual compression after 2nd stage
+    h4a = state3["h"] + (state4s["h"] - state3["h"]) / eff_compressor
+    with span("state 4a"):
+        state4a = get_state_properties_from_hP(h4a, P4, fluid)
+
+    # State 5: After first heat addition (first turbine inlet)
+    P5 = P4
+    with span("state 5"):
+        state5 = get_state_properties_from_TP(T5, P5, fluid)
+
+    # State 6s: Isentropic expansion (first turbine stage)
+    P6 = P5 / math.sqrt(Pr)
+    with span("state 6s"):
+        state6s = get_state_properties_from_Ps(P6, state5["s"], fluid)
+    # State 6a: Actual expansion (first turbine, with efficiency)
+    h6a = state5["h"] - eff_turbine * (state5["h"] - state6s["h"])
+    with span("state 6a"):
+        state6a = get_state_properties_from_hP(h6a, P6, fluid)
+
+    # State 7: Second heat addition (second turbine inlet, reheat)
+    P7 = P6
+    T7 = T5
+    with span("state 7"):
+        state7 = get_state_properties_from_TP(T7, P7, fluid)
+
+    # State 8s: Isentropic expansion (second turbine stage)
+    P8 = P7 / math.sqrt(Pr)
+    with span("state 8s"):
+        state8s = get_state_properties_from_Ps(P8, state7["s"], fluid)
+    # State 8a: Actual expansion (second turbine, with efficiency)
+    h8a = state7["h"] - eff_turbine * (state7["h"] - state8s["h"])
+    with span("state 8a"):
+        state8a = get_state_properties_from_hP(h8a, P8, fluid)
+
+    # State 9: Regeneration—preheated air before main combustor (using effectiveness)
+    h9 = state4a["h"] + effectiveness * (state8a["h"] - state4a["h"])
+    with span("state 9"):
+        state9 = get_state_properties_from_hP(h9, P4, fluid)
+
+    # State 10: Air after heat rejected in regenerator
+    h10 = state8a["h"] - (state9["h"] - state4a["h"])
+    with span("state 10"):
+        state10 = get_state_properties_from_hP(h10, P1, fluid)
+
+    # Net specific work output
+    w_comp = (state2a["h"] - state1["h"]) + (state4a["h"] - state3["h"])
+    w_turb = (state5["h"] - state6a["h"]) + (state7["h"] - state8a["h"])
+    w_net = w_turb - w_comp
+
+    # Total heat input (Q_in)
+    q_in = (state5["h"] - state9["h"]) + (state7["h"] - state6a["h"])
+
+    # Cycle thermal efficiency (%)
+    thermal_eff = (w_net / q_in) * 100
+
+    # Back work ratio (fraction of turbine output consumed by compressor)
+    back_work_ratio = w_comp / w_turb
+
+    # Exhaust gas temperature after last turbine stage
+    exhaust_gas_temperature = state10["T"]
+
+    return {
+        "states": CycleStates.from_dict(
+            {
+                "1": state1,
+                "2s": state2s,
+                "2a": state2a,
+                "3": state3,
+                "4s": state4s,
+                "4a": state4a,
+                "5": state5,
+                "6s": state6s,
+                "6a": state6a,
+                "7": state7,
+                "8s": state8s,
+                "8a": state8a,
+                "9": state9,
+                "10": state10,
+            },
+            fluid,
+        ),
+        "metrics": {
+            "w_net": w_net,
+            "q_in": q_in,
+            "thermal_eff": thermal_eff,
+            "back_work_ratio": back_work_ratio,
+            "exhaust_gas_temperature": exhaust_gas_temperature,
+        },
+    }
+
+
+def _state_TP(T, P, fluid, abstract_state):
+    h, s = evaluate_array("TP", T, P, fluid, abstract_state)
+    return {"T": T, "P": P, "h": h, "s": s}
+
+
+def _state_Ps(P, s, fluid, abstract_state):
+    T, h = evaluate_array("Ps", P, s, fluid, abstract_state)
+    return {"T": T, "P": P, "h": h, "s": s}
+
+
+def _state_hP(h, P, fluid, abstract_state):
+    T, s = evaluate_array("hP", h, P, fluid, abstract_state)
+    return {"T": T, "P": P, "h": h, "s": s}
+
+
+@profiled
+def brayton_cycle_batch(
+    T1,
+    P1,
+    Pr,
+    T5,
+    fluid,
+    eff_compressor,
+    eff_turbine,
+    effectiveness,
+    abstract_state=None,
+):
+    """
+    Array-native version of brayton_cycle_analysis.
+
+    All numeric inputs may be scalars or NumPy arrays that broadcast
+    together, e.g. Pr[:, None] and T5[None, :] for a (Pr, T5) grid. Each
+    state is evaluated in bulk at the smallest shape it depends on, so
+    states that only depend on Pr are not repeated for every T5.
+
+    `abstract_state` is an optional CoolProp AbstractState for `fluid`
+    that is reused for every property evaluation (see evaluate_array).
+
+    Returns {"states": ..., "metrics": ...} where "states" is a
+    thermo.states.CycleStates over a CYCLE_STATES_DTYPE array
+    (results["states"]["8a"]["T"] or results["states"].T[..., "8a"]) and
+    "metrics" a structured array of METRICS_DTYPE, both with the broadcast
+    shape of the inputs. Points CoolProp cannot solve come back as inf/nan.
+    """
+    T1, P1, Pr, T5, eff_compressor, eff_turbine, effectiveness = (
+        np.asarray(x, dtype=float)
+        for x in (T1, P1, Pr, T5, eff_compressor, eff_turbine, effectiveness)
+    )
+    sqrt_Pr = np.sqrt(Pr)
+
+    state1 = _state_TP(T1, P1, fluid, abstract_state)
+
+    # Intercooled compression
+    P2 = sqrt_Pr * P1
+    state2s = _state_Ps(P2, state1["s"], fluid, abstract_state)
+    h2a = state1["h"] + (state2s["h"] - state1["h"]) / eff_compressor
+    state2a = _state_hP(h2a, P2, fluid, abstract_state)
+
+    state3 = _state_TP(T1, P2, fluid, abstract_state)
+
+    P4 = sqrt_Pr * P2
+    state4s = _state_Ps(P4, state3["s"], fluid, abstract_state)
+    h4a = state3["h"] + (state4s["h"] - state3["h"]) / eff_compressor
+    state4a = _state_hP(h4a, P4, fluid, abstract_state)
+
+    # Reheated expansion
+    state5 = _state_TP(T5, P4, fluid, abstract_state)
+
+    P6 = P4 / sqrt_Pr
+    state6s = _state_Ps(P6, state5["s"], fluid, abstract_state)
+    h6a = state5["h"] - eff_turbine * (state5["h"] - state6s["h"])
+    state6a = _state_hP(h6a, P6, fluid, abstract_state)
+
+    state7 = _state_TP(T5, P6, fluid, abstract_state)
+
+    P8 = P6 / sqrt_Pr
+    state8s = _state_Ps(P8, state7["s"], fluid, abstract_state)
+    h8a = state7["h"] - eff_turbine * (state7["h"] - state8s["h"])
+    state8a = _state_hP(h8a, P8, fluid, abstract_state)
+
+    # Regenerator
+    h9 = state4a["h"] + effectiveness * (state8a["h"] - state4a["h"])
+    state9 = _state_hP(h9, P4, fluid, abstract_state)
+
+    h10 = state8a["h"] - (state9["h"] - state4a["h"])
+    state10 = _state_hP(h10, P1, fluid, abstract_state)
+
+    w_comp = (state2a["h"] - state1["h"]) + (state4a["h"] - state3["h"])
+    w_turb = (state5["h"] - state6a["h"]) + (state7["h"] - state8a["h"])
+    w_net = w_turb - w_comp
+    q_in = (state5["h"] - state9["h"]) + (state7["h"] - state6a["h"])
+
+    metric_values = {
+        "w_net": w_net,
+        "q_in": q_in,
+        "thermal_eff": (w_net / q_in) * 100,
+        "back_work_ratio": w_comp / w_turb,
+        "exhaust_gas_temperature": state10["T"],
+    }
+    shape = np.broadcast_shapes(*(np.shape(v) for v in metric_values.values()))
+
+    states = np.empty(shape, dtype=CYCLE_STATES_DTYPE)
+    for label, state in zip(
+        STATE_LABELS,
+        (
+            state1,
+            state2s,
+            state2a,
+            state3,
+            state4s,
+            state4a,
+            state5,
+            state6s,
+            state6a,
+            state7,
+            state8s,
+            state8a,
+            state9,
+            state10,
+        ),
+    ):
+        for prop in STATE_DTYPE.names:
+            states[label][prop] = state[prop]
+
+    metrics = np.empty(shape, dtype=METRICS_DTYPE)
+    for name, value in metric_values.items():
+        metrics[name] = value
+
+    return {"states": CycleStates(states, fluid), "metrics": metrics}
+
+
+def sweep_efficiency(
+    pr_range, t_inlet_range, fluid, eff_c, eff_t, eff_r, T1=300, P1=101325
+):
+    """
+    Thermal efficiency (%) over the (pressure ratio, turbine inlet
+    temperature) grid, shape (len(pr_range), len(t_inlet_range)).
+    """
+    results = brayton_cycle_batch(
+        T1=T1,
+        P1=P1,
+        Pr=np.asarray(pr_range, dtype=float)[:, None],
+        T5=np.asarray(t_inlet_range, dtype=float)[None, :],
+        fluid=fluid,
+        eff_compressor=eff_c,
+        eff_turbine=eff_t,
+        effectiveness=eff_r,
+    )
+    return results["metrics"]["thermal_eff"]
@@ -0,0 +1,107 @@
+"""
+Command line interface for batch Brayton cycle runs.
+
+    python -m thermo cases.csv -o results.parquet --exergy --workers 4
+
+Only the cycle model is imported at startup; matplotlib is imported when
+--plot is given.
+"""
+
+import argparse
+import sys
+import time
+
+from thermo.batch import OUTPUT_FORMATS, read_cases, solve_cases, write_results
+from thermo.properties import PROPERTY_BACKENDS, set_property_backend
+
+
+def _plot_cases(points, path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    T5, Pr, eff = zip(*points)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    scatter = ax.scatter(T5, Pr, c=eff, cmap="viridis", s=12)
+    fig.colorbar(scatter, ax=ax, label="Thermal Efficiency (%)")
+    ax.set_xlabel("Turbine Inlet Temperature (K)")
+    ax.set_ylabel("Compressor Pressure Ratio")
+    ax.set_title("Thermal Efficiency of the Design Cases")
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+def _record_points(rows, points):
+    # Keep what the plot needs while the rows stream to the output file
+    for row in rows:
+        points.append((row["T5"], row["Pr"], row["thermal_eff"]))
+        yield row
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m thermo",
+        description="Solve Brayton cycle design cases from a CSV or JSON file.",
+    )
+    parser.add_argument("cases", help="case file (.csv, .json, .jsonl or .ndjson)")
+    parser.add_argument("-o", "--output", required=True, help="result file")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="output format (default: from the output extension)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="cases per worker task"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=PROPERTY_BACKENDS,
+        default="auto",
+        help="property backend (default: auto)",
+    )
+    parser.add_argument("--exergy", action="store_true", help="add second-law results")
+    parser.add_argument(
+        "--T0", type=float, default=298.0, help="dead state temperature (K)"
+    )
+    parser.add_argument(
+        "--P0", type=float, default=101325.0, help="dead state pressure (Pa)"
+    )
+    parser.add_argument(
+        "--plot", metavar="PATH", help="save an efficiency scatter plot to PATH"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    set_property_backend(args.backend)
+    start = time.perf_counter()
+
+    rows = solve_cases(
+        read_cases(args.cases),
+        exergy=args.exergy,
+        T0=args.T0,
+        P0=args.P0,
+        max_workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    points = []
+    if args.plot:
+        rows = _record_points(rows, points)
+
+    try:
+        count = write_results(rows, args.output, args.format)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.plot and points:
+        _plot_cases(points, args.plot)
+
+    elapsed = time.perf_counter() - start
+    print(f"Solved {count} cases in {elapsed:.1f} s -> {args.output}", file=sys.stderr)
+    return 0
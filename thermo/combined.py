@@ -0,0 +1,326 @@
+"""
+Gas/steam combined cycle: a simple Brayton cycle whose exhaust raises
+steam for a Rankine cycle in a heat recovery steam generator (HRSG).
+
+`combined_cycle_batch` generalizes WiFi_Credentials_Code.py. The
+compressor and turbine outlet states, the pump work, the steam turbine
+exit quality and the steam mass flow all follow from the component
+efficiencies and the HRSG energy balance
+
+    m_gas * (h8 - h9) = m_steam * (h3 - h2)
+
+instead of being entered by hand. With a stack temperature the balance
+gives the steam flow directly; with a pinch point the steam flow is set
+by the pinch and the stack temperature is found by inverting h(T) of the
+exhaust gas. All inputs broadcast like brayton_cycle_batch, and
+`combined_cycle_sweep` solves (condenser pressure, turbine inlet
+temperature) grids on a process pool.
+
+Gas states are numbered as in the script, 5 (compressor inlet) to 9
+(stack); steam states 1 (condenser outlet) to 4 (steam turbine exit),
+with "s" marking isentropic states.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import CoolProp
+import numpy as np
+
+from thermo import profiling
+from thermo.brayton import STATE_DTYPE
+from thermo.properties import evaluate_array, get_abstract_state, get_property_backend
+from thermo.states import CycleStates
+from thermo.sweep import chunk_bounds, init_worker
+
+GAS_STATE_LABELS = ("5", "6s", "6", "7", "8s", "8", "9")
+STEAM_STATE_LABELS = ("1", "2s", "2", "3", "4s", "4")
+
+COMBINED_METRIC_NAMES = (
+    "m_steam",  # kg/s
+    "T_stack",  # K
+    "x_turbine_exit",  # steam quality at state 4
+    "Q_in",  # W
+    "W_gas",  # W, gas turbine minus compressor
+    "W_steam",  # W, steam turbine minus pump
+    "W_net",  # W
+    "W_turbines",  # W, gas and steam turbine output
+    "thermal_eff",  # %
+)
+COMBINED_METRICS_DTYPE = np.dtype([(name, "f8") for name in COMBINED_METRIC_NAMES])
+
+
+def _saturated(P, Q, fluid):
+    """Saturated states at pressures P and quality Q (exact EOS)."""
+    P = np.asarray(P, dtype=float)
+    unique, inverse = np.unique(P, return_inverse=True)
+    profiler = profiling.active_profiler()
+    if profiler is not None:
+        start = time.perf_counter()
+    state = get_abstract_state(fluid)
+    values = np.full((len(unique), 3), np.nan)
+    for i, p in enumerate(unique):
+        try:
+            state.update(CoolProp.PQ_INPUTS, p, Q)
+            values[i] = state.T(), state.hmass(), state.smass()
+        except ValueError:
+            pass
+    if profiler is not None:
+        profiler.record_call(
+            "PQ", fluid, "exact", len(unique), time.perf_counter() - start, "T,h,s"
+        )
+    T, h, s = (values[inverse.ravel(), k].reshape(P.shape) for k in range(3))
+    return {"T": T, "P": P, "h": h, "s": s}
+
+
+def _state(pair, a, b, fluid, backend=None):
+    first, second = evaluate_array(pair, a, b, fluid, backend=backend)
+    if pair == "TP":
+        return {"T": a, "P": b, "h": first, "s": second}
+    if pair == "Ps":
+        return {"T": first, "P": a, "h": second, "s": b}
+    return {"T": first, "P": b, "h": a, "s": second}
+
+
+def _records(states, labels, shape):
+    records = np.empty(shape, dtype=[(label, STATE_DTYPE) for label in labels])
+    for label, state in zip(labels, states):
+        for prop in STATE_DTYPE.names:
+            records[label][prop] = state[prop]
+    return records
+
+
+def combined_cycle_batch(
+    P_condenser=8000.0,
+    T_turbine_inlet=1400.0,
+    Pr=12.0,
+    T_ambient=300.0,
+    P_ambient=100e3,
+    eff_compressor=0.84,
+    eff_gas_turbine=0.88,
+    P_boiler=8e6,
+    T_steam=673.0,
+    eff_steam_turbine=0.90,
+    eff_pump=0.80,
+    T_stack=400.0,
+    pinch=None,
+    m_gas=100.0,
+    gas="Air",
+    steam="Water",
+):
+    """
+    Solve the combined cycle for broadcastable inputs (SI units; m_gas in
+    kg/s). The defaults are the design point of WiFi_Credentials_Code.py.
+
+    With `pinch` (K) the HRSG evaporator pinch, gas leaving the evaporator
+    at T_sat(P_boiler) + pinch, fixes the steam flow and the stack
+    temperature follows; otherwise `T_stack` is given. Steam states are
+    always evaluated with the exact equation of state, as the property
+    tables do not resolve the saturation dome.
+
+    Returns {"gas_states": CycleStates (GAS_STATE_LABELS), "steam_states":
+    CycleStates (STEAM_STATE_LABELS), "metrics": COMBINED_METRICS_DTYPE};
+    infeasible points (exhaust colder than the live steam, no steam flow)
+    have nan metrics.
+    """
+    inputs = [
+        np.asarray(x, dtype=float)
+        for x in (
+            P_condenser,
+            T_turbine_inlet,
+            Pr,
+            T_ambient,
+            P_ambient,
+            eff_compressor,
+            eff_gas_turbine,
+            P_boiler,
+            T_steam,
+            eff_steam_turbine,
+            eff_pump,
+            T_stack if pinch is None else pinch,
+            m_gas,
+        )
+    ]
+    (
+        P_condenser,
+        T_turbine_inlet,
+        Pr,
+        T_ambient,
+        P_ambient,
+        eff_compressor,
+        eff_gas_turbine,
+        P_boiler,
+        T_steam,
+        eff_steam_turbine,
+        eff_pump,
+        T_stack_or_pinch,
+        m_gas,
+    ) = inputs
+    shape = np.broadcast_shapes(*(x.shape for x in inputs))
+
+    # Gas turbine (Brayton) cycle
+    state5 = _state("TP", T_ambient, P_ambient, gas)
+    P6 = P_ambient * Pr
+    state6s = _state("Ps", P6, state5["s"], gas)
+    h6 = state5["h"] + (state6s["h"] - state5["h"]) / eff_compressor
+    state6 = _state("hP", h6, P6, gas)
+    state7 = _state("TP", T_turbine_inlet, P6, gas)
+    state8s = _state("Ps", P_ambient, state7["s"], gas)
+    h8 = state7["h"] - eff_gas_turbine * (state7["h"] - state8s["h"])
+    state8 = _state("hP", h8, P_ambient, gas)
+
+    # Steam (Rankine) cycle
+    state1 = _saturated(P_condenser, 0.0, steam)
+    state2s = _state("Ps", P_boiler, state1["s"], steam, "exact")
+    h2 = state1["h"] + (state2s["h"] - state1["h"]) / eff_pump
+    state2 = _state("hP", h2, P_boiler, steam, "exact")
+    state3 = _state("TP", T_steam, P_boiler, steam, "exact")
+    state4s = _state("Ps", P_condenser, state3["s"], steam, "exact")
+    h4 = state3["h"] - eff_steam_turbine * (state3["h"] - state4s["h"])
+    state4 = _state("hP", h4, P_condenser, steam, "exact")
+    vapor = _saturated(P_condenser, 1.0, steam)
+    x4 = (h4 - state1["h"]) / (vapor["h"] - state1["h"])
+
+    # HRSG energy balance m_gas * (h8 - h9) = m_steam * (h3 - h2)
+    if pinch is None:
+        state9 = _state("TP", T_stack_or_pinch, P_ambient, gas)
+        m_steam = m_gas * (h8 - state9["h"]) / (state3["h"] - h2)
+    else:
+        T_sat = _saturated(P_boiler, 0.0, steam)
+        T_pinch = T_sat["T"] + T_stack_or_pinch
+        h_pinch, _ = evaluate_array("TP", T_pinch, P_ambient, gas)
+        # Superheater and evaporator are fed by the gas above the pinch
+        m_steam = m_gas * (h8 - h_pinch) / (state3["h"] - T_sat["h"])
+        h9 = h8 - m_steam * (state3["h"] - h2) / m_gas
+        state9 = _state("hP", h9, P_ambient, gas)
+
+    W_gas = m_gas * ((state7["h"] - h8) - (h6 - state5["h"]))
+    W_steam = m_steam * ((state3["h"] - h4) - (h2 - state1["h"]))
+    Q_in = m_gas * (state7["h"] - h6)
+    W_net = W_gas + W_steam
+    feasible = (state8["T"] > T_steam) & (m_steam > 0) & (state9["T"] < state8["T"])
+
+    metrics = np.empty(shape, dtype=COMBINED_METRICS_DTYPE)
+    metrics["m_steam"] = m_steam
+    metrics["T_stack"] = state9["T"]
+    metrics["x_turbine_exit"] = x4
+    metrics["Q_in"] = Q_in
+    metrics["W_gas"] = W_gas
+    metrics["W_steam"] = W_steam
+    metrics["W_net"] = W_net
+    metrics["W_turbines"] = m_gas * (state7["h"] - h8) + m_steam * (state3["h"] - h4)
+    metrics["thermal_eff"] = W_net / Q_in * 100
+    for name in COMBINED_METRIC_NAMES:
+        metrics[name] = np.where(feasible, metrics[name], np.nan)
+
+    gas_states = (state5, state6s, state6, state7, state8s, state8, state9)
+    steam_states = (state1, state2s, state2, state3, state4s, state4)
+    return {
+        "gas_states": CycleStates(_records(gas_states, GAS_STATE_LABELS, shape), gas),
+        "steam_states": CycleStates(
+            _records(steam_states, STEAM_STATE_LABELS, shape), steam
+        ),
+        "metrics": metrics,
+    }
+
+
+def _grid_kwargs(kwargs, shape):
+    """
+    combined_cycle_batch arguments with every array broadcast to the sweep
+    grid, so that each chunk can be given its own rows.
+    """
+    grid = {}
+    for name, value in kwargs.items():
+        if np.ndim(value) == 0:
+            # Scalars, fluid names and pinch=None go to every chunk as is
+            grid[name] = value
+            continue
+        try:
+            grid[name] = np.broadcast_to(np.asarray(value, dtype=float), shape)
+        except ValueError:
+            raise ValueError(
+                f"{name} of shape {np.shape(value)} does not broadcast to the "
+                f"(condenser pressure, turbine inlet temperature) grid {shape}"
+            ) from None
+    return grid
+
+
+def _chunk_kwargs(grid, start, stop):
+    return {
+        name: value[start:stop] if np.ndim(value) else value
+        for name, value in grid.items()
+    }
+
+
+def _solve_combined_chunk(start, p_chunk, t_inlet_range, kwargs):
+    results = combined_cycle_batch(
+        P_condenser=p_chunk[:, None], T_turbine_inlet=t_inlet_range[None, :], **kwargs
+    )
+    return (
+        start,
+        results["gas_states"].records,
+        results["steam_states"].records,
+        results["metrics"],
+    )
+
+
+def combined_cycle_sweep(
+    p_condenser_range,
+    t_inlet_range,
+    max_workers=None,
+    chunk_points=2500,
+    **kwargs,
+):
+    """
+    Solve the combined cycle over the (condenser pressure, gas turbine
+    inlet temperature) grid, in parallel like
+    thermo.sweep.parallel_sweep_cycle: whole condenser-pressure rows are
+    solved in chunks of about `chunk_points` points on up to
+    `max_workers` processes. Other keyword arguments are passed on to
+    combined_cycle_batch; arrays must broadcast to the grid shape (e.g. a
+    pinch per point) and are split into chunks with it.
+
+    Returns the combined_cycle_batch results with shape
+    (len(p_condenser_range), len(t_inlet_range)).
+    """
+    p_condenser_range = np.asarray(p_condenser_range, dtype=float)
+    t_inlet_range = np.asarray(t_inlet_range, dtype=float)
+    workers = max_workers or os.cpu_count() or 1
+    bounds = chunk_bounds(len(p_condenser_range), len(t_inlet_range), chunk_points)
+    grid = _grid_kwargs(kwargs, (len(p_condenser_range), len(t_inlet_range)))
+
+    if workers == 1 or len(bounds) <= 1:
+        chunks = [
+            _solve_combined_chunk(
+                start,
+                p_condenser_range[start:stop],
+                t_inlet_range,
+                _chunk_kwargs(grid, start, stop),
+            )
+            for start, stop in bounds
+        ]
+    else:
+        gas = kwargs.get("gas", "Air")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(bounds)),
+            initializer=init_worker,
+            initargs=(gas, get_property_backend()),
+        ) as executor:
+            chunks = list(
+                executor.map(
+                    _solve_combined_chunk,
+                    [start for start, _ in bounds],
+                    [p_condenser_range[start:stop] for start, stop in bounds],
+                    [t_inlet_range] * len(bounds),
+                    [_chunk_kwargs(grid, start, stop) for start, stop in bounds],
+                )
+            )
+
+    gas = kwargs.get("gas", "Air")
+    steam = kwargs.get("steam", "Water")
+    return {
+        "gas_states": CycleStates(np.concatenate([c[1] for c in chunks]), gas),
+        "steam_states": CycleStates(np.concatenate([c[2] for c in chunks]), steam),
+        "metrics": np.concatenate([c[3] for c in chunks]),
+    }
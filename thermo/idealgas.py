@@ -0,0 +1,294 @@
+"""
+Ideal-gas property backend with NASA 7-coefficient polynomials.
+
+The ideal-gas heat capacity of the fluid is fitted in the NASA form
+
+    cp / R = a1 + a2 T + a3 T^2 + a4 T^3 + a5 T^4
+
+on a low and a high temperature range, which gives h(T) and s(T, P) in
+closed form. The (P, s) and (h, P) inversions are vectorized Newton
+iterations, so a state costs a few polynomial evaluations instead of a
+Helmholtz solve. The polynomials are fitted to CoolProp's own ideal-gas
+part and anchored to the exact EOS at a low-pressure reference state, so
+the only error is the real-gas departure, which grows with pressure and
+falls with temperature. The model measures that error against CoolProp
+over its (T, P) range when it is built, for every input pair including
+the inverted ones, and only answers states whose outputs are within
+tolerance; the others are reported as not ok and are evaluated exactly
+by thermo.properties.
+"""
+
+import CoolProp
+import numpy as np
+
+# Reference state anchoring h and s to the exact EOS; ideal at 1 kPa
+T_REF = 298.15
+P_REF = 1000.0
+
+
+def _fit_range(T, cp_over_R):
+    """a1..a5 of cp/R on one temperature range (least squares)."""
+    return np.polynomial.polynomial.polyfit(T, cp_over_R, 4)
+
+
+class IdealGasModel:
+    """
+    NASA-polynomial ideal-gas model of one fluid over a (T, P) range.
+
+    States where an output h or s differs from the exact EOS by more than
+    h_tol (J/kg) or s_tol (J/kg/K), or a solved T by more than h_tol / cp,
+    are outside the validity region of their input pair and are not
+    evaluated. The departures largely cancel in the enthalpy and entropy
+    differences of a cycle, while mixing ideal and exact states does not,
+    so the defaults are wide: for air they accept states up to about
+    1 MPa at 250 K and 5 MPa above 1000 K, where the cycle efficiency of
+    brayton_cycle_batch is within 0.05 percentage points of the exact EOS.
+
+    h_tol defaults to 6 kJ/kg rather than 3 kJ/kg for that reason. The
+    temperature solved from (P, s) carries the entropy departure, so at
+    3 kJ/kg the Ps states of a high-pressure cycle fall back to the exact
+    EOS while its TP states do not, and the mixed cycle is off by up to
+    0.23 percentage points. Pass h_tol=3000 where each state has to be
+    within 3 kJ/kg rather than each cycle within 0.05 points.
+    """
+
+    def __init__(
+        self,
+        fluid,
+        T_range=(200.0, 2000.0),
+        P_range=(1e3, 1e7),
+        T_mid=1000.0,
+        h_tol=6000.0,
+        s_tol=10.0,
+        n_T=91,
+        n_P=41,
+    ):
+        self.fluid = fluid
+        self._state = CoolProp.AbstractState("HEOS", fluid)
+        # Stay within the temperature limits of the fluid's EOS
+        self.T_range = (
+            max(float(T_range[0]), self._state.Tmin()),
+            min(float(T_range[1]), self._state.Tmax()),
+        )
+        self.P_range = (float(P_range[0]), float(P_range[1]))
+        self.T_mid = float(T_mid)
+        self.h_tol = h_tol
+        self.s_tol = s_tol
+        self.R = self._state.gas_constant() / self._state.molar_mass()
+        self._fit()
+        self._check_validity(n_T, n_P)
+
+    def _fit(self):
+        """a1..a7 for the low and the high range, continuous at T_mid."""
+        coeffs = np.zeros((2, 7))
+        for k, (T_lo, T_hi) in enumerate(
+            ((self.T_range[0], self.T_mid), (self.T_mid, self.T_range[1]))
+        ):
+            T = np.linspace(T_lo, T_hi, 200)
+            cp = np.empty_like(T)
+            for i, t in enumerate(T):
+                self._state.update(CoolProp.PT_INPUTS, P_REF, t)
+                cp[i] = self._state.cp0mass()
+            coeffs[k, :5] = _fit_range(T, cp / self.R)
+        self._coeffs = coeffs
+
+        # Integration constants: the low range matches the exact EOS at the
+        # reference state, the high range the low range at T_mid
+        self._state.update(CoolProp.PT_INPUTS, P_REF, T_REF)
+        h_ref, s_ref = self._state.hmass(), self._state.smass()
+        T_ref = np.array(T_REF)
+        coeffs[0, 5] = (h_ref - self._h_range(0, T_ref)) / self.R
+        coeffs[0, 6] = (s_ref - self._s0_range(0, T_ref)) / self.R
+        T_mid = np.array(self.T_mid)
+        coeffs[1, 5] = (self._h_range(0, T_mid) - self._h_range(1, T_mid)) / self.R
+        coeffs[1, 6] = (self._s0_range(0, T_mid) - self._s0_range(1, T_mid)) / self.R
+
+    def _h_range(self, k, T):
+        a = self._coeffs[k]
+        poly = a[0] + T * (a[1] / 2 + T * (a[2] / 3 + T * (a[3] / 4 + T * a[4] / 5)))
+        return self.R * (poly * T + a[5])
+
+    def _s0_range(self, k, T):
+        a = self._coeffs[k]
+        poly = T * (a[1] + T * (a[2] / 2 + T * (a[3] / 3 + T * a[4] / 4)))
+        return self.R * (a[0] * np.log(T) + poly + a[6])
+
+    def _cp_range(self, k, T):
+        a = self._coeffs[k]
+        return self.R * (a[0] + T * (a[1] + T * (a[2] + T * (a[3] + T * a[4]))))
+
+    def _select(self, func, T):
+        return np.where(T < self.T_mid, func(0, T), func(1, T))
+
+    def h(self, T):
+        """Specific enthalpy (J/kg) at temperature T."""
+        return self._select(self._h_range, np.asarray(T, dtype=float))
+
+    def s(self, T, P):
+        """Specific entropy (J/kg/K) at temperature T and pressure P."""
+        T = np.asarray(T, dtype=float)
+        return self._select(self._s0_range, T) - self.R * np.log(P / P_REF)
+
+    def cp(self, T):
+        """Ideal-gas specific heat (J/kg/K) at temperature T."""
+        return self._select(self._cp_range, np.asarray(T, dtype=float))
+
+    def _invert(self, target, value, log_T, maxiter=30, tol=1e-10):
+        """
+        Solve value(T) = target for T with Newton steps. Both h and s0 have
+        the slope cp, in T for enthalpy and in ln T for entropy.
+        """
+        T_min, T_max = self.T_range
+        T = np.full(target.shape, T_REF)
+        done = np.isnan(target)
+        for _ in range(maxiter):
+            step = (value(T) - target) / self.cp(T)
+            if log_T:
+                T_new = T * np.exp(-np.clip(step, -1.0, 1.0))
+            else:
+                T_new = T - step
+            T_new = np.where(done, T, np.clip(T_new, 0.5 * T_min, 2 * T_max))
+            done |= np.abs(T_new - T) <= tol * T
+            T = T_new
+            if np.all(done):
+                break
+        return T
+
+    def _check_validity(self, n_T, n_P):
+        """
+        Highest pressure at each temperature node up to which the outputs
+        of each input pair are within tolerance of the exact EOS, counting
+        the solved temperature of Ps and hP against h_tol / cp. The inverted
+        pairs carry the entropy or enthalpy departure into T, so their
+        limits are lower than those of TP.
+        """
+        self._T_nodes = np.linspace(*self.T_range, n_T)
+        P_nodes = np.geomspace(*self.P_range, n_P)
+        T, P = np.meshgrid(self._T_nodes, P_nodes, indexing="ij")
+        h_exact = np.full(T.shape, np.nan)
+        s_exact = np.full(T.shape, np.nan)
+        for index in np.ndindex(T.shape):
+            try:
+                self._state.update(CoolProp.PT_INPUTS, P[index], T[index])
+            except ValueError:
+                continue
+            h_exact[index] = self._state.hmass()
+            s_exact[index] = self._state.smass()
+
+        T_Ps = self._invert(
+            s_exact + self.R * np.log(P / P_REF),
+            lambda T: self._select(self._s0_range, T),
+            log_T=True,
+        )
+        T_hP = self._invert(h_exact, self.h, log_T=False)
+        errors = {
+            "TP": {"h": self.h(T) - h_exact, "s": self.s(T, P) - s_exact},
+            "Ps": {"T": T_Ps - T, "h": self.h(T_Ps) - h_exact},
+            "hP": {"T": T_hP - T, "s": self.s(T_hP, P) - s_exact},
+        }
+        # A temperature error counts as the enthalpy error it amounts to
+        tol = {"T": self.h_tol / self.cp(T), "h": self.h_tol, "s": self.s_tol}
+        self._P_limit = {}
+        self.max_error = {}
+        with np.errstate(invalid="ignore"):
+            for pair, pair_errors in errors.items():
+                ok = np.ones(T.shape, dtype=bool)
+                for name, error in pair_errors.items():
+                    ok &= np.abs(error) <= tol[name]
+                # Valid from the lowest pressure up to the first failure
+                ok = np.cumprod(ok, axis=1).astype(bool)
+                self._P_limit[pair] = np.where(
+                    ok.any(axis=1), P_nodes[ok.sum(axis=1) - 1], 0.0
+                )
+                self.max_error[pair] = {
+                    name: float(np.abs(error[ok]).max(initial=0.0))
+                    for name, error in pair_errors.items()
+                }
+
+    def in_tolerance(self, T, P, pair="TP"):
+        """
+        Mask of states inside the T range and below the pressure limit of
+        the input pair at both neighbouring temperature nodes.
+        """
+        T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P))
+        index = np.clip(np.searchsorted(self._T_nodes, T), 1, len(self._T_nodes) - 1)
+        P_limit = np.minimum(self._P_limit[pair][index - 1], self._P_limit[pair][index])
+        return (
+            (T >= self.T_range[0])
+            & (T <= self.T_range[1])
+            & (P >= self.P_range[0])
+            & (P <= P_limit)
+        )
+
+    def evaluate(self, pair, a, b):
+        """
+        Vectorized evaluation of an input pair (see properties.INPUT_PAIRS),
+        with the same return values as tables.PropertyTable.evaluate: the
+        two outputs and a mask of points within tolerance; the others are
+        left as nan.
+        """
+        a, b = np.broadcast_arrays(
+            np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+        )
+        if pair == "TP":
+            T, P = a, b
+            first, second = self.h(T), self.s(T, P)
+        elif pair == "Ps":
+            P = a
+            # s0(T) = s + R ln(P / P_REF)
+            target = b + self.R * np.log(P / P_REF)
+            T = self._invert(
+                target, lambda T: self._select(self._s0_range, T), log_T=True
+            )
+            first, second = T, self.h(T)
+        elif pair == "hP":
+            P = b
+            T = self._invert(a, self.h, log_T=False)
+            first, second = T, self.s(T, P)
+        else:
+            raise ValueError(f"Unknown input pair {pair!r}")
+        with np.errstate(invalid="ignore"):
+            ok = (
+                self.in_tolerance(T, P, pair) & np.isfinite(first) & np.isfinite(second)
+            )
+        first = np.where(ok, first, np.nan)
+        second = np.where(ok, second, np.nan)
+        return first, second, ok
+
+    def validation_report(self, n_samples=2000, seed=0):
+        """
+        Maximum error of every output against the exact EOS at random
+        states of the (T, P) range, counting only states the model
+        answers. Returns a list of rows {"pair", "output",
+        "max_abs_error", "max_rel_error", "points_out_of_tolerance"}.
+        """
+        from thermo.properties import INPUT_PAIRS, update_state
+
+        rng = np.random.default_rng(seed)
+        T = rng.uniform(*self.T_range, n_samples)
+        P = np.exp(rng.uniform(*np.log(self.P_range), n_samples))
+        h, s = np.array([update_state(self._state, "TP", t, p) for t, p in zip(T, P)]).T
+
+        exact_inputs = {"TP": (T, P), "Ps": (P, s), "hP": (h, P)}
+        exact_outputs = {"TP": (h, s), "Ps": (T, h), "hP": (T, s)}
+        rows = []
+        for pair, (a, b) in exact_inputs.items():
+            first, second, ok = self.evaluate(pair, a, b)
+            for name, approx, exact in zip(
+                INPUT_PAIRS[pair][0], (first, second), exact_outputs[pair]
+            ):
+                error = np.abs(approx - exact)[ok]
+                rows.append(
+                    {
+                        "pair": pair,
+                        "output": name,
+                        "max_abs_error": float(error.max(initial=0.0)),
+                        "max_rel_error": float(
+                            (error / np.maximum(np.abs(exact[ok]), 1e-12)).max(
+                                initial=0.0
+                            )
+                        ),
+                        "points_out_of_tolerance": int((~ok).sum()),
+                    }
+                )
+        return rows
@@ -0,0 +1,172 @@
+"""
+Brayton cycle with any number of intercooled compressor stages and
+reheated turbine stages.
+
+`multistage_cycle_batch` generalizes brayton_cycle_batch (two stages each,
+split at sqrt(Pr)) to N compressor and M turbine stages with equal stage
+pressure ratios, per-stage efficiencies and an optional regenerator. All
+stages of a compressor or turbine stack are evaluated together: their
+states are stacked along a leading stage axis and solved with one
+evaluate_array call per state kind, so a 6+6 stage cycle costs the same
+number of property calls as a 1+1 stage one.
+"""
+
+import numpy as np
+
+from thermo.brayton import METRICS_DTYPE, STATE_DTYPE
+from thermo.properties import evaluate_array
+from thermo.states import CycleStates
+
+
+def multistage_state_labels(n_compressor, n_turbine, regenerator=True):
+    """
+    State labels of a multistage cycle: "c{k}", "c{k}s", "c{k}a" for the
+    inlet, isentropic and actual outlet of compressor stage k, "t{k}",
+    "t{k}s", "t{k}a" for turbine stage k, then "regen" (combustor inlet
+    after the regenerator) and "exhaust" when there is a regenerator.
+    With 2+2 stages these are states 1 to 10 of brayton_cycle_analysis.
+    """
+    labels = []
+    for prefix, n in (("c", n_compressor), ("t", n_turbine)):
+        for k in range(1, n + 1):
+            labels += [f"{prefix}{k}", f"{prefix}{k}s", f"{prefix}{k}a"]
+    if regenerator:
+        labels += ["regen", "exhaust"]
+    return tuple(labels)
+
+
+def _per_stage(value, n, name):
+    """One value per stage from a scalar or a sequence of length n."""
+    if np.ndim(value) == 0:
+        return [value] * n
+    if len(value) != n:
+        raise ValueError(f"{name} needs one value per stage ({n}), got {len(value)}")
+    return list(value)
+
+
+def _stage_states(T, P, fluid, abstract_state, work, efficiency, P_out):
+    """
+    Inlet, isentropic outlet and actual outlet of a stack of stages; the
+    leading axis of every array is the stage.
+    """
+    h_in, s_in = evaluate_array("TP", T, P, fluid, abstract_state)
+    T_s, h_s = evaluate_array("Ps", P_out, s_in, fluid, abstract_state)
+    h_a = work(h_in, h_s, efficiency)
+    T_a, s_a = evaluate_array("hP", h_a, P_out, fluid, abstract_state)
+    return (
+        {"T": T, "P": P, "h": h_in, "s": s_in},
+        {"T": T_s, "P": P_out, "h": h_s, "s": s_in},
+        {"T": T_a, "P": P_out, "h": h_a, "s": s_a},
+    )
+
+
+def multistage_cycle_batch(
+    T1,
+    P1,
+    Pr,
+    T_inlet,
+    fluid,
+    n_compressor=2,
+    n_turbine=2,
+    eff_compressor=0.88,
+    eff_turbine=0.92,
+    effectiveness=0.9,
+    abstract_state=None,
+):
+    """
+    Solve a Brayton cycle with `n_compressor` intercooled compressor stages
+    and `n_turbine` reheated turbine stages for broadcastable input arrays
+    (like brayton_cycle_batch).
+
+    Every stage has the pressure ratio Pr**(1/n); intercooling returns the
+    air to T1 and reheating to T_inlet. `eff_compressor` and `eff_turbine`
+    are scalars or sequences with one (broadcastable) value per stage.
+    `effectiveness=None` leaves out the regenerator.
+
+    Returns {"states": CycleStates (labels from multistage_state_labels),
+    "metrics": METRICS_DTYPE structured array}.
+    """
+    regenerator = effectiveness is not None
+    eff_c = _per_stage(eff_compressor, n_compressor, "eff_compressor")
+    eff_t = _per_stage(eff_turbine, n_turbine, "eff_turbine")
+    T1, P1, Pr, T_inlet = (np.asarray(x, dtype=float) for x in (T1, P1, Pr, T_inlet))
+    shape = np.broadcast_shapes(
+        *(np.shape(x) for x in [T1, P1, Pr, T_inlet, *eff_c, *eff_t]),
+        np.shape(effectiveness) if regenerator else (),
+    )
+
+    def _stack(values):
+        # (n_stages, *shape) array from per-stage values
+        return np.stack([np.broadcast_to(v, shape) for v in values]).astype(float)
+
+    # Compressors: inlet pressures P1 * r**k, all inlets at T1
+    stages_c = np.arange(n_compressor).reshape((-1,) + (1,) * len(shape))
+    ratio_c = Pr ** (1.0 / n_compressor)
+    P_c = np.broadcast_to(P1 * ratio_c**stages_c, (n_compressor,) + shape)
+    compressor = _stage_states(
+        np.broadcast_to(T1, P_c.shape),
+        P_c,
+        fluid,
+        abstract_state,
+        lambda h_in, h_s, eff: h_in + (h_s - h_in) / eff,
+        _stack(eff_c),
+        P_c * ratio_c,
+    )
+
+    # Turbines: expand from P1 * Pr back to P1, all inlets at T_inlet
+    stages_t = np.arange(n_turbine).reshape((-1,) + (1,) * len(shape))
+    ratio_t = Pr ** (1.0 / n_turbine)
+    P_t = np.broadcast_to(P1 * Pr / ratio_t**stages_t, (n_turbine,) + shape)
+    turbine = _stage_states(
+        np.broadcast_to(T_inlet, P_t.shape),
+        P_t,
+        fluid,
+        abstract_state,
+        lambda h_in, h_s, eff: h_in - eff * (h_in - h_s),
+        _stack(eff_t),
+        P_t / ratio_t,
+    )
+
+    h_c_in, h_c_out = compressor[0]["h"], compressor[2]["h"]
+    h_t_in, h_t_out = turbine[0]["h"], turbine[2]["h"]
+    extra = {}
+    h_combustor_in = h_c_out[-1]
+    exhaust_T = turbine[2]["T"][-1]
+    if regenerator:
+        P_high = P1 * Pr
+        h_regen = h_c_out[-1] + effectiveness * (h_t_out[-1] - h_c_out[-1])
+        T_regen, s_regen = evaluate_array("hP", h_regen, P_high, fluid, abstract_state)
+        h_exhaust = h_t_out[-1] - (h_regen - h_c_out[-1])
+        T_exhaust, s_exhaust = evaluate_array(
+            "hP", h_exhaust, P1, fluid, abstract_state
+        )
+        extra["regen"] = {"T": T_regen, "P": P_high, "h": h_regen, "s": s_regen}
+        extra["exhaust"] = {"T": T_exhaust, "P": P1, "h": h_exhaust, "s": s_exhaust}
+        h_combustor_in = h_regen
+        exhaust_T = T_exhaust
+
+    w_comp = np.sum(h_c_out - h_c_in, axis=0)
+    w_turb = np.sum(h_t_in - h_t_out, axis=0)
+    w_net = w_turb - w_comp
+    q_in = (h_t_in[0] - h_combustor_in) + np.sum(h_t_in[1:] - h_t_out[:-1], axis=0)
+
+    labels = multistage_state_labels(n_compressor, n_turbine, regenerator)
+    dtype = np.dtype([(label, STATE_DTYPE) for label in labels])
+    states = np.empty(shape, dtype=dtype)
+    for prefix, stack in (("c", compressor), ("t", turbine)):
+        for k in range(len(stack[0]["P"])):
+            for suffix, state in zip(("", "s", "a"), stack):
+                for prop in STATE_DTYPE.names:
+                    states[f"{prefix}{k + 1}{suffix}"][prop] = state[prop][k]
+    for label, state in extra.items():
+        for prop in STATE_DTYPE.names:
+            states[label][prop] = state[prop]
+
+    metrics = np.empty(shape, dtype=METRICS_DTYPE)
+    metrics["w_net"] = w_net
+    metrics["q_in"] = q_in
+    metrics["thermal_eff"] = (w_net / q_in) * 100
+    metrics["back_work_ratio"] = w_comp / w_turb
+    metrics["exhaust_gas_temperature"] = exhaust_T
+
+    return {"states": CycleStates(states, fluid), "metrics": metrics}
@@ -0,0 +1,179 @@
+"""
+Opt-in instrumentation of property evaluations and cycle functions.
+
+Inside `with profile() as profiler:` every property evaluation made by
+this process is counted and timed by (outputs, input pair, fluid,
+source), where the source is "exact" (CoolProp AbstractState updates),
+"tabular" (thermo.tables splines), "ideal" (thermo.idealgas polynomials)
+or "cache" (PropertyCache hits).
+Functions decorated with `profiled` and blocks wrapped in `span` (e.g.
+the states of brayton_cycle_analysis) are timed as nested spans, so the
+time of each state and each CoolProp call can be attributed to its
+callers. Results are available as table rows (`call_table`,
+`span_table`) and as collapsed stacks for flamegraph.pl or speedscope
+(`write_flamegraph`). Outside a profile block the hooks cost one
+`active_profiler()` call each.
+
+Work done in other processes (parallel sweeps, batch runs) is not seen.
+"""
+
+import contextlib
+import functools
+import time
+
+# The active Profiler, if any; see active_profiler
+_profiler = None
+
+# Outputs read for each input pair of thermo.properties.INPUT_PAIRS
+_PAIR_OUTPUTS = {"TP": "h,s", "Ps": "T,h", "hP": "T,s"}
+
+CALL_PREFIX = "CoolProp"
+
+
+class Profiler:
+    """Counts and timings collected by one `profile()` block."""
+
+    def __init__(self):
+        # (outputs, pair, fluid, source) -> [calls, points, seconds]
+        self.calls = {}
+        # call stack (tuple of names) -> [count, inclusive seconds]
+        self.spans = {}
+        self._stack = []
+
+    def record_call(self, pair, fluid, source, points, seconds, outputs=None):
+        """
+        Count one property call of `points` states taking `seconds`;
+        `outputs` defaults to those of `pair` in INPUT_PAIRS.
+        """
+        key = (outputs or _PAIR_OUTPUTS.get(pair, "?"), pair, fluid, source)
+        entry = self.calls.setdefault(key, [0, 0, 0.0])
+        entry[0] += 1
+        entry[1] += points
+        entry[2] += seconds
+        leaf = f"{CALL_PREFIX} {pair} {fluid} ({source})"
+        self._add_span(tuple(self._stack) + (leaf,), seconds)
+
+    def _add_span(self, stack, seconds):
+        entry = self.spans.setdefault(stack, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    @contextlib.contextmanager
+    def span(self, name):
+        self._stack.append(name)
+        stack = tuple(self._stack)
+        # Register on entry so that spans are listed in call order
+        self.spans.setdefault(stack, [0, 0.0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_span(stack, time.perf_counter() - start)
+            self._stack.pop()
+
+    def _self_times(self):
+        self_times = {stack: entry[1] for stack, entry in self.spans.items()}
+        for stack, entry in self.spans.items():
+            parent = stack[:-1]
+            if parent in self_times:
+                self_times[parent] -= entry[1]
+        return self_times
+
+    def call_table(self):
+        """
+        One row per (outputs, input pair, fluid, source), slowest first.
+        """
+        rows = [
+            {
+                "outputs": outputs,
+                "input_pair": pair,
+                "fluid": fluid,
+                "source": source,
+                "calls": calls,
+                "points": points,
+                "total_ms": seconds * 1e3,
+                "us_per_point": seconds * 1e6 / max(points, 1),
+            }
+            for (outputs, pair, fluid, source), (calls, points, seconds) in (
+                self.calls.items()
+            )
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def span_table(self):
+        """
+        One row per profiled function or block (CoolProp calls excluded),
+        with inclusive and self time, in call order.
+        """
+        self_times = self._self_times()
+        return [
+            {
+                "span": " > ".join(stack),
+                "count": count,
+                "total_ms": seconds * 1e3,
+                "self_ms": self_times[stack] * 1e3,
+            }
+            for stack, (count, seconds) in self.spans.items()
+            if not stack[-1].startswith(CALL_PREFIX)
+        ]
+
+    def collapsed_stacks(self):
+        """
+        Lines "caller;callee;... microseconds" of self time, the input
+        format of flamegraph.pl and speedscope.
+        """
+        return [
+            f"{';'.join(stack)} {round(seconds * 1e6)}"
+            for stack, seconds in self._self_times().items()
+            if seconds > 0
+        ]
+
+    def write_flamegraph(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+
+@contextlib.contextmanager
+def profile(profiler=None):
+    """
+    Collect property calls and spans inside a with block; yields the
+    Profiler (a new one unless `profiler` is given to accumulate into).
+    """
+    global _profiler
+    previous = _profiler
+    _profiler = profiler if profiler is not None else Profiler()
+    try:
+        yield _profiler
+    finally:
+        _profiler = previous
+
+
+def active_profiler():
+    """The Profiler of the enclosing profile() block, or None."""
+    return _profiler
+
+
+def span(name):
+    """Time a block as `name` when profiling, otherwise do nothing."""
+    if _profiler is None:
+        return contextlib.nullcontext()
+    return _profiler.span(name)
+
+
+def profiled(func=None, name=None):
+    """
+    Decorator timing every call of a function as a span, under its own
+    name unless `name` is given.
+    """
+    if func is None:
+        return functools.partial(profiled, name=name)
+    label = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _profiler is None:
+            return func(*args, **kwargs)
+        with _profiler.span(label):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,488 @@
+"""
+CoolProp state evaluation with a shared, bounded property cache.
+
+Every state helper goes through ``property_cache`` so that repeated
+evaluations (slider moves, parameter sweeps) are answered from memory.
+Exact evaluations use one CoolProp AbstractState per fluid (and thread):
+each state is a single ``update`` call from which every needed output is
+read, instead of one ``PropsSI`` call (fluid lookup plus EOS solve) per
+output.
+
+Properties come from one of the PROPERTY_BACKENDS:
+
+- "exact": CoolProp's Helmholtz equation of state.
+- "tabular": bicubic tables fitted to the exact EOS (thermo.tables),
+  with exact evaluation for states outside the tables, and for every
+  state (with a warning) when a table misses its error bounds.
+- "ideal": NASA-polynomial ideal-gas model (thermo.idealgas), with exact
+  evaluation for states where it is out of tolerance.
+- "auto" (default): exact for single states, tabular for array
+  evaluations of at least TABULAR_MIN_POINTS states.
+"""
+
+import atexit
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict, namedtuple
+
+import CoolProp
+import CoolProp.CoolProp as CP
+import numpy as np
+
+from thermo import profiling
+
+# input pair -> (outputs, first input, second input) as CoolProp names
+INPUT_PAIRS = {
+    "TP": (("H", "S"), "T", "P"),
+    "Ps": (("T", "H"), "P", "S"),
+    "hP": (("T", "S"), "H", "P"),
+}
+
+PROPERTY_BACKENDS = ("exact", "tabular", "ideal", "auto")
+
+# Backends that evaluate arrays with a model and fall back to the EOS
+_MODEL_BACKENDS = ("tabular", "ideal")
+
+# Array evaluations below this size are not worth a table lookup in "auto"
+TABULAR_MIN_POINTS = 256
+
+# Bumped whenever the layout of saved cache files changes
+CACHE_FORMAT = 2
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "thermo", "property_cache.npz"
+)
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_backend = {"name": "auto", "table_options": {}}
+_tables = {}
+_ideal_gas_models = {}
+
+
+def set_property_backend(name, **table_options):
+    """
+    Select the property backend used by the state helpers, evaluate_array
+    and everything built on them. `table_options` are passed on to
+    thermo.tables.PropertyTable (grid, ranges, error bounds), or to
+    thermo.idealgas.IdealGasModel (ranges, tolerances) for "ideal".
+    """
+    if name not in PROPERTY_BACKENDS:
+        raise ValueError(
+            f"Unknown property backend {name!r}, expected one of {PROPERTY_BACKENDS}"
+        )
+    _backend["name"] = name
+    _backend["table_options"] = dict(table_options)
+
+
+def get_property_backend():
+    """Return the active backend as (name, table_options)."""
+    return _backend["name"], dict(_backend["table_options"])
+
+
+@contextlib.contextmanager
+def use_property_backend(name, **table_options):
+    """Temporarily switch the property backend inside a with block."""
+    previous = get_property_backend()
+    set_property_backend(name, **table_options)
+    try:
+        yield
+    finally:
+        set_property_backend(previous[0], **previous[1])
+
+
+def get_property_table(fluid, **table_options):
+    """
+    Bicubic property table for `fluid`, built (or loaded from disk) on
+    first use and kept for the rest of the session.
+    """
+    from thermo.tables import PropertyTable
+
+    options = {**_backend["table_options"], **table_options}
+    key = (fluid, tuple(sorted(options.items())))
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = PropertyTable(fluid, **options)
+    return table
+
+
+def get_ideal_gas_model(fluid, **options):
+    """
+    NASA-polynomial ideal-gas model of `fluid`, fitted on first use and
+    kept for the rest of the session.
+    """
+    from thermo.idealgas import IdealGasModel
+
+    if _backend["name"] == "ideal":
+        options = {**_backend["table_options"], **options}
+    key = (fluid, tuple(sorted(options.items())))
+    model = _ideal_gas_models.get(key)
+    if model is None:
+        model = _ideal_gas_models[key] = IdealGasModel(fluid, **options)
+    return model
+
+
+def quantize(x, digits):
+    """
+    Round x to the given number of significant digits.
+    digits=None leaves the value untouched.
+    """
+    x = float(x)
+    if digits is None or x == 0 or not math.isfinite(x):
+        return x
+    return round(x, digits - 1 - math.floor(math.log10(abs(x))))
+
+
+_abstract_states = threading.local()
+
+
+def get_abstract_state(fluid):
+    """
+    CoolProp HEOS AbstractState for `fluid`, created on first use and
+    reused for every later evaluation in the same thread.
+    """
+    states = _abstract_states.__dict__.setdefault("by_fluid", {})
+    state = states.get(fluid)
+    if state is None:
+        state = states[fluid] = CoolProp.AbstractState("HEOS", fluid)
+    return state
+
+
+# State inputs accepted by get_state_properties -> CoolProp parameter index
+_STATE_INPUTS = {
+    "T": CP.iT,
+    "P": CP.iP,
+    "h": CP.iHmass,
+    "s": CP.iSmass,
+    "Q": CP.iQ,
+}
+
+
+def get_state_properties(fluid, **inputs):
+    """
+    Evaluates a state from any two of T, P, h, s and Q with a single
+    AbstractState update, e.g. get_state_properties("Water", P=8000, Q=0).
+    Returns a dictionary of properties (plus "Q" when it was an input).
+    """
+    if len(inputs) != 2 or not set(inputs) <= set(_STATE_INPUTS):
+        raise ValueError(
+            f"Expected exactly two of {tuple(_STATE_INPUTS)}, got {tuple(inputs)}"
+        )
+    (key1, value1), (key2, value2) = inputs.items()
+    pair, value1, value2 = CP.generate_update_pair(
+        _STATE_INPUTS[key1], value1, _STATE_INPUTS[key2], value2
+    )
+    profiler = profiling.active_profiler()
+    if profiler is not None:
+        start = time.perf_counter()
+    state = get_abstract_state(fluid)
+    state.update(pair, value1, value2)
+    if profiler is not None:
+        profiler.record_call(
+            "".join(inputs), fluid, "exact", 1, time.perf_counter() - start, "T,P,h,s"
+        )
+    properties = {
+        "T": state.T(),
+        "P": state.p(),
+        "h": state.hmass(),
+        "s": state.smass(),
+        "fluid": fluid,
+    }
+    if "Q" in inputs:
+        properties["Q"] = state.Q()
+    return properties
+
+
+def _evaluate(pair, a, b, fluid):
+    if _backend["name"] in _MODEL_BACKENDS:
+        return tuple(float(x) for x in evaluate_array(pair, a, b, fluid))
+    profiler = profiling.active_profiler()
+    if profiler is None:
+        return update_state(get_abstract_state(fluid), pair, a, b)
+    start = time.perf_counter()
+    value = update_state(get_abstract_state(fluid), pair, a, b)
+    profiler.record_call(pair, fluid, "exact", 1, time.perf_counter() - start)
+    return value
+
+
+def update_state(state, pair, a, b):
+    """
+    Update a CoolProp AbstractState with one input pair and read both
+    outputs of `pair` from it.
+    """
+    if pair == "TP":
+        state.update(CoolProp.PT_INPUTS, b, a)
+        return state.hmass(), state.smass()
+    if pair == "Ps":
+        state.update(CoolProp.PSmass_INPUTS, a, b)
+        return state.T(), state.hmass()
+    state.update(CoolProp.HmassP_INPUTS, a, b)
+    return state.T(), state.smass()
+
+
+def evaluate_array(pair, a, b, fluid, abstract_state=None, backend=None):
+    """
+    Vectorized counterpart of PropertyCache.lookup.
+
+    `a` and `b` are broadcast against each other and evaluated with the
+    active property backend, or with `backend` when given (e.g. "exact"
+    for states near a phase boundary, which the tables do not resolve).
+    Exact evaluations solve each distinct (a, b) pair once with a single
+    AbstractState update, using `abstract_state` when given and the shared
+    one from get_abstract_state otherwise. Returns the two outputs of
+    `pair` as arrays of the broadcast shape; states that cannot be solved
+    come back as inf/nan.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    if backend is None:
+        backend = _backend["name"]
+    if backend == "auto":
+        backend = "tabular" if a.size >= TABULAR_MIN_POINTS else "exact"
+    if backend in _MODEL_BACKENDS:
+        profiler = profiling.active_profiler()
+        if profiler is not None:
+            start = time.perf_counter()
+        if backend == "ideal":
+            model = get_ideal_gas_model(fluid)
+        else:
+            model = get_property_table(fluid)
+            if not model.within_tolerance:
+                warnings.warn(
+                    f"Property table of {fluid} misses its error bounds (grid "
+                    f"error {model.grid_error}, h_tol {model.h_tol}, s_tol "
+                    f"{model.s_tol}); evaluating with the exact EOS",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                return _evaluate_exact_array(pair, a, b, fluid, abstract_state)
+        first, second, ok = model.evaluate(pair, a, b)
+        if profiler is not None:
+            profiler.record_call(
+                pair, fluid, backend, a.size, time.perf_counter() - start
+            )
+        missing = ~ok & np.isfinite(a) & np.isfinite(b)
+        if missing.any():
+            first[missing], second[missing] = _evaluate_exact_array(
+                pair, a[missing], b[missing], fluid, abstract_state
+            )
+        return first, second
+    return _evaluate_exact_array(pair, a, b, fluid, abstract_state)
+
+
+def _evaluate_exact_array(pair, a, b, fluid, abstract_state):
+    shape = a.shape
+    if a.size == 0:
+        return np.empty(shape), np.empty(shape)
+    inputs = np.stack([a.ravel(), b.ravel()], axis=1)
+    unique_inputs, inverse = np.unique(inputs, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    profiler = profiling.active_profiler()
+    if profiler is not None:
+        start = time.perf_counter()
+    if abstract_state is None:
+        abstract_state = get_abstract_state(fluid)
+    values = np.full((len(unique_inputs), 2), np.nan)
+    for i, (ua, ub) in enumerate(unique_inputs):
+        try:
+            values[i] = update_state(abstract_state, pair, ua, ub)
+        except ValueError:
+            pass
+    if profiler is not None:
+        profiler.record_call(
+            pair, fluid, "exact", len(unique_inputs), time.perf_counter() - start
+        )
+    return tuple(values[inverse, k].reshape(shape) for k in range(2))
+
+
+class PropertyCache:
+    """
+    LRU cache of state evaluations keyed by (backend, fluid, input pair,
+    inputs).
+
+    Inputs are rounded to `digits` significant digits before lookup, so
+    states that differ only by floating point noise (e.g. sqrt(Pr) * P1)
+    share an entry. The properties are evaluated at the rounded inputs,
+    which keeps the cached values independent of evaluation order.
+    """
+
+    def __init__(self, maxsize=65536, digits=9, path=None):
+        self.maxsize = maxsize
+        self.digits = digits
+        self.path = None
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            self.persist(path)
+
+    def __len__(self):
+        return len(self._data)
+
+    def lookup(self, pair, a, b, fluid):
+        """
+        Return the two outputs of `pair` (see INPUT_PAIRS) at inputs (a, b).
+        """
+        qa = quantize(a, self.digits)
+        qb = quantize(b, self.digits)
+        backend = _backend["name"]
+        if backend not in _MODEL_BACKENDS:
+            backend = "exact"
+        key = (backend, fluid, pair, qa, qb)
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                profiler = profiling.active_profiler()
+                if profiler is not None:
+                    profiler.record_call(pair, fluid, "cache", 1, 0.0)
+                return value
+            self.misses += 1
+
+        value = _evaluate(pair, qa, qb, fluid)
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path=None):
+        """
+        Write the cached entries to disk (defaults to the persisted path).
+
+        The file is an .npz of plain arrays: the inputs and outputs of
+        every entry and the index of the rest of its key (backend, fluid,
+        input pair) in a JSON header, so loading never unpickles anything.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given to save the property cache to")
+        with self._lock:
+            entries = list(self._data.items())
+        groups = sorted({key[:-2] for key, _ in entries})
+        group_index = {group: i for i, group in enumerate(groups)}
+        header = {
+            "format": CACHE_FORMAT,
+            "coolprop": CoolProp.__version__,
+            "digits": self.digits,
+            "groups": groups,
+        }
+        tmp_path = f"{path}.tmp.npz"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            tmp_path,
+            header=np.array(json.dumps(header)),
+            group=np.array([group_index[key[:-2]] for key, _ in entries], dtype=int),
+            inputs=np.array([key[-2:] for key, _ in entries], dtype=float).reshape(
+                -1, 2
+            ),
+            outputs=np.array([value for _, value in entries], dtype=float).reshape(
+                -1, 2
+            ),
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Merge entries saved by `save`. Unreadable files and files written
+        in another format, by another CoolProp version or with a different
+        quantization are ignored.
+        Returns the number of entries loaded.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                header = json.loads(str(data["header"]))
+                if (
+                    header.get("format") != CACHE_FORMAT
+                    or header.get("coolprop") != CoolProp.__version__
+                    or header.get("digits") != self.digits
+                ):
+                    return 0
+                groups = [tuple(group) for group in header["groups"]]
+                group, inputs, outputs = data["group"], data["inputs"], data["outputs"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            # Missing, truncated or foreign files (including old pickles)
+            return 0
+        entries = [
+            (groups[g] + (float(a), float(b)), (float(first), float(second)))
+            for g, (a, b), (first, second) in zip(group.tolist(), inputs, outputs)
+        ]
+        if self.maxsize is not None:
+            entries = entries[-self.maxsize :]
+        with self._lock:
+            for key, value in entries:
+                self._data.setdefault(key, value)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return len(entries)
+
+    def persist(self, path=DEFAULT_CACHE_PATH):
+        """
+        Load previously saved entries from `path` (by default in the user
+        cache directory) and save back to it when the interpreter exits,
+        so the cache survives between sessions.
+        """
+        path = os.fspath(path)
+        if self.path is None:
+            atexit.register(self._save_at_exit)
+        self.path = path
+        return self.load(path)
+
+    def _save_at_exit(self):
+        try:
+            self.save()
+        except OSError:
+            pass
+
+
+# Shared cache used by the state helpers below
+property_cache = PropertyCache()
+
+
+def _cache(cache):
+    return property_cache if cache is None else cache
+
+
+def get_state_properties_from_TP(T, P, fluid, cache=None):
+    """
+    Evaluates state properties given Temperature and Pressure.
+    Returns a dictionary of properties.
+    """
+    h, s = _cache(cache).lookup("TP", T, P, fluid)
+    return {"T": T, "P": P, "h": h, "s": s, "fluid": fluid}
+
+
+def get_state_properties_from_Ps(P, s, fluid, cache=None):
+    """
+    Evaluates state properties given Pressure and Entropy.
+    Returns a dictionary of properties.
+    """
+    T, h = _cache(cache).lookup("Ps", P, s, fluid)
+    return {"T": T, "P": P, "h": h, "s": s, "fluid": fluid}
+
+
+def get_state_properties_from_hP(h, P, fluid, cache=None):
+    """
+    Evaluates state properties given Enthalpy and Pressure.
+    Returns a dictionary of properties.
+    """
+    T, s = _cache(cache).lookup("hP", h, P, fluid)
+    return {"T": T, "P": P, "h": h, "s": s, "fluid": fluid}
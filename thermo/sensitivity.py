@@ -0,0 +1,170 @@
+"""
+Local and global sensitivity of the Brayton cycle outputs to its inputs.
+
+`local_sensitivity` differentiates the cycle metrics with respect to
+every numeric input (T1, P1, Pr, T5 and the component efficiencies) by
+finite differences; all perturbed points go to brayton_cycle_batch as
+one batch. `sobol_indices` estimates first-order and total Sobol indices
+from Saltelli's sampling scheme, with inputs given as distributions like
+in thermo.uncertainty; the N * (d + 2) cycles are solved together by
+thermo.batch.solve_cycle_arrays, on a process pool when it pays off.
+"""
+
+import numpy as np
+from scipy import stats
+
+from thermo.batch import solve_cycle_arrays
+from thermo.uncertainty import CYCLE_INPUTS, complete_inputs, is_distribution
+
+SENSITIVITY_OUTPUTS = ("thermal_eff", "w_net", "exhaust_gas_temperature")
+
+
+def local_sensitivity(
+    point, fluid="Air", outputs=SENSITIVITY_OUTPUTS, rel_step=1e-4, central=True
+):
+    """
+    Finite-difference Jacobian of `outputs` at an operating point (a dict
+    of CYCLE_INPUTS values; Pr and T5 required, the others default to
+    CASE_DEFAULTS). Every input is perturbed by rel_step times its value,
+    on both sides with `central`, and the 1 + (2 or 1) * 7 points are
+    solved in one batch.
+
+    Returns {"inputs": input names, "outputs": output names, "value":
+    outputs at the point, "jacobian": d output / d input (outputs x
+    inputs), "elasticity": (x / y) dy/dx, the relative change of each
+    output per relative change of each input}.
+    """
+    point = complete_inputs(point)
+    x0 = np.array([float(point[name]) for name in CYCLE_INPUTS])
+    steps = rel_step * np.maximum(np.abs(x0), 1e-12)
+    offsets = [np.diag(steps)]
+    if central:
+        offsets.append(-np.diag(steps))
+    x = np.vstack([x0[None, :], *(x0 + offset for offset in offsets)])
+
+    metrics = solve_cycle_arrays(dict(zip(CYCLE_INPUTS, x.T)), fluid, max_workers=1)
+    d = len(CYCLE_INPUTS)
+    y = np.stack([metrics[name] for name in outputs])
+    y0 = y[:, 0]
+    if central:
+        jacobian = (y[:, 1 : d + 1] - y[:, d + 1 :]) / (2 * steps)
+    else:
+        jacobian = (y[:, 1:] - y0[:, None]) / steps
+    with np.errstate(divide="ignore", invalid="ignore"):
+        elasticity = jacobian * x0[None, :] / y0[:, None]
+    return {
+        "inputs": CYCLE_INPUTS,
+        "outputs": tuple(outputs),
+        "value": dict(zip(outputs, y0)),
+        "jacobian": jacobian,
+        "elasticity": elasticity,
+    }
+
+
+def _saltelli_indices(f_A, f_B, f_AB):
+    """
+    First-order (Saltelli 2010) and total (Jansen) indices from the model
+    outputs on A, B and the d matrices AB_i; f_AB has shape (d, N).
+
+    The outputs are centred first, as in SALib: the first-order estimator
+    is unbiased either way, but its variance grows with the squared mean,
+    which makes the bootstrap intervals meaningless for outputs far from
+    zero such as the efficiency in percent.
+    """
+    f = np.concatenate([f_A, f_B])
+    mean = f.mean()
+    f_A, f_B, f_AB = f_A - mean, f_B - mean, f_AB - mean
+    variance = np.var(f)
+    first = np.mean(f_B * (f_AB - f_A), axis=1) / variance
+    total = 0.5 * np.mean((f_A - f_AB) ** 2, axis=1) / variance
+    return first, total
+
+
+def _half_width(bootstrap, tail):
+    low, high = np.quantile(bootstrap, [tail, 1 - tail], axis=0)
+    return 0.5 * (high - low)
+
+
+def sobol_indices(
+    inputs,
+    fluid="Air",
+    outputs=SENSITIVITY_OUTPUTS,
+    n_base=1024,
+    seed=0,
+    n_bootstrap=200,
+    confidence=0.95,
+    max_workers=None,
+    chunk_size=20_000,
+    store=None,
+):
+    """
+    First-order and total Sobol indices of `outputs` by Saltelli
+    sampling.
+
+    `inputs` maps CYCLE_INPUTS to distributions (anything with a `ppf`)
+    or constants, as for thermo.uncertainty.propagate_uncertainty; only
+    the distributions are factors. `n_base` scrambled Sobol' points (a
+    power of two) give n_base * (d + 2) cycle solves. Confidence
+    intervals are bootstrap percentiles over the base samples.
+
+    Returns {"factors": factor names, "evaluations": cycles solved,
+    "failed": base samples left out because one of their cycles has no
+    feasible solution, output name: {"S1", "ST",
+    "S1_conf", "ST_conf"} arrays over the factors, the conf entries being
+    half widths of the `confidence` interval}.
+    """
+    inputs = complete_inputs(inputs)
+    factors = [name for name in CYCLE_INPUTS if is_distribution(inputs[name])]
+    d = len(factors)
+    if d == 0:
+        raise ValueError("No input is given as a distribution")
+
+    uniform = stats.qmc.Sobol(d=2 * d, scramble=True, seed=seed).random(n_base)
+    A = np.column_stack(
+        [inputs[name].ppf(uniform[:, k]) for k, name in enumerate(factors)]
+    )
+    B = np.column_stack(
+        [inputs[name].ppf(uniform[:, d + k]) for k, name in enumerate(factors)]
+    )
+    AB = np.repeat(A[None, :, :], d, axis=0)
+    for k in range(d):
+        AB[k, :, k] = B[:, k]
+    samples = np.concatenate([A, B, AB.reshape(-1, d)])
+
+    n = len(samples)
+    batch = {
+        name: np.broadcast_to(np.asarray(value, dtype=float), (n,))
+        for name, value in inputs.items()
+        if name not in factors
+    }
+    batch.update({name: samples[:, k] for k, name in enumerate(factors)})
+    metrics = solve_cycle_arrays(
+        batch, fluid, max_workers=max_workers, chunk_size=chunk_size, store=store
+    )
+
+    # Base samples whose cycles all solved; the estimators pair A, B and AB_i
+    values = {name: metrics[name].reshape(d + 2, n_base) for name in outputs}
+    valid = np.all([np.isfinite(v).all(axis=0) for v in values.values()], axis=0)
+    rng = np.random.default_rng(seed)
+    tail = (1 - confidence) / 2
+    results = {
+        "factors": tuple(factors),
+        "evaluations": n,
+        "failed": int(n_base - valid.sum()),
+    }
+    for name, v in values.items():
+        v = v[:, valid]
+        f_A, f_B, f_AB = v[0], v[1], v[2:]
+        first, total = _saltelli_indices(f_A, f_B, f_AB)
+        resampled = [
+            _saltelli_indices(f_A[i], f_B[i], f_AB[:, i])
+            for i in rng.integers(0, v.shape[1], (n_bootstrap, v.shape[1]))
+        ]
+        boot_first, boot_total = (np.array(x) for x in zip(*resampled))
+        results[name] = {
+            "S1": first,
+            "ST": total,
+            "S1_conf": _half_width(boot_first, tail),
+            "ST_conf": _half_width(boot_total, tail),
+        }
+    return results
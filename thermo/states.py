@@ -0,0 +1,185 @@
+"""
+Compact state records for cycle results.
+
+Cycle states are stored in one NumPy structured array with a (T, P, h, s)
+record per state label (see thermo.brayton.CYCLE_STATES_DTYPE), 32 bytes
+per state instead of a dict per state. `CycleStates` wraps that array for
+a single cycle or any batch of cycles and adds label-based access to all
+states at once, e.g. `states.T[:, "8a"]` or `states.s[..., ["1", "2s"]]`.
+The legacy nested dict form is available through `to_dict` and
+`from_dict`.
+"""
+
+import numpy as np
+
+PROPERTY_NAMES = ("T", "P", "h", "s")
+
+
+class LabelledArray:
+    """
+    One property of every state, shape (*cycles, n_states), where the last
+    axis can be indexed by state label as well as by position.
+    """
+
+    __slots__ = ("values", "labels", "_index")
+
+    def __init__(self, values, labels):
+        self.values = values
+        self.labels = labels
+        self._index = {label: i for i, label in enumerate(labels)}
+
+    def _position(self, key):
+        if isinstance(key, str):
+            return self._index[key]
+        if isinstance(key, (list, tuple)) and key and isinstance(key[0], str):
+            return [self._index[label] for label in key]
+        return key
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            key = key[:-1] + (self._position(key[-1]),)
+            if Ellipsis not in key and len(key) < self.values.ndim:
+                # A label always addresses the state axis
+                key = key[:-1] + (Ellipsis, key[-1])
+        else:
+            key = (Ellipsis, self._position(key))
+        return self.values[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.values, dtype=dtype)
+
+    def __repr__(self):
+        return f"LabelledArray(labels={self.labels}, values={self.values!r})"
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+
+class CycleStates:
+    """
+    States of one cycle (0-d) or a batch of cycles, backed by a structured
+    array of per-label (T, P, h, s) records.
+
+    states["8a"]["T"] gives the temperature of state 8a for every cycle (a
+    NumPy scalar for a single cycle), states.T[..., "8a"] the same through
+    the (cycles, labels) view, and indexing with anything but a label
+    (states[i, j]) selects cycles.
+    """
+
+    __slots__ = ("records", "fluid")
+
+    def __init__(self, records, fluid=None):
+        self.records = records
+        self.fluid = fluid
+
+    @classmethod
+    def from_dict(cls, states, fluid=None):
+        """Build from the legacy {label: {"T", "P", "h", "s", ...}} form."""
+        from thermo.brayton import CYCLE_STATES_DTYPE, STATE_DTYPE
+
+        dtype = CYCLE_STATES_DTYPE
+        if tuple(states) != dtype.names:
+            dtype = np.dtype([(label, STATE_DTYPE) for label in states])
+        records = np.empty((), dtype=dtype)
+        for label, state in states.items():
+            for prop in PROPERTY_NAMES:
+                records[label][prop] = state[prop]
+            fluid = fluid or state.get("fluid")
+        return cls(records, fluid)
+
+    def to_dict(self):
+        """
+        Legacy {label: {"T", "P", "h", "s", "fluid"}} form, with floats for
+        a single cycle and arrays for a batch.
+        """
+        single = self.records.ndim == 0
+        states = {}
+        for label in self.labels:
+            state = {}
+            for prop in PROPERTY_NAMES:
+                value = self.records[label][prop]
+                state[prop] = float(value) if single else value
+            state["fluid"] = self.fluid
+            states[label] = state
+        return states
+
+    @property
+    def labels(self):
+        return self.records.dtype.names
+
+    @property
+    def shape(self):
+        return self.records.shape
+
+    @property
+    def nbytes(self):
+        return self.records.nbytes
+
+    def _property(self, prop):
+        n_states = len(self.labels)
+        # Strided or fancy-indexed selections are copied first, since the
+        # float view needs contiguous records
+        flat = np.ascontiguousarray(self.records).reshape(-1).view(np.float64)
+        values = flat.reshape(self.shape + (n_states, len(PROPERTY_NAMES)))
+        return LabelledArray(values[..., PROPERTY_NAMES.index(prop)], self.labels)
+
+    @property
+    def T(self):
+        return self._property("T")
+
+    @property
+    def P(self):
+        return self._property("P")
+
+    @property
+    def h(self):
+        return self._property("h")
+
+    @property
+    def s(self):
+        return self._property("s")
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            # [()] turns a single cycle's 0-d record into a scalar record
+            return self.records[key][()]
+        return CycleStates(self.records[key], self.fluid)
+
+    def __setitem__(self, key, value):
+        if isinstance(value, CycleStates):
+            value = value.records
+        self.records[key] = value
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __contains__(self, label):
+        return label in self.labels
+
+    def keys(self):
+        return self.labels
+
+    def items(self):
+        return ((label, self[label]) for label in self.labels)
+
+    def __repr__(self):
+        return (
+            f"CycleStates(shape={self.shape}, labels={len(self.labels)}, "
+            f"fluid={self.fluid!r})"
+        )
+
+
+def as_cycle_states(states):
+    """
+    CycleStates for `states` given as CycleStates, a CYCLE_STATES_DTYPE
+    structured array or the legacy dict of state dicts.
+    """
+    if isinstance(states, CycleStates):
+        return states
+    if isinstance(states, np.ndarray):
+        return CycleStates(states)
+    return CycleStates.from_dict(states)
@@ -0,0 +1,136 @@
+"""
+Content-addressed on-disk store for sweep results.
+
+Each entry is a directory named after a hash of everything the result
+depends on (grid, fluid, efficiencies, inlet state, property backend and
+CoolProp version) holding one `.npy` file per array. Entries are loaded
+memory-mapped, so a stored efficiency map is back in milliseconds after a
+restart, and the least recently used entries are evicted once the store
+grows beyond its size limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import CoolProp
+import numpy as np
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "thermo", "results")
+
+# Bump when the layout of stored results changes
+STORE_FORMAT = 1
+
+
+def result_key(*arrays, **inputs):
+    """
+    Hash of the input arrays (values, dtype and shape) and the scalar
+    inputs, together with the CoolProp version and store format.
+    """
+    digest = hashlib.sha1()
+    header = dict(inputs, coolprop=CoolProp.__version__, format=STORE_FORMAT)
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """
+    Directory of stored results, at most `max_bytes` in total.
+
+    Entries are written to a temporary directory and renamed into place,
+    so concurrent readers never see partial results; an unwritable store
+    only means results are recomputed.
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, max_bytes=512 * 2**20):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, key):
+        """Stored arrays for `key` as read-only memory maps, or None."""
+        path = self._path(key)
+        try:
+            arrays = {
+                os.path.splitext(name)[0]: np.load(
+                    os.path.join(path, name), mmap_mode="r"
+                )
+                for name in os.listdir(path)
+                if name.endswith(".npy")
+            }
+            # Directory mtime marks the last use for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return arrays or None
+
+    def save(self, key, arrays):
+        """Store a dict of arrays under `key` and evict old entries."""
+        path = self._path(key)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            os.makedirs(tmp_path, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(array))
+            if os.path.exists(path):
+                shutil.rmtree(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        self.evict()
+
+    def entries(self):
+        """(last use, size in bytes, key) of every stored entry."""
+        try:
+            keys = [
+                key
+                for key in os.listdir(self.directory)
+                if ".tmp" not in key and os.path.isdir(self._path(key))
+            ]
+        except OSError:
+            return []
+        entries = []
+        for key in keys:
+            path = self._path(key)
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(path, name))
+                    for name in os.listdir(path)
+                )
+                entries.append((os.path.getmtime(path), size, key))
+            except OSError:
+                continue
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Remove the least recently used entries until within max_bytes."""
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    def __repr__(self):
+        return f"ResultStore({self.directory!r}, max_bytes={self.max_bytes})"
+
+
+result_store = ResultStore()
@@ -0,0 +1,251 @@
+"""
+Parallel (pressure ratio, turbine inlet temperature) sweeps.
+
+The grid is split into blocks of pressure-ratio rows that are solved with
+`brayton_cycle_batch` on a ProcessPoolExecutor; CoolProp holds the GIL, so
+threads would not help. Every worker keeps one warm CoolProp AbstractState
+for the working fluid, and each block is written back to its own rows, so
+the combined map does not depend on the order in which workers finish.
+Workers use the property backend that is active when the sweep starts.
+`cached_sweep_cycle` memoizes whole sweeps on their inputs, in memory and
+optionally in an on-disk ResultStore, so callers such as the notebook can
+ask for the same map again for free.
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import CoolProp
+import numpy as np
+
+from thermo.brayton import CYCLE_STATES_DTYPE, METRICS_DTYPE, brayton_cycle_batch
+from thermo.properties import (
+    get_abstract_state,
+    get_property_backend,
+    get_property_table,
+    set_property_backend,
+)
+from thermo.states import CycleStates
+from thermo.store import result_key
+
+SWEEP_CACHE_SIZE = 8
+
+# Recent sweeps keyed by their inputs, see cached_sweep_cycle
+_sweeps = OrderedDict()
+
+
+class SweepCancelled(Exception):
+    """Raised when a sweep is stopped through its cancel event."""
+
+
+# Per-process AbstractState, created once by init_worker
+_worker_state = None
+
+
+def init_worker(fluid, backend=None):
+    """
+    ProcessPoolExecutor initializer of the sweep workers: applies the
+    parent's property backend (name, options) and warms up the equation
+    of state of `fluid`.
+    """
+    global _worker_state
+    if backend is not None:
+        # Workers may not inherit module state from the parent process
+        set_property_backend(backend[0], **backend[1])
+    _worker_state = get_abstract_state(fluid)
+    # Warm up the equation of state before the first chunk arrives
+    _worker_state.update(CoolProp.PT_INPUTS, 101325, 300)
+
+
+def _solve_chunk(start, pr_chunk, t_inlet_range, fluid, eff_c, eff_t, eff_r, T1, P1):
+    if _worker_state is None:
+        init_worker(fluid)
+    results = brayton_cycle_batch(
+        T1=T1,
+        P1=P1,
+        Pr=pr_chunk[:, None],
+        T5=t_inlet_range[None, :],
+        fluid=fluid,
+        eff_compressor=eff_c,
+        eff_turbine=eff_t,
+        effectiveness=eff_r,
+        abstract_state=_worker_state,
+    )
+    return start, results["states"].records, results["metrics"]
+
+
+def chunk_bounds(n_rows, n_cols, chunk_points):
+    """
+    (start, stop) row ranges of whole rows with about `chunk_points`
+    points each. Chunking depends only on the grid, so the map is the same
+    for any number of workers.
+    """
+    rows = max(1, chunk_points // max(n_cols, 1))
+    return [(i, min(i + rows, n_rows)) for i in range(0, n_rows, rows)]
+
+
+def clear_sweep_cache():
+    """Forget the sweeps kept in memory by cached_sweep_cycle."""
+    _sweeps.clear()
+
+
+def parallel_sweep_cycle(
+    pr_range,
+    t_inlet_range,
+    fluid,
+    eff_c,
+    eff_t,
+    eff_r,
+    T1=300,
+    P1=101325,
+    max_workers=None,
+    chunk_points=2500,
+    progress=None,
+    cancel_event=None,
+):
+    """
+    Solve the full cycle over the (pressure ratio, turbine inlet
+    temperature) grid in parallel.
+
+    Returns {"states": ..., "metrics": ...} like brayton_cycle_batch, with
+    shape (len(pr_range), len(t_inlet_range)), so later analyses (e.g.
+    thermo.exergy.exergy_sweep) can reuse the solved states.
+
+    The grid is cut into chunks of about `chunk_points` points (whole
+    pressure-ratio rows). `max_workers` defaults to the number of CPUs; a
+    single chunk or a single worker is solved in-process without starting
+    a pool. `progress(done, total)` is called after every finished chunk,
+    and setting `cancel_event` (a threading.Event) stops the sweep,
+    cancels pending chunks and raises SweepCancelled.
+    """
+    pr_range = np.asarray(pr_range, dtype=float)
+    t_inlet_range = np.asarray(t_inlet_range, dtype=float)
+    workers = max_workers or os.cpu_count() or 1
+    bounds = chunk_bounds(len(pr_range), len(t_inlet_range), chunk_points)
+    shape = (len(pr_range), len(t_inlet_range))
+    states = np.empty(shape, dtype=CYCLE_STATES_DTYPE)
+    metrics = np.full(shape, np.nan, dtype=METRICS_DTYPE)
+    args = (t_inlet_range, fluid, eff_c, eff_t, eff_r, T1, P1)
+
+    def _check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise SweepCancelled("Cycle sweep cancelled")
+
+    def _store(start, block_states, block_metrics):
+        stop = start + block_metrics.shape[0]
+        states[start:stop] = block_states
+        metrics[start:stop] = block_metrics
+
+    if workers == 1 or len(bounds) <= 1:
+        for done, (start, stop) in enumerate(bounds, start=1):
+            _check_cancelled()
+            _store(*_solve_chunk(start, pr_range[start:stop], *args))
+            if progress is not None:
+                progress(done, len(bounds))
+        return {"states": CycleStates(states, fluid), "metrics": metrics}
+
+    backend = get_property_backend()
+    if backend[0] in ("tabular", "auto"):
+        # Build the property tables once here so workers only load them
+        get_property_table(fluid)
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(bounds)),
+        initializer=init_worker,
+        initargs=(fluid, backend),
+    )
+    try:
+        pending = {
+            executor.submit(_solve_chunk, start, pr_range[start:stop], *args)
+            for start, stop in bounds
+        }
+        done = 0
+        while pending:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            _check_cancelled()
+            for future in finished:
+                _store(*future.result())
+                done += 1
+                if progress is not None:
+                    progress(done, len(bounds))
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return {"states": CycleStates(states, fluid), "metrics": metrics}
+
+
+def parallel_sweep_efficiency(
+    pr_range, t_inlet_range, fluid, eff_c, eff_t, eff_r, T1=300, P1=101325, **kwargs
+):
+    """
+    Parallel version of sweep_efficiency: thermal efficiency (%) over the
+    grid. Keyword arguments are passed on to parallel_sweep_cycle.
+    """
+    results = parallel_sweep_cycle(
+        pr_range, t_inlet_range, fluid, eff_c, eff_t, eff_r, T1, P1, **kwargs
+    )
+    return results["metrics"]["thermal_eff"]
+
+
+def cached_sweep_cycle(
+    pr_range,
+    t_inlet_range,
+    fluid,
+    eff_c,
+    eff_t,
+    eff_r,
+    T1=300,
+    P1=101325,
+    store=None,
+    **kwargs,
+):
+    """
+    parallel_sweep_cycle memoized on the grid, the fixed cycle inputs and
+    the active property backend; the SWEEP_CACHE_SIZE most recent sweeps
+    are kept in memory. With a thermo.store.ResultStore as `store`, sweeps
+    are also kept on disk and memory-mapped back in later sessions.
+    Keyword arguments (workers, progress, cancellation) do not change the
+    result and are passed on to parallel_sweep_cycle on a miss. The
+    returned arrays are shared between callers and must not be modified in
+    place.
+    """
+    pr_range = np.asarray(pr_range, dtype=float)
+    t_inlet_range = np.asarray(t_inlet_range, dtype=float)
+    backend, options = get_property_backend()
+    key = result_key(
+        pr_range,
+        t_inlet_range,
+        kind="brayton_sweep",
+        fluid=fluid,
+        eff_c=eff_c,
+        eff_t=eff_t,
+        eff_r=eff_r,
+        T1=T1,
+        P1=P1,
+        backend=backend,
+        options=options,
+    )
+    if key in _sweeps:
+        _sweeps.move_to_end(key)
+        return _sweeps[key]
+
+    stored = store.load(key) if store is not None else None
+    if stored is not None:
+        results = {
+            "states": CycleStates(stored["states"], fluid),
+            "metrics": stored["metrics"],
+        }
+    else:
+        results = parallel_sweep_cycle(
+            pr_range, t_inlet_range, fluid, eff_c, eff_t, eff_r, T1, P1, **kwargs
+        )
+        if store is not None:
+            store.save(
+                key,
+                {"states": results["states"].records, "metrics": results["metrics"]},
+            )
+    _sweeps[key] = results
+    while len(_sweeps) > SWEEP_CACHE_SIZE:
+        _sweeps.popitem(last=False)
+    return results
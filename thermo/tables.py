@@ -0,0 +1,238 @@
+"""
+Tabulated (bicubic spline) property backend.
+
+h(T, ln P) and s(T, ln P) are sampled once from the exact CoolProp
+equation of state and fitted with bicubic splines. The (P, s) and (h, P)
+inversions are vectorized Newton iterations on the splines, which is far
+cheaper than CoolProp's iterative Helmholtz solves when thousands of
+states are needed at once. Tables are refined until the interpolation
+error at the cell centres is within the requested bounds and are cached
+on disk, so later sessions only refit the splines.
+"""
+
+import hashlib
+import json
+import os
+
+import CoolProp
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+
+DEFAULT_TABLE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "thermo", "tables")
+
+
+def _exact_TP(state, T, lnP):
+    """h and s on the (T, ln P) grid from a CoolProp AbstractState."""
+    h = np.empty((len(T), len(lnP)))
+    s = np.empty((len(T), len(lnP)))
+    P = np.exp(lnP)
+    for i, t in enumerate(T):
+        for j, p in enumerate(P):
+            state.update(CoolProp.PT_INPUTS, p, t)
+            h[i, j] = state.hmass()
+            s[i, j] = state.smass()
+    return h, s
+
+
+class PropertyTable:
+    """
+    Bicubic property tables for one fluid over a (T, P) range.
+
+    The grid starts at n_T x n_P nodes and is refined (spacing halved)
+    until the spline error at the cell centres is below h_tol (J/kg) and
+    s_tol (J/kg/K), or the grid would exceed max_nodes. In the latter
+    case `within_tolerance` is False and thermo.properties does not use
+    the table.
+    """
+
+    def __init__(
+        self,
+        fluid,
+        T_range=(250.0, 2000.0),
+        P_range=(1e4, 5e6),
+        n_T=181,
+        n_P=41,
+        h_tol=1.0,
+        s_tol=2e-3,
+        max_nodes=500_000,
+        table_dir=DEFAULT_TABLE_DIR,
+    ):
+        self.fluid = fluid
+        self.T_range = (float(T_range[0]), float(T_range[1]))
+        self.P_range = (float(P_range[0]), float(P_range[1]))
+        self.h_tol = h_tol
+        self.s_tol = s_tol
+        self.path = None
+        self._state = CoolProp.AbstractState("HEOS", fluid)
+
+        settings = {
+            "fluid": fluid,
+            "coolprop": CoolProp.__version__,
+            "T_range": self.T_range,
+            "P_range": self.P_range,
+            "n_T": n_T,
+            "n_P": n_P,
+            "h_tol": h_tol,
+            "s_tol": s_tol,
+            "max_nodes": max_nodes,
+        }
+        if table_dir is not None:
+            digest = hashlib.sha1(
+                json.dumps(settings, sort_keys=True).encode()
+            ).hexdigest()[:12]
+            self.path = os.path.join(table_dir, f"{fluid}_{digest}.npz")
+
+        if self.path is not None and os.path.exists(self.path):
+            data = np.load(self.path)
+            self.T, self.lnP = data["T"], data["lnP"]
+            h, s = data["h"], data["s"]
+            self.grid_error = {"h": float(data["h_error"]), "s": float(data["s_error"])}
+        else:
+            h, s = self._build(n_T, n_P, max_nodes)
+            if self.path is not None:
+                self._save(h, s)
+        self._fit(h, s)
+
+    def _save(self, h, s):
+        tmp_path = f"{self.path}.tmp.npz"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            np.savez(
+                tmp_path,
+                T=self.T,
+                lnP=self.lnP,
+                h=h,
+                s=s,
+                h_error=self.grid_error["h"],
+                s_error=self.grid_error["s"],
+            )
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # An unwritable cache directory only costs a rebuild next time
+            pass
+
+    def _fit(self, h, s):
+        self._h = RectBivariateSpline(self.T, self.lnP, h, kx=3, ky=3)
+        self._s = RectBivariateSpline(self.T, self.lnP, s, kx=3, ky=3)
+
+    def _build(self, n_T, n_P, max_nodes):
+        lnP_range = np.log(self.P_range)
+        while True:
+            self.T = np.linspace(*self.T_range, n_T)
+            self.lnP = np.linspace(*lnP_range, n_P)
+            h, s = _exact_TP(self._state, self.T, self.lnP)
+            self._fit(h, s)
+
+            # Cubic interpolation error peaks between the nodes
+            T_mid = 0.5 * (self.T[:-1] + self.T[1:])
+            lnP_mid = 0.5 * (self.lnP[:-1] + self.lnP[1:])
+            h_mid, s_mid = _exact_TP(self._state, T_mid, lnP_mid)
+            self.grid_error = {
+                "h": float(np.max(np.abs(self._h(T_mid, lnP_mid) - h_mid))),
+                "s": float(np.max(np.abs(self._s(T_mid, lnP_mid) - s_mid))),
+            }
+            if self.within_tolerance or (2 * n_T - 1) * (2 * n_P - 1) > max_nodes:
+                return h, s
+            n_T, n_P = 2 * n_T - 1, 2 * n_P - 1
+
+    @property
+    def within_tolerance(self):
+        """Whether the grid error is within h_tol and s_tol."""
+        return self.grid_error["h"] <= self.h_tol and self.grid_error["s"] <= self.s_tol
+
+    def _in_range(self, T, lnP):
+        return (
+            (T >= self.T_range[0])
+            & (T <= self.T_range[1])
+            & (lnP >= self.lnP[0])
+            & (lnP <= self.lnP[-1])
+        )
+
+    def _invert(self, spline, target, lnP, log_T, maxiter=30, tol=1e-10):
+        """
+        Solve spline(T, lnP) = target for T with Newton steps; in ln T for
+        entropy, which is nearly linear in ln T for gases.
+        """
+        T_min, T_max = self.T_range
+        T = np.full(target.shape, 0.5 * (T_min + T_max))
+        # Converged points are frozen so every point's result is independent
+        # of which other points share the batch
+        done = np.isnan(target) | np.isnan(lnP)
+        for _ in range(maxiter):
+            residual = spline.ev(T, lnP) - target
+            slope = spline.ev(T, lnP, dx=1)
+            if log_T:
+                step = residual / (slope * T)
+                T_new = T * np.exp(-np.clip(step, -1.0, 1.0))
+            else:
+                T_new = T - residual / slope
+            T_new = np.where(done, T, np.clip(T_new, T_min, T_max))
+            done |= np.abs(T_new - T) <= tol * T
+            T = T_new
+            if np.all(done):
+                break
+        ok = np.abs(spline.ev(T, lnP) - target) <= 1e-6 * np.maximum(np.abs(target), 1)
+        return T, ok
+
+    def evaluate(self, pair, a, b):
+        """
+        Vectorized evaluation of an input pair (see properties.INPUT_PAIRS).
+        Returns the two outputs and a mask of points that lie inside the
+        table; points outside it are left as nan.
+        """
+        a, b = np.broadcast_arrays(
+            np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+        )
+        if pair == "TP":
+            T, lnP = a, np.log(b)
+            ok = self._in_range(T, lnP)
+            first, second = self._h.ev(T, lnP), self._s.ev(T, lnP)
+        elif pair == "Ps":
+            lnP = np.log(a)
+            T, ok = self._invert(self._s, b, lnP, log_T=True)
+            first, second = T, self._h.ev(T, lnP)
+        elif pair == "hP":
+            lnP = np.log(b)
+            T, ok = self._invert(self._h, a, lnP, log_T=False)
+            first, second = T, self._s.ev(T, lnP)
+        else:
+            raise ValueError(f"Unknown input pair {pair!r}")
+        ok = ok & self._in_range(T, lnP)
+        first = np.where(ok, first, np.nan)
+        second = np.where(ok, second, np.nan)
+        return first, second, ok
+
+    def validation_report(self, n_samples=2000, seed=0):
+        """
+        Maximum error of every tabulated output against the exact EOS at
+        random states inside the table. Returns a list of rows
+        {"pair", "output", "max_abs_error", "max_rel_error"}.
+        """
+        from thermo.properties import INPUT_PAIRS, update_state
+
+        rng = np.random.default_rng(seed)
+        T = rng.uniform(*self.T_range, n_samples)
+        P = np.exp(rng.uniform(self.lnP[0], self.lnP[-1], n_samples))
+        h, s = np.array([update_state(self._state, "TP", t, p) for t, p in zip(T, P)]).T
+
+        exact_inputs = {"TP": (T, P), "Ps": (P, s), "hP": (h, P)}
+        exact_outputs = {"TP": (h, s), "Ps": (T, h), "hP": (T, s)}
+        rows = []
+        for pair, (a, b) in exact_inputs.items():
+            first, second, ok = self.evaluate(pair, a, b)
+            for name, approx, exact in zip(
+                INPUT_PAIRS[pair][0], (first, second), exact_outputs[pair]
+            ):
+                error = np.abs(approx - exact)[ok]
+                rows.append(
+                    {
+                        "pair": pair,
+                        "output": name,
+                        "max_abs_error": float(error.max()),
+                        "max_rel_error": float(
+                            (error / np.maximum(np.abs(exact[ok]), 1e-12)).max()
+                        ),
+                        "points_outside_table": int((~ok).sum()),
+                    }
+                )
+        return rows
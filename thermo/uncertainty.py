@@ -0,0 +1,148 @@
+"""
+Monte Carlo uncertainty propagation through the Brayton cycle.
+
+Uncertain cycle inputs (component efficiencies, inlet state, operating
+point) are given as SciPy frozen distributions, e.g.
+scipy.stats.norm(0.88, 0.01) for the compressor efficiency, and fixed
+inputs as plain numbers. `propagate_uncertainty` draws the samples by
+plain Monte Carlo or Latin hypercube sampling, solves all of them with
+thermo.batch.solve_cycle_arrays (batched, on a process pool, optionally
+stored on disk) and summarizes the resulting distributions of thermal
+efficiency and specific work with confidence intervals.
+"""
+
+import numpy as np
+from scipy import stats
+
+from thermo.batch import CASE_DEFAULTS, CASE_FIELDS, solve_cycle_arrays
+from thermo.brayton import METRIC_NAMES
+
+SAMPLING_METHODS = ("lhs", "random")
+
+SUMMARY_FIELDS = (
+    "n",
+    "mean",
+    "std",
+    "mean_ci_low",
+    "mean_ci_high",
+    "low",
+    "median",
+    "high",
+)
+
+# Numeric inputs of brayton_cycle_batch that can be uncertain
+CYCLE_INPUTS = tuple(field for field in CASE_FIELDS if field != "fluid")
+
+
+def is_distribution(value):
+    """True for a scipy.stats frozen distribution (anything with a ppf)."""
+    return hasattr(value, "ppf")
+
+
+def complete_inputs(inputs):
+    """
+    Check a dict of cycle inputs (distributions or constants) and fill in
+    the missing ones: every key must be one of CYCLE_INPUTS, Pr and T5 are
+    required and the others default to CASE_DEFAULTS. Raises ValueError
+    otherwise.
+    """
+    unknown = set(inputs) - set(CYCLE_INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown cycle inputs {sorted(unknown)}")
+    missing = {"Pr", "T5"} - set(inputs)
+    if missing:
+        raise ValueError(f"Missing required cycle inputs {sorted(missing)}")
+    return {name: inputs.get(name, CASE_DEFAULTS.get(name)) for name in CYCLE_INPUTS}
+
+
+def sample_inputs(inputs, n_samples, method="lhs", seed=None):
+    """
+    Draw `n_samples` values of every distribution in `inputs` (a dict of
+    distributions and constants) by inverse transform of uniform samples:
+    Latin hypercube ("lhs") or independent ("random"). Constants are
+    passed through. Returns a dict of arrays and scalars.
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(
+            f"Unknown sampling method {method!r}, expected one of {SAMPLING_METHODS}"
+        )
+    uncertain = [name for name, value in inputs.items() if is_distribution(value)]
+    if method == "lhs" and uncertain:
+        uniform = stats.qmc.LatinHypercube(d=len(uncertain), seed=seed).random(
+            n_samples
+        )
+    else:
+        uniform = np.random.default_rng(seed).random((n_samples, len(uncertain)))
+    samples = dict(inputs)
+    for k, name in enumerate(uncertain):
+        samples[name] = np.asarray(inputs[name].ppf(uniform[:, k]), dtype=float)
+    return samples
+
+
+def summarize_samples(values, confidence=0.95):
+    """
+    Statistics of one output sample (nan entries, from infeasible cycles,
+    are left out): mean and standard deviation, the confidence interval
+    of the mean (normal approximation) and the central `confidence`
+    interval of the distribution itself.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = values[np.isfinite(values)]
+    n = len(valid)
+    tail = (1 - confidence) / 2
+    if n == 0:
+        return {"n": 0, **dict.fromkeys(SUMMARY_FIELDS[1:], float("nan"))}
+    mean = float(valid.mean())
+    std = float(valid.std(ddof=1)) if n > 1 else 0.0
+    half_width = float(stats.norm.ppf(1 - tail)) * std / np.sqrt(n)
+    low, median, high = np.quantile(valid, [tail, 0.5, 1 - tail])
+    return {
+        "n": n,
+        "mean": mean,
+        "std": std,
+        "mean_ci_low": float(mean - half_width),
+        "mean_ci_high": float(mean + half_width),
+        "low": float(low),
+        "median": float(median),
+        "high": float(high),
+    }
+
+
+def propagate_uncertainty(
+    inputs,
+    fluid="Air",
+    n_samples=10_000,
+    method="lhs",
+    seed=0,
+    confidence=0.95,
+    max_workers=None,
+    chunk_size=20_000,
+    store=None,
+):
+    """
+    Propagate input uncertainty through brayton_cycle_batch.
+
+    `inputs` maps CYCLE_INPUTS to distributions (anything with a `ppf`,
+    such as scipy.stats frozen distributions) or constants, completed by
+    complete_inputs. Returns
+    {"samples": input arrays, "metrics": METRICS_DTYPE array of length
+    n_samples, "summary": {metric: summarize_samples(...)}, "failed":
+    number of samples without a feasible cycle}.
+    """
+    inputs = complete_inputs(inputs)
+    samples = sample_inputs(inputs, n_samples, method, seed)
+    metrics = solve_cycle_arrays(
+        {name: np.broadcast_to(value, (n_samples,)) for name, value in samples.items()},
+        fluid,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+        store=store,
+    )
+    return {
+        "samples": samples,
+        "metrics": metrics,
+        "summary": {
+            name: summarize_samples(metrics[name], confidence) for name in METRIC_NAMES
+        },
+        "failed": int(np.sum(~np.isfinite(metrics["thermal_eff"]))),
+    }
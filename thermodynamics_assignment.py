@@ -6,6 +6,7 @@
 #     "matplotlib==3.10.6",
 #     "numpy==2.2.6",
 #     "pandas==2.3.2",
+#     "scipy",
 #     "vegafusion==2.0.2",
 #     "vl-convert-python==1.8.0",
 # ]
@@ -25,8 +26,7 @@ def _(mo):
 
 @app.cell(hide_code=True)
 def _(mo):
-    mo.md(
-        r"""
+    mo.md(r"""
     In this project, you, as an individual student, are expected to design a thermal power plant which
     can generate **220 MW power** and supply electricity to the regional grid by applying the knowledge
     of thermodynamics taught in ME 4405 Applied Thermodynamics. With appropriate realistic
@@ -64,15 +64,13 @@ def _(mo):
     - Provide the specific model for all commercially available power plant components you
     select, and show (with catalog specs) that they meet your calculated duties, operating
     limits, and materials constraints.
-    """
-    )
+    """)
     return
 
 
 @app.cell(hide_code=True)
 def _(mo):
-    mo.md(
-        r"""
+    mo.md(r"""
     ## Assumptions and Justifications
 
     ### Thermodynamic Cycle Selection
@@ -102,220 +100,68 @@ def _(mo):
     - Components selected from commercially available options
     - Materials compatible with temperature and pressure ranges
     - Maintenance accessibility considered in design
-    """
-    )
+    """)
     return
 
 
 @app.cell(hide_code=True)
 def _():
-    import math
     import marimo as mo
     import numpy as np
     import pandas as pd
     import matplotlib.pyplot as plt
-    import CoolProp.CoolProp as CP
-    return CP, math, mo, np, pd, plt
-
+    from scipy import stats
 
-@app.cell(hide_code=True)
-def _(CP):
-    def get_state_properties_from_TP(T, P, fluid):
-        """
-        Evaluates state properties given Temperature and Pressure.
-        Returns a dictionary of properties.
-        """
-        h = CP.PropsSI("H", "T", T, "P", P, fluid)
-        s = CP.PropsSI("S", "T", T, "P", P, fluid)
-        return {"T": T, "P": P, "h": h, "s": s, "fluid": fluid}
-    return (get_state_properties_from_TP,)
-
-
-@app.cell(hide_code=True)
-def _(CP):
-    def get_state_properties_from_Ps(P, s, fluid):
-        """
-        Evaluates state properties given Pressure and Entropy.
-        Returns a dictionary of properties.
-        """
-        T = CP.PropsSI("T", "P", P, "S", s, fluid)
-        h = CP.PropsSI("H", "P", P, "S", s, fluid)
-        return {"T": T, "P": P, "h": h, "s": s, "fluid": fluid}
-    return (get_state_properties_from_Ps,)
+    return mo, np, pd, plt, stats
 
 
 @app.cell(hide_code=True)
-def _(CP):
-    def get_state_properties_from_hP(h, P, fluid):
-        """
-        Evaluates state properties given Enthalpy and Pressure.
-        Returns a dictionary of properties.
-        """
-        T = CP.PropsSI("T", "H", h, "P", P, fluid)
-        s = CP.PropsSI("S", "H", h, "P", P, fluid)
-        return {"T": T, "P": P, "h": h, "s": s}
-    return (get_state_properties_from_hP,)
-
-
-@app.cell(hide_code=True)
-def _(
-    CP,
-    get_state_properties_from_Ps,
-    get_state_properties_from_TP,
-    get_state_properties_from_hP,
-    math,
-):
-    def brayton_cycle_analysis(
-        T1, P1, Pr, T5, fluid, eff_compressor, eff_turbine, effectiveness
-    ):
-        # State 1: Initial conditions (inlet to first compressor)
-        state1 = get_state_properties_from_TP(T1, P1, fluid)
-
-        # State 2s: Isentropic compression (first stage)
-        P2 = math.sqrt(Pr) * P1
-        state2s = get_state_properties_from_Ps(P2, state1["s"], fluid)
-        # State 2a: Actual compression with isentropic efficiency
-        h2a = state1["h"] + (state2s["h"] - state1["h"]) / eff_compressor
-        T2a = CP.PropsSI("T", "H", h2a, "P", P2, fluid)
-        s2a = CP.PropsSI("S", "H", h2a, "P", P2, fluid)
-        state2a = {"T": T2a, "P": P2, "h": h2a, "s": s2a, "fluid": fluid}
-
-        # State 3: After intercooling (T3 equals inlet temperature T1, P3 equals P2)
-        T3 = T1
-        P3 = P2
-        state3 = get_state_properties_from_TP(T3, P3, fluid)
-
-        # State 4s: Isentropic compression (second stage)
-        P4 = math.sqrt(Pr) * P3
-        state4s = get_state_properties_from_Ps(P4, state3["s"], fluid)
-        # State 4a: Actual compression after 2nd stage
-        h4a = state3["h"] + (state4s["h"] - state3["h"]) / eff_compressor
-        T4a = CP.PropsSI("T", "H", h4a, "P", P4, fluid)
-        s4a = CP.PropsSI("S", "H", h4a, "P", P4, fluid)
-        state4a = {"T": T4a, "P": P4, "h": h4a, "s": s4a, "fluid": fluid}
-
-        # State 5: After first heat addition (first turbine inlet)
-        P5 = P4
-        state5 = get_state_properties_from_TP(T5, P5, fluid)
-
-        # State 6s: Isentropic expansion (first turbine stage)
-        P6 = P5 / math.sqrt(Pr)
-        state6s = get_state_properties_from_Ps(P6, state5["s"], fluid)
-        # State 6a: Actual expansion (first turbine, with efficiency)
-        h6a = state5["h"] - eff_turbine * (state5["h"] - state6s["h"])
-        T6a = CP.PropsSI("T", "H", h6a, "P", P6, fluid)
-        s6a = CP.PropsSI("S", "H", h6a, "P", P6, fluid)
-        state6a = {"T": T6a, "P": P6, "h": h6a, "s": s6a, "fluid": fluid}
-
-        # State 7: Second heat addition (second turbine inlet, reheat)
-        P7 = P6
-        T7 = T5
-        state7 = get_state_properties_from_TP(T7, P7, fluid)
-
-        # State 8s: Isentropic expansion (second turbine stage)
-        P8 = P7 / math.sqrt(Pr)
-        state8s = get_state_properties_from_Ps(P8, state7["s"], fluid)
-        # State 8a: Actual expansion (second turbine, with efficiency)
-        h8a = state7["h"] - eff_turbine * (state7["h"] - state8s["h"])
-        T8a = CP.PropsSI("T", "H", h8a, "P", P8, fluid)
-        s8a = CP.PropsSI("S", "H", h8a, "P", P8, fluid)
-        state8a = {"T": T8a, "P": P8, "h": h8a, "s": s8a, "fluid": fluid}
-
-        # State 9: Regeneration—preheated air before main combustor (using effectiveness)
-        h9 = state4a["h"] + effectiveness * (state8a["h"] - state4a["h"])
-        T9 = CP.PropsSI("T", "H", h9, "P", P4, fluid)
-        s9 = CP.PropsSI("S", "H", h9, "P", P4, fluid)
-        state9 = {"T": T9, "P": P4, "h": h9, "s": s9, "fluid": fluid}
-
-        # State 10: Air after heat rejected in regenerator
-        h10 = state8a["h"] - (state9["h"] - state4a["h"])
-        state10 = get_state_properties_from_hP(h10, P1, fluid)
-
-        # Net specific work output
-        w_comp = (state2a["h"] - state1["h"]) + (state4a["h"] - state3["h"])
-        w_turb = (state5["h"] - state6a["h"]) + (state7["h"] - state8a["h"])
-        w_net = w_turb - w_comp
-
-        # Total heat input (Q_in)
-        q_in = (state5["h"] - state9["h"]) + (state7["h"] - state6a["h"])
-
-        # Cycle thermal efficiency (%)
-        thermal_eff = (w_net / q_in) * 100
-
-        # Back work ratio (fraction of turbine output consumed by compressor)
-        back_work_ratio = w_comp / w_turb
-
-        # Exhaust gas temperature after last turbine stage
-        exhaust_gas_temperature = state10["T"]
-
-        return {
-            "states": {
-                "1": state1,
-                "2s": state2s,
-                "2a": state2a,
-                "3": state3,
-                "4s": state4s,
-                "4a": state4a,
-                "5": state5,
-                "6s": state6s,
-                "6a": state6a,
-                "7": state7,
-                "8s": state8s,
-                "8a": state8a,
-                "9": state9,
-                "10": state10,
-            },
-            "metrics": {
-                "w_net": w_net,
-                "q_in": q_in,
-                "thermal_eff": thermal_eff,
-                "back_work_ratio": back_work_ratio,
-                "exhaust_gas_temperature": exhaust_gas_temperature,
-            },
-        }
-    return (brayton_cycle_analysis,)
-
-
-@app.function(hide_code=True)
-def validate_parameters(Pr, T_inlet, fluid, eff_c, eff_t, eff_r, T1, P1):
-    """Validate that parameters are within physically possible ranges"""
-    warnings = []
-
-    # Check if turbine inlet temperature is feasible
-    max_material_temp = 1800  # K - current material limit for turbines
-    if T_inlet > max_material_temp:
-        warnings.append(
-            f"Turbine inlet temperature ({T_inlet} K) exceeds typical material limits ({max_material_temp} K)"
-        )
-
-    # Check pressure ratio limits
-    if Pr < 5 or Pr > 30:
-        warnings.append(
-            f"Pressure ratio ({Pr}) is outside typical operational range (5-30)"
-        )
-
-    # Check if compressor discharge temperature is reasonable
-    T_comp_out_ideal = T1 * (
-        Pr ** ((1.4 - 1) / 1.4)
-    )  # Ideal gas approximation
-    if T_comp_out_ideal > 900:  # K
-        warnings.append(
-            f"Compressor discharge temperature may be too high ({T_comp_out_ideal:.1f} K)"
-        )
-
-    # Check component efficiencies
-    if eff_c < 0.8 or eff_c > 0.92:
-        warnings.append(
-            f"Compressor efficiency ({eff_c}) outside typical range (0.8-0.92)"
-        )
-    if eff_t < 0.85 or eff_t > 0.95:
-        warnings.append(
-            f"Turbine efficiency ({eff_t}) outside typical range (0.85-0.95)"
-        )
-    if eff_r < 0.7 or eff_r > 0.95:
-        warnings.append(
-            f"Regenerator effectiveness ({eff_r}) outside typical range (0.7-0.95)"
-        )
+def _():
+    from thermo.adaptive import adaptive_sweep_efficiency
+    from thermo.brayton import (
+        brayton_cycle_analysis,
+        brayton_cycle_batch,
+        validate_parameters,
+    )
+    from thermo.exergy import exergy_analysis, exergy_sweep, get_dead_state
+    from thermo.multistage import multistage_cycle_batch
+    from thermo.optimize import optimize_cycle
+    from thermo.profiling import profile, profiled
+    from thermo.properties import (
+        get_ideal_gas_model,
+        get_property_table,
+        property_cache,
+        use_property_backend,
+    )
+    from thermo.store import result_store
+    from thermo.sensitivity import local_sensitivity, sobol_indices
+    from thermo.sweep import cached_sweep_cycle
+    from thermo.uncertainty import propagate_uncertainty
+
+    # Keep evaluated states between notebook sessions, in ~/.cache/thermo
+    property_cache.persist()
+    return (
+        adaptive_sweep_efficiency,
+        brayton_cycle_analysis,
+        brayton_cycle_batch,
+        cached_sweep_cycle,
+        exergy_analysis,
+        exergy_sweep,
+        get_dead_state,
+        get_ideal_gas_model,
+        get_property_table,
+        local_sensitivity,
+        multistage_cycle_batch,
+        optimize_cycle,
+        profile,
+        profiled,
+        propagate_uncertainty,
+        property_cache,
+        result_store,
+        sobol_indices,
+        use_property_backend,
+        validate_parameters,
+    )
 
 
 @app.cell(hide_code=True)
@@ -326,6 +172,7 @@ def _(mo):
         step=0.5,
         show_value=True,
         full_width=True,
+        debounce=True,
         label="Pressure Ratio",
     )
 
@@ -335,6 +182,7 @@ def _(mo):
         step=50,
         show_value=True,
         full_width=True,
+        debounce=True,
         label="Turbine Inlet Temperature",
     )
 
@@ -362,24 +210,58 @@ def _(mo, pressure_ratio_slider, turbine_inlet_temperature_slider):
 
 
 @app.cell(hide_code=True)
-def _(pressure_ratio_slider, turbine_inlet_temperature_slider):
+def _():
+    # Fixed inputs; cells that only depend on these (sweeps, maps, optimizer)
+    # are not rerun when the sliders move
     T1_in = 300  # K
     P1_in = 101325  # Pa
-    Pr_in = pressure_ratio_slider  # Pressure ratio
-    T3_in = turbine_inlet_temperature_slider  # K
     fluid_in = "Air"
     eff_c_in = 0.88  # Compressor efficiency
     eff_t_in = 0.92  # Turbine efficiency
     eff_r_in = 0.9  # regenerator_effectiveness_slider  # Regenerator effectiveness
-    return P1_in, Pr_in, T1_in, T3_in, eff_c_in, eff_r_in, eff_t_in, fluid_in
+    net_power_required = 220e6  # 220 MW in Watts
+    return (
+        P1_in,
+        T1_in,
+        eff_c_in,
+        eff_r_in,
+        eff_t_in,
+        fluid_in,
+        net_power_required,
+    )
 
 
 @app.cell(hide_code=True)
-def _(P1_in, Pr_in, T1_in, T3_in, eff_c_in, eff_r_in, eff_t_in, fluid_in, mo):
+def _(pressure_ratio_slider):
+    # One cell per slider, so that cells depending only on the other
+    # slider are not rerun
+    Pr_in = pressure_ratio_slider.value  # Pressure ratio
+    return (Pr_in,)
+
+
+@app.cell(hide_code=True)
+def _(turbine_inlet_temperature_slider):
+    T3_in = turbine_inlet_temperature_slider.value  # K
+    return (T3_in,)
+
+
+@app.cell(hide_code=True)
+def _(
+    P1_in,
+    Pr_in,
+    T1_in,
+    T3_in,
+    eff_c_in,
+    eff_r_in,
+    eff_t_in,
+    fluid_in,
+    mo,
+    validate_parameters,
+):
     # Validate parameters before running analysis
     validation_warnings = validate_parameters(
-        Pr_in.value,
-        T3_in.value,
+        Pr_in,
+        T3_in,
         fluid_in,
         eff_c_in,
         eff_t_in,
@@ -389,10 +271,12 @@ def _(P1_in, Pr_in, T1_in, T3_in, eff_c_in, eff_r_in, eff_t_in, fluid_in, mo):
     )
 
     if validation_warnings:
-        for warning in validation_warnings:
-            mo.md(f"**{warning}**")
+        _validation_output = mo.vstack(
+            [mo.md(f"**{warning}**") for warning in validation_warnings]
+        )
     else:
-        mo.md("All parameters are within acceptable ranges")
+        _validation_output = mo.md("All parameters are within acceptable ranges")
+    _validation_output
     return
 
 
@@ -411,8 +295,8 @@ def _(
     results = brayton_cycle_analysis(
         T1_in,
         P1_in,
-        Pr_in.value,
-        T3_in.value,
+        Pr_in,
+        T3_in,
         fluid_in,
         eff_c_in,
         eff_t_in,
@@ -422,18 +306,19 @@ def _(
 
 
 @app.cell(hide_code=True)
-def _(mo, results):
+def _(mo, net_power_required, results):
     # Power scaling to meet 220 MW requirement
-    net_power_required = 220e6  # 220 MW in Watts
-    specific_work = results['metrics']['w_net']  # J/kg
+    specific_work = results["metrics"]["w_net"]  # J/kg
     mass_flow_rate = net_power_required / specific_work  # kg/s
 
-    mo.vstack([
-        mo.md("## Power Plant Sizing for 220 MW Output:"),
-        mo.md(f"### Required Mass Flow Rate: {mass_flow_rate:.2f} kg/s"),
-        mo.md(f"### Specific Work Output: {specific_work/1000:.2f} kJ/kg"),
-        mo.md(f"### Net Power Output: {net_power_required/1e6:.2f} MW")
-    ])
+    mo.vstack(
+        [
+            mo.md("## Power Plant Sizing for 220 MW Output:"),
+            mo.md(f"### Required Mass Flow Rate: {mass_flow_rate:.2f} kg/s"),
+            mo.md(f"### Specific Work Output: {specific_work/1000:.2f} kJ/kg"),
+            mo.md(f"### Net Power Output: {net_power_required/1e6:.2f} MW"),
+        ]
+    )
     return (mass_flow_rate,)
 
 
@@ -459,61 +344,20 @@ def _(pd, results):
 
 
 @app.cell(hide_code=True)
-def _(plt):
+def _(plt, profiled):
+    @profiled
     def plot_ts_diagram(analysis_results):
         states = analysis_results["states"]
 
         # Actual cycle points (using relevant key sequence)
-        s_actual = [
-            states["1"]["s"] / 1000,
-            states["2a"]["s"] / 1000,
-            states["3"]["s"] / 1000,
-            states["4a"]["s"] / 1000,
-            states["9"]["s"] / 1000,
-            states["5"]["s"] / 1000,
-            states["6a"]["s"] / 1000,
-            states["7"]["s"] / 1000,
-            states["8a"]["s"] / 1000,
-            states["10"]["s"] / 1000,
-            states["1"]["s"] / 1000,
-        ]
-        T_actual = [
-            states["1"]["T"],
-            states["2a"]["T"],
-            states["3"]["T"],
-            states["4a"]["T"],
-            states["9"]["T"],
-            states["5"]["T"],
-            states["6a"]["T"],
-            states["7"]["T"],
-            states["8a"]["T"],
-            states["10"]["T"],
-            states["1"]["T"],
-        ]
+        state_labels = ["1", "2a", "3", "4a", "9", "5", "6a", "7", "8a", "10", "1"]
+        s_actual = states.s[state_labels] / 1000
+        T_actual = states.T[state_labels]
 
         # Ideal compressor and turbine expansion
-        s_ideal = [
-            states["1"]["s"] / 1000,
-            states["2s"]["s"] / 1000,
-            states["3"]["s"] / 1000,
-            states["4s"]["s"] / 1000,
-            states["5"]["s"] / 1000,
-            states["6s"]["s"] / 1000,
-            states["7"]["s"] / 1000,
-            states["8s"]["s"] / 1000,
-            states["1"]["s"] / 1000,
-        ]
-        T_ideal = [
-            states["1"]["T"],
-            states["2s"]["T"],
-            states["3"]["T"],
-            states["4s"]["T"],
-            states["5"]["T"],
-            states["6s"]["T"],
-            states["7"]["T"],
-            states["8s"]["T"],
-            states["1"]["T"],
-        ]
+        ideal_labels = ["1", "2s", "3", "4s", "5", "6s", "7", "8s", "1"]
+        s_ideal = states.s[ideal_labels] / 1000
+        T_ideal = states.T[ideal_labels]
 
         fig, ax = plt.subplots(figsize=(10, 7))
 
@@ -538,7 +382,6 @@ def _(plt):
         )
 
         # Label actual states
-        state_labels = ["1", "2a", "3", "4a", "9", "5", "6a", "7", "8a", "10", "1"]
         for s, T, label in zip(s_actual, T_actual, state_labels):
             ax.text(
                 s,
@@ -551,11 +394,8 @@ def _(plt):
             )
 
         # Label ideal states
-        ideal_labels = ["1", "2s", "3", "4s", "5", "6s", "7", "8s", "1"]
         for s, T, label in zip(s_ideal, T_ideal, ideal_labels):
-            ax.text(
-                s, T, f" {label}", fontsize=11, ha="right", va="top", color="red"
-            )
+            ax.text(s, T, f" {label}", fontsize=11, ha="right", va="top", color="red")
 
         # Axis, title, legend
         ax.set_xlabel("Entropy, $s$ (kJ/kg·K)", fontsize=13)
@@ -565,6 +405,7 @@ def _(plt):
         ax.legend(loc="best", fontsize=12)
         plt.tight_layout()
         plt.show()
+
     return (plot_ts_diagram,)
 
 
@@ -575,12 +416,8 @@ def _(mo, results):
             mo.md("## Cycle Analysis Results:"),
             mo.md(f"### Net Work (w_net): {results['metrics']['w_net']:.2f} J/kg"),
             mo.md(f"### Heat Input (q_in): {results['metrics']['q_in']:.2f} J/kg"),
-            mo.md(
-                f"### Thermal Efficiency: {results['metrics']['thermal_eff']:.2f}%"
-            ),
-            mo.md(
-                f"### Back Work Ratio: {results['metrics']['back_work_ratio']:.2f}"
-            ),
+            mo.md(f"### Thermal Efficiency: {results['metrics']['thermal_eff']:.2f}%"),
+            mo.md(f"### Back Work Ratio: {results['metrics']['back_work_ratio']:.2f}"),
         ]
     )
     return
@@ -593,29 +430,6 @@ def _(plot_ts_diagram, results):
     return
 
 
-@app.cell(hide_code=True)
-def _(brayton_cycle_analysis, np):
-    def sweep_efficiency(
-        pr_range, t_inlet_range, fluid, eff_c, eff_t, eff_r, T1=300, P1=101325
-    ):
-        eff_map = np.zeros((len(pr_range), len(t_inlet_range)))
-        for i, pr in enumerate(pr_range):
-            for j, t_inlet in enumerate(t_inlet_range):
-                results = brayton_cycle_analysis(
-                    T1=T1,
-                    P1=P1,
-                    Pr=pr,
-                    T5=t_inlet,
-                    fluid=fluid,
-                    eff_compressor=eff_c,
-                    eff_turbine=eff_t,
-                    effectiveness=eff_r,
-                )
-                eff_map[i, j] = results["metrics"]["thermal_eff"]
-        return eff_map
-    return (sweep_efficiency,)
-
-
 @app.cell(hide_code=True)
 def _(np):
     pr_values = np.arange(8, 26, 2)  # Pressure ratio from 8 to 24 step 2
@@ -629,25 +443,34 @@ def _(np):
 def _(
     P1_in,
     T1_in,
+    cached_sweep_cycle,
     eff_c_in,
     eff_r_in,
     eff_t_in,
     fluid_in,
+    mo,
     pr_values,
-    sweep_efficiency,
+    result_store,
     t_inlet_values,
 ):
-    efficiency_map = sweep_efficiency(
-        pr_values,
-        t_inlet_values,
-        fluid_in,
-        eff_c_in,
-        eff_t_in,
-        eff_r_in,
-        T1_in,
-        P1_in,
-    )
-    return (efficiency_map,)
+    # Stored on disk by input hash, so a restart memory-maps the last map
+    with mo.status.spinner(title="Solving efficiency map") as _spinner:
+        efficiency_sweep = cached_sweep_cycle(
+            pr_values,
+            t_inlet_values,
+            fluid_in,
+            eff_c_in,
+            eff_t_in,
+            eff_r_in,
+            T1_in,
+            P1_in,
+            store=result_store,
+            progress=lambda done, total: _spinner.update(
+                subtitle=f"{done}/{total} chunks solved"
+            ),
+        )
+    efficiency_map = efficiency_sweep["metrics"]["thermal_eff"]
+    return efficiency_map, efficiency_sweep
 
 
 @app.cell(hide_code=True)
@@ -697,107 +520,289 @@ def _(efficiency_map, np, plt, pr_values, t_inlet_values):
 
 
 @app.cell(hide_code=True)
-def _(efficiency_map, np, plt, pr_values, t_inlet_values):
+def _(
+    P1_in,
+    T1_in,
+    adaptive_sweep_efficiency,
+    eff_c_in,
+    eff_r_in,
+    eff_t_in,
+    fluid_in,
+    pr_values,
+    t_inlet_values,
+):
+    # Adaptively refined map: samples concentrate where efficiency bends,
+    # with fewer cycle solves than the fixed grid above
+    adaptive_map = adaptive_sweep_efficiency(
+        (pr_values.min(), pr_values.max()),
+        (t_inlet_values.min(), t_inlet_values.max()),
+        fluid_in,
+        eff_c_in,
+        eff_t_in,
+        eff_r_in,
+        T1_in,
+        P1_in,
+        budget=80,
+        grid_shape=(161, 101),
+    )
+    return (adaptive_map,)
+
+
+@app.cell(hide_code=True)
+def _(adaptive_map, np, plt, pr_values, t_inlet_values):
     # Plot 3: 2D Contour Map of Efficiency
     plt.figure(figsize=(12, 8))
-    X, Y = np.meshgrid(t_inlet_values, pr_values)
-    contour = plt.contourf(X, Y, efficiency_map, levels=30, cmap="viridis")
+    X, Y = np.meshgrid(adaptive_map["t_inlet_grid"], adaptive_map["pr_grid"])
+    contour = plt.contourf(
+        X, Y, adaptive_map["efficiency_map"], levels=30, cmap="viridis"
+    )
     plt.colorbar(contour, label="Thermal Efficiency (%)")
+    plt.scatter(
+        adaptive_map["t_inlet"],
+        adaptive_map["pr"],
+        s=4,
+        c="white",
+        alpha=0.6,
+        label=f"{adaptive_map['evaluations']} cycle solves",
+    )
+    plt.legend(loc="lower right")
     plt.xlabel("Turbine Inlet Temperature (K)")
     plt.ylabel("Compressor Pressure Ratio")
-    plt.title("Thermal Efficiency Contour Map")
+    plt.title(
+        f"Thermal Efficiency Contour Map ({adaptive_map['evaluations']} cycle "
+        f"solves, fixed grid: {pr_values.size * t_inlet_values.size})"
+    )
     plt.tight_layout()
     plt.show()
     return
 
 
 @app.cell(hide_code=True)
-def _(CP, P0, T0, fluid_in):
-    def compute_physical_exergy(state, T0=T0, P0=P0):
-        """
-        Calculate physical exergy of a fluid state relative to environment.
-        ex = (h - h0) - T0*(s - s0)
-        """
-        h0 = CP.PropsSI("H", "T", T0, "P", P0, fluid_in)
-        s0 = CP.PropsSI("S", "T", T0, "P", P0, fluid_in)
-        exergy = (state["h"] - h0) - T0 * (state["s"] - s0)
+def _(
+    P1_in,
+    T1_in,
+    eff_c_in,
+    eff_r_in,
+    eff_t_in,
+    efficiency_map,
+    fluid_in,
+    mo,
+    np,
+    optimize_cycle,
+    pr_values,
+    t_inlet_values,
+):
+    # Optimized operating point within the swept ranges, compared with the grid
+    optimum = optimize_cycle(
+        T1_in,
+        P1_in,
+        fluid_in,
+        eff_c_in,
+        eff_t_in,
+        eff_r_in,
+        objective="thermal_eff",
+        bounds=(
+            (pr_values.min(), pr_values.max()),
+            (t_inlet_values.min(), t_inlet_values.max()),
+        ),
+    )
+    _i, _j = np.unravel_index(np.argmax(efficiency_map), efficiency_map.shape)
+    mo.vstack(
+        [
+            mo.md("## Optimized Operating Point:"),
+            mo.md(
+                f"### Optimizer: Pr = {optimum['Pr']:.2f}, "
+                f"T_inlet = {optimum['T5']:.0f} K, "
+                f"efficiency = {optimum['value']:.2f}% "
+                f"({optimum['cycle_solves']} cycle solves)"
+            ),
+            mo.md(
+                f"### Grid: Pr = {pr_values[_i]}, T_inlet = {t_inlet_values[_j]} K, "
+                f"efficiency = {efficiency_map[_i, _j]:.2f}% "
+                f"({efficiency_map.size} cycle solves)"
+            ),
+        ]
+    )
+    return (optimum,)
 
-        return exergy
-    return (compute_physical_exergy,)
+
+@app.cell(hide_code=True)
+def _(efficiency_map, mo, property_cache):
+    # Property cache statistics after the cycle analysis and sweep
+    _info = property_cache.info()
+    _lookups = _info.hits + _info.misses
+    mo.md(
+        f"Property cache: {_info.hits} hits / {_lookups} lookups "
+        f"({100 * _info.hits / max(_lookups, 1):.1f}%), "
+        f"{_info.currsize} of {_info.maxsize} states stored"
+    )
+    return
 
 
 @app.cell(hide_code=True)
-def _(compute_physical_exergy):
-    def exergy_analysis(cycle_results, mass_flow_rate):
-        """
-        Perform detailed exergy analysis with component-level breakdown
-        """
-        states = cycle_results['states']
+def _(fluid_in, get_ideal_gas_model, get_property_table, mo, pd):
+    # Accuracy of the bicubic property tables used for large batch sweeps
+    # and of the ideal-gas screening backend
+    _table = get_property_table(fluid_in)
+    _report = pd.DataFrame(_table.validation_report(n_samples=500)).set_index(
+        ["pair", "output"]
+    )
+    _table_label = "Property table validation (max error vs. exact EOS)"
+    if not _table.within_tolerance:
+        _table_label += " - misses its error bounds, exact EOS used instead"
+    _ideal_report = pd.DataFrame(
+        get_ideal_gas_model(fluid_in).validation_report(n_samples=500)
+    ).set_index(["pair", "output"])
+    mo.accordion(
+        {
+            _table_label: _report,
+            "Ideal-gas model validation (states within tolerance)": _ideal_report,
+        }
+    )
+    return
 
-        # Physical exergy of each state
-        ex = {k: compute_physical_exergy(v) for k, v in states.items()}
 
-        # Component-level exergy destruction calculations
-        ex_dest = {}
+@app.cell(hide_code=True)
+def _(fluid_in, get_dead_state):
+    T0 = 298  # K, ambient temperature
+    P0 = 101325  # Pa, ambient pressure
+    dead_state = get_dead_state(fluid_in, T0, P0)
+    return (dead_state,)
 
-        # Compressors
-        w_comp1_actual = states['2a']['h'] - states['1']['h']
-        w_comp1_ideal = states['2s']['h'] - states['1']['h']
-        ex_dest['Compressor 1'] = w_comp1_actual - w_comp1_ideal
 
-        w_comp2_actual = states['4a']['h'] - states['3']['h']
-        w_comp2_ideal = states['4s']['h'] - states['3']['h']
-        ex_dest['Compressor 2'] = w_comp2_actual - w_comp2_ideal
+@app.cell(hide_code=True)
+def _(dead_state, exergy_analysis, mass_flow_rate, results):
+    exergy_results = exergy_analysis(results, mass_flow_rate, dead_state)
+    return (exergy_results,)
 
-        # Turbines
-        w_turb1_actual = states['5']['h'] - states['6a']['h']
-        w_turb1_ideal = states['5']['h'] - states['6s']['h']
-        ex_dest['Turbine 1'] = w_turb1_ideal - w_turb1_actual
 
-        w_turb2_actual = states['7']['h'] - states['8a']['h']
-        w_turb2_ideal = states['7']['h'] - states['8s']['h']
-        ex_dest['Turbine 2'] = w_turb2_ideal - w_turb2_actual
+@app.cell(hide_code=True)
+def _(exergy_results, pd):
+    # Create a comprehensive results table
+    exergy_data = []
+    for component, metrics in exergy_results.items():
+        if component != "Overall":
+            rows = {
+                "Component": component,
+                "Exergy Destruction (kJ/kg)": f"{metrics['Exergy Destruction (kJ/kg)']:.2f}",
+                "Percentage of Total": f"{metrics['Percentage of Total']:.1f}%",
+                "Exergy Destruction (MW)": f"{metrics['Exergy Destruction (MW)']:.2f}",
+            }
+            exergy_data.append(rows)
 
-        # Regenerator
-        ex_in_regenerator = ex['8a'] - ex['10']
-        ex_out_regenerator = ex['9'] - ex['4a']
-        ex_dest['Regenerator'] = ex_in_regenerator - ex_out_regenerator
+    # Display the table
+    df_exergy = pd.DataFrame(exergy_data).set_index("Component")
+    df_exergy
+    return
 
-        # Combustion chambers (approximated)
-        ex_dest['Combustor 1'] = (ex['4a'] - ex['5']) * 0.2  # Approximation
-        ex_dest['Combustor 2'] = (ex['6a'] - ex['7']) * 0.2  # Approximation
 
-        # Calculate percentages and absolute values
-        total_ex_dest = sum(ex_dest.values())
+@app.cell(hide_code=True)
+def _(dead_state, efficiency_sweep, exergy_sweep, net_power_required):
+    # Second-law sweep over the same grid, reusing the first-law states
+    exergy_map = exergy_sweep(efficiency_sweep, dead_state, net_power_required)
+    return (exergy_map,)
 
-        exergy_results = {}
-        for component, destruction in ex_dest.items():
-            percentage = (destruction / total_ex_dest) * 100
-            exergy_results[component] = {
-                'Exergy Destruction (kJ/kg)': destruction / 1000,
-                'Percentage of Total': percentage,
-                'Exergy Destruction (MW)': (destruction * mass_flow_rate) / 1e6
-            }
 
-        # Overall Second Law efficiency
-        w_net = cycle_results['metrics']['w_net']
-        ex_in = ex['9'] - ex['4a']  # Exergy input approximation
-        eta_II = (w_net / ex_in) * 100
+@app.cell(hide_code=True)
+def _(exergy_map, np, plt, pr_values, t_inlet_values):
+    # Plot 4: 2D Contour Map of Second Law Efficiency
+    plt.figure(figsize=(12, 8))
+    _X2, _Y2 = np.meshgrid(t_inlet_values, pr_values)
+    _contour_II = plt.contourf(_X2, _Y2, exergy_map["eta_II"], levels=30, cmap="magma")
+    plt.colorbar(_contour_II, label="Second Law Efficiency (%)")
+    plt.xlabel("Turbine Inlet Temperature (K)")
+    plt.ylabel("Compressor Pressure Ratio")
+    plt.title("Second Law Efficiency Contour Map")
+    plt.tight_layout()
+    plt.show()
+    return
 
-        exergy_results['Overall'] = {
-            'Second Law Efficiency (%)': eta_II,
-            'Total Exergy Destruction (MW)': total_ex_dest * mass_flow_rate / 1e6
-        }
 
-        return exergy_results
-    return (exergy_analysis,)
+@app.cell(hide_code=True)
+def _(exergy_map, np, plt, pr_values, t_inlet_values):
+    # Plot 5: Exergy destruction of each component over the parameter grid
+    _components = list(exergy_map["destruction_MW"])
+    _fig_ex, _axes_ex = plt.subplots(
+        2, (len(_components) + 1) // 2, figsize=(18, 8), sharex=True, sharey=True
+    )
+    _X3, _Y3 = np.meshgrid(t_inlet_values, pr_values)
+    for _ax_ex, _component in zip(_axes_ex.flat, _components):
+        _contour_ex = _ax_ex.contourf(
+            _X3,
+            _Y3,
+            exergy_map["destruction_MW"][_component],
+            levels=20,
+            cmap="inferno",
+        )
+        _fig_ex.colorbar(_contour_ex, ax=_ax_ex, label="MW")
+        _ax_ex.set_title(_component)
+    for _ax_ex in _axes_ex.flat[len(_components) :]:
+        _ax_ex.set_visible(False)
+    _fig_ex.supxlabel("Turbine Inlet Temperature (K)")
+    _fig_ex.supylabel("Compressor Pressure Ratio")
+    _fig_ex.suptitle("Component Exergy Destruction for 220 MW Net Output")
+    plt.tight_layout()
+    plt.show()
+    return
 
 
 @app.cell(hide_code=True)
-def _():
-    T0 = 298  # K, ambient temperature
-    P0 = 101325  # Pa, ambient pressure
-    return P0, T0
+def _(
+    P1_in,
+    T1_in,
+    T3_in,
+    eff_c_in,
+    eff_r_in,
+    eff_t_in,
+    fluid_in,
+    multistage_cycle_batch,
+    np,
+    plt,
+    pr_values,
+    use_property_backend,
+):
+    # Plot 6: Stage-count study at the selected turbine inlet temperature
+    _pr_fine = np.linspace(pr_values.min(), pr_values.max(), 33)
+    # Small batches would use the exact EOS under "auto"; the tables keep
+    # all twelve stage configurations interactive
+    with use_property_backend("tabular"):
+        _stage_eff = {
+            (_n_stages, _effectiveness): multistage_cycle_batch(
+                T1_in,
+                P1_in,
+                _pr_fine,
+                T3_in,
+                fluid_in,
+                _n_stages,
+                _n_stages,
+                eff_c_in,
+                eff_t_in,
+                _effectiveness,
+            )["metrics"]["thermal_eff"]
+            for _n_stages in range(1, 7)
+            for _effectiveness in (eff_r_in, None)
+        }
+    _fig_st, _ax_st = plt.subplots(figsize=(10, 6))
+    _colors = plt.cm.viridis(np.linspace(0, 0.9, 6))
+    for (_n_stages, _effectiveness), _eff in _stage_eff.items():
+        _ax_st.plot(
+            _pr_fine,
+            _eff,
+            "-" if _effectiveness is not None else "--",
+            color=_colors[_n_stages - 1],
+            label=f"{_n_stages}+{_n_stages} stages" if _effectiveness else None,
+        )
+    _ax_st.set_xlabel("Compressor Pressure Ratio")
+    _ax_st.set_ylabel("Thermal Efficiency (%)")
+    _ax_st.set_title(
+        f"Efficiency vs Number of Stages at T_inlet = {T3_in} K "
+        "(solid: regenerated, dashed: no regenerator)"
+    )
+    _ax_st.grid(True)
+    _ax_st.legend()
+    plt.tight_layout()
+    plt.show()
+    return
 
 
 @app.cell(hide_code=True)
@@ -806,48 +811,204 @@ def _(
     Pr_in,
     T1_in,
     T3_in,
-    brayton_cycle_analysis,
     eff_c_in,
     eff_r_in,
     eff_t_in,
     fluid_in,
+    np,
+    plt,
+    propagate_uncertainty,
+    result_store,
+    stats,
+    use_property_backend,
 ):
-    cycle_results = brayton_cycle_analysis(
-        T1_in,
-        P1_in,
-        Pr_in.value,
-        T3_in.value,
-        fluid_in,
-        eff_c_in,
-        eff_t_in,
-        eff_r_in,  # .value,
+    # Plot 7: Efficiency and specific work under component uncertainty
+    def _below_one(mean, std):
+        # Normal distribution truncated at 1 for efficiencies
+        return stats.truncnorm(-np.inf, (1 - mean) / std, loc=mean, scale=std)
+
+    # The ideal-gas backend keeps 20,000 samples interactive; its error is
+    # far below the spread caused by the input uncertainty
+    with use_property_backend("ideal"):
+        _uq = propagate_uncertainty(
+            {
+                "T1": T1_in,
+                "P1": P1_in,
+                "Pr": Pr_in,
+                "T5": stats.norm(T3_in, 10.0),
+                "eff_compressor": _below_one(eff_c_in, 0.01),
+                "eff_turbine": _below_one(eff_t_in, 0.01),
+                "effectiveness": _below_one(eff_r_in, 0.02),
+            },
+            fluid_in,
+            n_samples=20_000,
+            store=result_store,
+        )
+    _fig_uq, _axes_uq = plt.subplots(1, 2, figsize=(14, 5))
+    for _ax, _name, _scale, _unit in zip(
+        _axes_uq,
+        ("thermal_eff", "w_net"),
+        (1.0, 1e-3),
+        ("Thermal Efficiency (%)", "Net Specific Work (kJ/kg)"),
+    ):
+        _summary = _uq["summary"][_name]
+        _ax.hist(_uq["metrics"][_name] * _scale, bins=60, color="steelblue")
+        for _value, _style in (
+            (_summary["low"], "--"),
+            (_summary["mean"], "-"),
+            (_summary["high"], "--"),
+        ):
+            _ax.axvline(_value * _scale, color="black", linestyle=_style)
+        _ax.set_xlabel(_unit)
+        _ax.set_ylabel("Samples")
+        _ax.set_title(
+            f"mean {_summary['mean'] * _scale:.2f}, 95% interval "
+            f"[{_summary['low'] * _scale:.2f}, {_summary['high'] * _scale:.2f}]"
+        )
+    _fig_uq.suptitle(
+        "Latin hypercube propagation of T5 (σ = 10 K), compressor and turbine "
+        "efficiency (σ = 0.01) and regenerator effectiveness (σ = 0.02)"
     )
-    return (cycle_results,)
+    plt.tight_layout()
+    plt.show()
+    return
 
 
 @app.cell(hide_code=True)
-def _(cycle_results, exergy_analysis, mass_flow_rate):
-    exergy_results = exergy_analysis(cycle_results, mass_flow_rate)
-    return (exergy_results,)
+def _(
+    P1_in,
+    Pr_in,
+    T1_in,
+    T3_in,
+    eff_c_in,
+    eff_r_in,
+    eff_t_in,
+    fluid_in,
+    local_sensitivity,
+    mo,
+    pd,
+    result_store,
+    sobol_indices,
+    stats,
+    use_property_backend,
+):
+    # Which inputs drive efficiency, net work and exhaust temperature
+    _point = {
+        "T1": T1_in,
+        "P1": P1_in,
+        "Pr": Pr_in,
+        "T5": T3_in,
+        "eff_compressor": eff_c_in,
+        "eff_turbine": eff_t_in,
+        "effectiveness": eff_r_in,
+    }
+    _local = local_sensitivity(_point, fluid_in)
+    _elasticity = pd.DataFrame(
+        _local["elasticity"].T, index=_local["inputs"], columns=_local["outputs"]
+    )
+
+    # Global indices over ±5% of every input (±0.02 for the efficiencies,
+    # capped at 1), on the ideal-gas backend like Plot 7
+    _ranges = {
+        _name: (
+            (max(_value - 0.02, 0.0), min(_value + 0.02, 1.0))
+            if _name.startswith("eff")
+            else (0.95 * _value, 1.05 * _value)
+        )
+        for _name, _value in _point.items()
+    }
+    with use_property_backend("ideal"):
+        _sobol = sobol_indices(
+            {
+                _name: stats.uniform(_low, _high - _low)
+                for _name, (_low, _high) in _ranges.items()
+            },
+            fluid_in,
+            n_base=1024,
+            store=result_store,
+        )
+    _indices = pd.DataFrame(
+        {
+            f"{_index} {_output}": _sobol[_output][_index]
+            for _output in _local["outputs"]
+            for _index in ("S1", "S1_conf", "ST", "ST_conf")
+        },
+        index=_sobol["factors"],
+    )
+    mo.vstack(
+        [
+            mo.md(
+                "## Sensitivity analysis\n"
+                "Local elasticities (relative change of each output per "
+                "relative change of each input, central differences):"
+            ),
+            _elasticity.round(4),
+            mo.md(
+                f"First-order (S1) and total (ST) Sobol indices over ±5% of "
+                f"each input ({_sobol['evaluations']} cycle solves), with the "
+                f"half widths of their 95% bootstrap intervals (_conf):"
+            ),
+            _indices.round(3),
+        ]
+    )
+    return
 
 
 @app.cell(hide_code=True)
-def _(exergy_results, pd):
-    # Create a comprehensive results table
-    exergy_data = []
-    for component, metrics in exergy_results.items():
-        if component != 'Overall':
-            rows = {
-                'Component': component,
-                'Exergy Destruction (kJ/kg)': f"{metrics['Exergy Destruction (kJ/kg)']:.2f}",
-                'Percentage of Total': f"{metrics['Percentage of Total']:.1f}%",
-                'Exergy Destruction (MW)': f"{metrics['Exergy Destruction (MW)']:.2f}"
-            }
-            exergy_data.append(rows)
+def _(mo):
+    profile_button = mo.ui.run_button(label="Profile property calls")
+    cold_cache_checkbox = mo.ui.checkbox(label="Start from an empty property cache")
+    mo.hstack([profile_button, cold_cache_checkbox], justify="start")
+    return cold_cache_checkbox, profile_button
 
-    # Display the table
-    df_exergy = pd.DataFrame(exergy_data).set_index('Component')
-    df_exergy
+
+@app.cell(hide_code=True)
+def _(
+    P1_in,
+    Pr_in,
+    T1_in,
+    T3_in,
+    brayton_cycle_analysis,
+    cold_cache_checkbox,
+    dead_state,
+    eff_c_in,
+    eff_r_in,
+    eff_t_in,
+    exergy_analysis,
+    fluid_in,
+    mass_flow_rate,
+    mo,
+    pd,
+    plot_ts_diagram,
+    profile,
+    profile_button,
+    property_cache,
+):
+    # CoolProp calls and time spent per state / function for one cycle
+    mo.stop(not profile_button.value)
+    if cold_cache_checkbox.value:
+        property_cache.clear()
+    with profile() as _profiler:
+        _results = brayton_cycle_analysis(
+            T1_in, P1_in, Pr_in, T3_in, fluid_in, eff_c_in, eff_t_in, eff_r_in
+        )
+        exergy_analysis(_results, mass_flow_rate, dead_state)
+        plot_ts_diagram(_results)
+    mo.output.replace(
+        mo.vstack(
+            [
+                mo.md("### Property calls by (outputs, input pair, fluid, source)"),
+                mo.ui.table(pd.DataFrame(_profiler.call_table()).round(3)),
+                mo.md("### Time per function and state"),
+                mo.ui.table(pd.DataFrame(_profiler.span_table()).round(3)),
+                mo.download(
+                    "\n".join(_profiler.collapsed_stacks()).encode(),
+                    filename="thermo_profile.folded",
+                    label="Collapsed stacks (flamegraph.pl / speedscope)",
+                ),
+            ]
+        )
+    )
     return
 
 